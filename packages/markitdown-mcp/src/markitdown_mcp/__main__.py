@@ -1,11 +1,15 @@
 import contextlib
 import sys
 import os
+import asyncio
+import time
 from collections.abc import AsyncIterator
+from typing import Any, Dict, Optional, Set
 from mcp.server.fastmcp import FastMCP
 from starlette.applications import Starlette
 from mcp.server.sse import SseServerTransport
 from starlette.requests import Request
+from starlette.responses import JSONResponse
 from starlette.routing import Mount, Route
 from starlette.types import Receive, Scope, Send
 from mcp.server import Server
@@ -20,7 +24,159 @@ mcp = FastMCP("markitdown")
 @mcp.tool()
 async def convert_to_markdown(uri: str) -> str:
     """Convert a resource described by an http:, https:, file: or data: URI to markdown"""
-    return MarkItDown(enable_plugins=check_plugins_enabled()).convert_uri(uri).markdown
+    return await get_pool().convert_uri(uri)
+
+
+class MarkItDownPool:
+    """
+    A fixed-size pool of long-lived MarkItDown instances, shared by all sessions, so
+    that models, plugins and HTTP connections are loaded and opened once. Each
+    conversion borrows an instance, so at most `size` conversions run at once, and
+    the rest wait their turn (in order). If max_queue_depth is set, conversions that
+    would have to wait behind that many others are rejected instead.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        *,
+        max_queue_depth: Optional[int] = None,
+        timeout: Optional[float] = None,
+        **markitdown_kwargs: Any,
+    ):
+        self.size = size
+        self.max_queue_depth = max_queue_depth
+        self.timeout = timeout
+
+        # Each instance converts one document at a time, in its single worker thread
+        self._idle: asyncio.Queue[MarkItDown] = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(MarkItDown(max_async_workers=1, **markitdown_kwargs))
+
+        # Instances whose conversion was abandoned (e.g., on timeout), waiting for it to finish
+        self._releasing: Set[asyncio.Task] = set()
+
+        # Metrics
+        self.waiting = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[MarkItDown]:
+        """Borrow an instance, waiting for one to become idle if necessary."""
+        if (
+            self.max_queue_depth is not None
+            and self._idle.empty()
+            and self.waiting >= self.max_queue_depth
+        ):
+            self.rejected += 1
+            raise RuntimeError(
+                f"The server is busy ({self.waiting} conversions are already queued). Please try again later."
+            )
+
+        self.waiting += 1
+        start = time.monotonic()
+        try:
+            markitdown = await self._idle.get()
+        finally:
+            self.waiting -= 1
+            self.total_wait_seconds += time.monotonic() - start
+
+        self.active += 1
+        try:
+            yield markitdown
+        except BaseException:
+            # An abandoned conversion (e.g., after a timeout) keeps running in the
+            # instance's worker thread, and the next conversion would queue behind it.
+            # So the instance stays active, and is only handed out again, once it has
+            # finished.
+            task = asyncio.get_running_loop().create_task(
+                self._release_when_idle(markitdown)
+            )
+            self._releasing.add(task)
+            task.add_done_callback(self._releasing.discard)
+            raise
+        else:
+            self._release(markitdown)
+
+    async def _release_when_idle(self, markitdown: MarkItDown) -> None:
+        try:
+            await markitdown.wait_idle()
+        finally:
+            self._release(markitdown)
+
+    def _release(self, markitdown: MarkItDown) -> None:
+        self.active -= 1
+        self._idle.put_nowait(markitdown)
+
+    async def convert_uri(self, uri: str) -> str:
+        async with self.acquire() as markitdown:
+            try:
+                result = await markitdown.aconvert_uri(uri, timeout=self.timeout)
+            except BaseException:
+                self.failed += 1
+                raise
+            self.completed += 1
+            return result.markdown
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.size,
+            "max_queue_depth": self.max_queue_depth,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "total_wait_seconds": self.total_wait_seconds,
+        }
+
+    async def aclose(self) -> None:
+        releasing = list(self._releasing)
+        for task in releasing:
+            task.cancel()
+        if releasing:
+            await asyncio.wait(releasing)
+        while not self._idle.empty():
+            await self._idle.get_nowait().aclose()
+
+
+# The server-wide pool. Created in the Starlette lifespan when serving HTTP, or on first use otherwise.
+_pool: Optional[MarkItDownPool] = None
+
+
+def get_pool() -> MarkItDownPool:
+    global _pool
+    if _pool is None:
+        _pool = create_pool_from_env()
+    return _pool
+
+
+def create_pool_from_env() -> MarkItDownPool:
+    """
+    Create a pool configured by the environment:
+    - MARKITDOWN_POOL_SIZE: the number of instances, and so of concurrent conversions (default: 4)
+    - MARKITDOWN_MAX_QUEUE_DEPTH: the number of conversions that may wait for an instance (default: unlimited)
+    - MARKITDOWN_TIMEOUT: the time limit for each conversion, in seconds (default: none)
+    - MARKITDOWN_ENABLE_PLUGINS: whether to enable 3rd-party plugins (default: false)
+    - MARKITDOWN_DOCINTEL_ENDPOINT: an Azure Document Intelligence endpoint to use (default: none)
+    """
+    markitdown_kwargs: Dict[str, Any] = {"enable_plugins": check_plugins_enabled()}
+    docintel_endpoint = os.getenv("MARKITDOWN_DOCINTEL_ENDPOINT", "").strip()
+    if docintel_endpoint:
+        markitdown_kwargs["docintel_endpoint"] = docintel_endpoint
+
+    max_queue_depth = os.getenv("MARKITDOWN_MAX_QUEUE_DEPTH", "").strip()
+    timeout = os.getenv("MARKITDOWN_TIMEOUT", "").strip()
+    return MarkItDownPool(
+        int(os.getenv("MARKITDOWN_POOL_SIZE", "").strip() or 4),
+        max_queue_depth=int(max_queue_depth) if max_queue_depth else None,
+        timeout=float(timeout) if timeout else None,
+        **markitdown_kwargs,
+    )
 
 
 def check_plugins_enabled() -> bool:
@@ -57,20 +213,28 @@ def create_starlette_app(mcp_server: Server, *, debug: bool = False) -> Starlett
     ) -> None:
         await session_manager.handle_request(scope, receive, send)
 
+    async def handle_metrics(request: Request) -> JSONResponse:
+        return JSONResponse(get_pool().metrics())
+
     @contextlib.asynccontextmanager
     async def lifespan(app: Starlette) -> AsyncIterator[None]:
-        """Context manager for session manager."""
+        """Context manager for session manager, and the MarkItDown pool."""
+        global _pool
+        _pool = create_pool_from_env()
         async with session_manager.run():
             print("Application started with StreamableHTTP session manager!")
             try:
                 yield
             finally:
                 print("Application shutting down...")
+                await _pool.aclose()
+                _pool = None
 
     return Starlette(
         debug=debug,
         routes=[
             Route("/sse", endpoint=handle_sse),
+            Route("/metrics", endpoint=handle_metrics),
             Mount("/mcp", app=handle_streamable_http),
             Mount("/messages/", app=sse.handle_post_message),
         ],
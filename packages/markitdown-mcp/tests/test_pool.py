@@ -0,0 +1,47 @@
+#!/usr/bin/env python3 -m pytest
+import asyncio
+import time
+from typing import Any, BinaryIO
+
+import pytest
+
+from markitdown import DocumentConverter, DocumentConverterResult, StreamInfo
+from markitdown_mcp.__main__ import MarkItDownPool
+
+
+class SlowConverter(DocumentConverter):
+    """Converts application/x-slow data URIs, whose data is the time it takes, in seconds."""
+
+    def accepts(
+        self, file_stream: BinaryIO, stream_info: StreamInfo, **kwargs: Any
+    ) -> bool:
+        return stream_info.mimetype == "application/x-slow"
+
+    def convert(
+        self, file_stream: BinaryIO, stream_info: StreamInfo, **kwargs: Any
+    ) -> DocumentConverterResult:
+        time.sleep(float(file_stream.read()))
+        return DocumentConverterResult(markdown="done")
+
+
+def test_pool_timeout() -> None:
+    async def run() -> None:
+        pool = MarkItDownPool(1, timeout=0.3, enable_builtins=False)
+        for markitdown in list(pool._idle._queue):  # type: ignore[attr-defined]
+            markitdown.register_converter(SlowConverter())
+
+        # The abandoned conversion keeps running, and its instance stays active
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.convert_uri("data:application/x-slow,0.8")
+        assert pool.metrics()["active"] == 1 and pool.metrics()["failed"] == 1
+
+        # The next conversion waits for it to finish, before its time limit starts
+        start = time.monotonic()
+        assert await pool.convert_uri("data:application/x-slow,0.1") == "done"
+        assert time.monotonic() - start >= 0.5
+        assert pool.metrics()["active"] == 0
+        assert pool.metrics()["completed"] == 1
+
+        await pool.aclose()
+
+    asyncio.run(run())
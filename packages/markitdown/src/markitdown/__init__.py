@@ -9,13 +9,20 @@ from ._markitdown import (
     PRIORITY_GENERIC_FILE_FORMAT,
 )
 from ._base_converter import DocumentConverterResult, DocumentConverter
+from ._attachments import Attachment
 from ._stream_info import StreamInfo
+from ._conversion_cache import ConversionCache
+from ._batch import BatchConversionResult
+from ._downloader import ResourceDownloader, DownloadResult
+from ._http_fetch import HttpFetcher, HttpCache, FetchedResponse
+from ._charset import CharsetDetector
 from ._exceptions import (
     MarkItDownException,
     MissingDependencyException,
     FailedConversionAttempt,
     FileConversionException,
     UnsupportedFormatException,
+    InputTooLargeException,
 )
 
 __all__ = [
@@ -23,12 +30,22 @@ __all__ = [
     "MarkItDown",
     "DocumentConverter",
     "DocumentConverterResult",
+    "Attachment",
     "MarkItDownException",
     "MissingDependencyException",
     "FailedConversionAttempt",
     "FileConversionException",
     "UnsupportedFormatException",
+    "InputTooLargeException",
     "StreamInfo",
+    "ConversionCache",
+    "BatchConversionResult",
+    "ResourceDownloader",
+    "DownloadResult",
+    "HttpFetcher",
+    "HttpCache",
+    "FetchedResponse",
+    "CharsetDetector",
     "PRIORITY_SPECIFIC_FILE_FORMAT",
     "PRIORITY_GENERIC_FILE_FORMAT",
 ]
@@ -3,8 +3,14 @@
 # SPDX-License-Identifier: MIT
 import argparse
 import sys
+import os
+import re
+import glob
+import json
 import codecs
+import tempfile
 from textwrap import dedent
+from typing import Dict, Iterator, Optional, Tuple
 from importlib.metadata import entry_points
 from .__about__ import __version__
 from ._markitdown import MarkItDown, StreamInfo, DocumentConverterResult
@@ -41,6 +47,20 @@ def main():
                 OR
 
                 markitdown example.pdf > example.md
+
+            BATCH MODE:
+
+                If FILENAME is a directory or a glob pattern, all matching files
+                are converted, mirroring the input tree into the directory given
+                by -o. Files whose outputs are up to date are skipped, and a
+                manifest is kept in the output directory so interrupted runs
+                can resume. For example:
+
+                markitdown docs/ -o docs_md/ -j 8
+
+                OR
+
+                markitdown "docs/**/*.pdf" -o docs_md/
             """
         ).strip(),
     )
@@ -56,7 +76,27 @@ def main():
     parser.add_argument(
         "-o",
         "--output",
-        help="Output file name. If not provided, output is written to stdout.",
+        help="Output file name. If not provided, output is written to stdout. In batch mode, the output directory.",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of parallel worker processes to use in batch mode (default: 1).",
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="In batch mode, convert all files, even those whose outputs are up to date or recorded in the manifest.",
+    )
+
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="In batch mode, retry the files whose conversion failed in a previous run, even if they are unchanged.",
     )
 
     parser.add_argument(
@@ -172,6 +212,18 @@ def main():
             )
         sys.exit(0)
 
+    batch_mode = args.filename is not None and (
+        os.path.isdir(args.filename)
+        or (_GLOB_MAGIC.search(args.filename) and not os.path.exists(args.filename))
+    )
+    if batch_mode:
+        if not args.output:
+            _exit_with_error("An output directory (-o) is required in batch mode.")
+        if os.path.isfile(args.output):
+            _exit_with_error(f"Output must be a directory in batch mode: {args.output}")
+        if args.jobs < 1:
+            _exit_with_error(f"Invalid number of jobs: {args.jobs}")
+
     if args.use_docintel:
         if args.endpoint is None:
             _exit_with_error(
@@ -186,18 +238,50 @@ def main():
     else:
         markitdown = MarkItDown(enable_plugins=args.use_plugins)
 
-    if args.filename is None:
+    if batch_mode:
+        sys.exit(_run_batch(args, markitdown, stream_info))
+
+    if args.output:
+        # Write the Markdown to the file as it is produced, rather than all at once
+        _write_output_chunks(
+            args.output,
+            markitdown.convert_iter(
+                sys.stdin.buffer if args.filename is None else args.filename,
+                stream_info=stream_info,
+                keep_data_uris=args.keep_data_uris,
+            ),
+        )
+    elif args.filename is None:
         result = markitdown.convert_stream(
             sys.stdin.buffer,
             stream_info=stream_info,
             keep_data_uris=args.keep_data_uris,
         )
+        _handle_output(args, result)
     else:
         result = markitdown.convert(
             args.filename, stream_info=stream_info, keep_data_uris=args.keep_data_uris
         )
-
-    _handle_output(args, result)
+        _handle_output(args, result)
+
+
+def _write_output_chunks(path: str, chunks: Iterator[str]) -> None:
+    """
+    Write Markdown chunks to a file as they are produced. The file is only created once
+    the conversion is underway, and is removed if the conversion fails part way through.
+    """
+    first_chunk = next(chunks, "")
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(first_chunk)
+            for chunk in chunks:
+                f.write(chunk)
+    except Exception:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
 
 
 def _handle_output(args, result: DocumentConverterResult):
@@ -214,6 +298,170 @@ def _handle_output(args, result: DocumentConverterResult):
         )
 
 
+# Characters that make a filename argument a glob pattern
+_GLOB_MAGIC = re.compile(r"[*?[]")
+
+# Name of the manifest of finished work, kept in the output directory in batch mode
+MANIFEST_FILENAME = ".markitdown-manifest.jsonl"
+
+
+def _run_batch(args, markitdown: MarkItDown, stream_info: Optional[StreamInfo]) -> int:
+    """Convert a directory tree or glob pattern, mirroring it into the output directory. Returns the exit code."""
+    output_dir = os.path.abspath(args.output)
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+    manifest = {} if args.force else _load_manifest(manifest_path)
+
+    skipped = 0
+    skipped_failed = 0
+    jobs: Dict[str, Tuple[str, os.stat_result]] = {}
+
+    def pending_inputs() -> Iterator[str]:
+        nonlocal skipped, skipped_failed
+        for input_path, rel_path in _iter_batch_inputs(args.filename, output_dir):
+            try:
+                st = os.stat(input_path)
+            except OSError:
+                continue
+
+            entry = manifest.get(rel_path)
+            output_path = os.path.join(output_dir, rel_path + ".md")
+            if not args.force:
+                if (
+                    entry is not None
+                    and entry.get("status") == "failed"
+                    and _is_unchanged(entry, st)
+                ):
+                    # Failures are only retried if asked, or once their inputs change
+                    if not args.retry_failed:
+                        skipped_failed += 1
+                        continue
+                elif _is_up_to_date(entry, st, output_path):
+                    skipped += 1
+                    continue
+
+            jobs[input_path] = (rel_path, st)
+            yield input_path
+
+    converted = 0
+    failed = 0
+    with open(manifest_path, "a", encoding="utf-8") as manifest_fh:
+        for item in markitdown.convert_many(
+            pending_inputs(),
+            max_workers=args.jobs,
+            executor="process" if args.jobs > 1 else "thread",
+            ordered=False,
+            stream_info=stream_info,
+            keep_data_uris=args.keep_data_uris,
+        ):
+            rel_path, st = jobs.pop(item.source)
+            entry = {"input": rel_path, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+            if item.ok:
+                assert item.result is not None
+                _write_atomically(
+                    os.path.join(output_dir, rel_path + ".md"), item.result.markdown
+                )
+                entry["status"] = "ok"
+                converted += 1
+            else:
+                entry["status"] = "failed"
+                entry["error"] = type(item.exception).__name__
+                failed += 1
+                print(f"{rel_path}: {item.exception}", file=sys.stderr)
+
+            # Record finished work as it completes, so an interrupted run can resume
+            manifest_fh.write(json.dumps(entry) + "\n")
+            manifest_fh.flush()
+
+    summary = f"Converted {converted} file(s), skipped {skipped} up-to-date file(s)"
+    if skipped_failed > 0:
+        summary += f", skipped {skipped_failed} previously failed file(s) (use --retry-failed to retry them)"
+    print(f"{summary}, {failed} failure(s).", file=sys.stderr)
+    return 1 if failed > 0 else 0
+
+
+def _iter_batch_inputs(pattern: str, output_dir: str) -> Iterator[Tuple[str, str]]:
+    """Yield (input_path, path relative to the input root) for each file in a directory tree or glob pattern."""
+    if os.path.isdir(pattern):
+        root = os.path.abspath(pattern)
+        for dirpath, dirnames, filenames in os.walk(root):
+            # Never descend into the output directory
+            dirnames[:] = sorted(
+                d for d in dirnames if os.path.join(dirpath, d) != output_dir
+            )
+            for name in sorted(filenames):
+                input_path = os.path.join(dirpath, name)
+                yield input_path, os.path.relpath(input_path, root)
+    else:
+        # The root is the longest leading part of the pattern without wildcards
+        parts = pattern.replace("\\", "/").split("/")
+        literal_parts = []
+        for part in parts[:-1]:
+            if _GLOB_MAGIC.search(part):
+                break
+            literal_parts.append(part)
+        root = os.path.abspath("/".join(literal_parts) or ".")
+
+        for input_path in sorted(glob.iglob(pattern, recursive=True)):
+            input_path = os.path.abspath(input_path)
+            if not os.path.isfile(input_path):
+                continue
+            if os.path.commonpath([input_path, output_dir]) == output_dir:
+                continue
+            yield input_path, os.path.relpath(input_path, root)
+
+
+def _load_manifest(manifest_path: str) -> Dict[str, dict]:
+    """Load the manifest of finished work. Later entries take precedence."""
+    manifest: Dict[str, dict] = {}
+    if not os.path.exists(manifest_path):
+        return manifest
+    with open(manifest_path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                entry = json.loads(line)
+                manifest[entry["input"]] = entry
+            except (ValueError, KeyError):
+                # E.g., a partial line written when a previous run was interrupted
+                continue
+    return manifest
+
+
+def _is_unchanged(entry: Optional[dict], st: os.stat_result) -> bool:
+    """Decide if an input is unchanged since it was recorded in the manifest."""
+    return (
+        entry is not None
+        and entry.get("size") == st.st_size
+        and entry.get("mtime_ns") == st.st_mtime_ns
+    )
+
+
+def _is_up_to_date(entry: Optional[dict], st: os.stat_result, output_path: str) -> bool:
+    """Decide if an input can be skipped, based on its manifest entry and its output's modification time."""
+    if _is_unchanged(entry, st) and os.path.exists(output_path):
+        # Unchanged since it was last converted (successes are redone if their outputs have gone missing)
+        return True
+    try:
+        return os.stat(output_path).st_mtime_ns > st.st_mtime_ns
+    except OSError:
+        return False
+
+
+def _write_atomically(path: str, content: str) -> None:
+    """Write a file via a temporary file, so that interrupted runs never leave partial outputs."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
 def _exit_with_error(message: str):
     print(message)
     sys.exit(1)
@@ -0,0 +1,105 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+
+# httpx is optional (without it, HTTP requests are made with requests, in a worker
+# thread), and is imported on first use, as it is slow to import
+@functools.lru_cache(maxsize=None)
+def _load_httpx() -> Any:
+    try:
+        import httpx
+    except ImportError:
+        return None
+    return httpx
+
+
+class AsyncRunner:
+    """
+    The resources behind MarkItDown's async API: a bounded pool of worker threads,
+    to which blocking work (conversion, local I/O) is offloaded, and a pooled async
+    HTTP client (if httpx is installed). Both are created on first use.
+    """
+
+    def __init__(self, *, max_workers: Optional[int] = None, http_client: Any = None):
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        # The work submitted to the pool that has not finished yet (see wait_idle)
+        self._pending: Set[Future] = set()
+
+        # A client provided by the caller, who is responsible for closing it
+        self._provided_http_client = http_client
+
+        self._http_client: Any = None
+        self._http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking function in the worker pool. If the awaiting task is cancelled
+        (e.g., on timeout), a function that has already started runs to completion in
+        the background, and its result is discarded.
+        """
+        future = self._get_executor().submit(func, *args, **kwargs)
+        with self._executor_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard_pending)
+        return await asyncio.wrap_future(future)
+
+    async def wait_idle(self) -> None:
+        """
+        Wait until the work submitted to the pool so far has finished, including work
+        whose caller stopped waiting for it (e.g., on timeout).
+        """
+        with self._executor_lock:
+            pending = list(self._pending)
+        if pending:
+            await asyncio.wait([asyncio.wrap_future(future) for future in pending])
+
+    def _discard_pending(self, future: Future) -> None:
+        with self._executor_lock:
+            self._pending.discard(future)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="markitdown"
+                )
+            return self._executor
+
+    def get_http_client(self) -> Any:
+        """Return an httpx.AsyncClient to use on the running event loop, or None if httpx is not installed."""
+        if self._provided_http_client is not None:
+            return self._provided_http_client
+
+        httpx = _load_httpx()
+        if httpx is None:
+            return None
+
+        # Pooled connections are bound to the event loop on which they were opened
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_client_loop is not loop:
+            self._http_client = httpx.AsyncClient(follow_redirects=True)
+            self._http_client_loop = loop
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """Close the HTTP client (unless it was provided by the caller), and shut down the worker pool."""
+        if (
+            self._http_client is not None
+            and self._http_client_loop is asyncio.get_running_loop()
+        ):
+            await self._http_client.aclose()
+        self._http_client = None
+        self._http_client_loop = None
+
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
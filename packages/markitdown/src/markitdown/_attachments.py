@@ -0,0 +1,118 @@
+import base64
+import binascii
+import mimetypes
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Image types that may be extracted from data URIs
+_DATA_URI_IMAGE_MIMETYPES = [
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/bmp",
+    "image/webp",
+    "image/svg+xml",
+]
+
+# mimetypes.guess_extension() can return rarely used extensions (e.g., .jpe)
+_EXTENSIONS = {"image/jpeg": ".jpg", "image/svg+xml": ".svg"}
+
+
+@dataclass(frozen=True)
+class Attachment:
+    """
+    A file extracted from a document (e.g., an embedded image), to which the
+    converted Markdown refers by its (relative) name. The content is only read
+    (e.g., decoded or decompressed) when read() is called.
+    """
+
+    name: str
+    mimetype: Optional[str]
+    loader: Callable[[], bytes] = field(repr=False, compare=False)
+
+    def read(self) -> bytes:
+        """Return the content of the attachment."""
+        return self.loader()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Loaders are usually closures, which can't be pickled (e.g., when results
+        # are returned from worker processes), so the content is pickled instead
+        return (_loaded_attachment, (self.name, self.mimetype, self.read()))
+
+
+def _loaded_attachment(name: str, mimetype: Optional[str], data: bytes) -> Attachment:
+    return Attachment(name=name, mimetype=mimetype, loader=lambda: data)
+
+
+class AttachmentCollector:
+    """
+    Collects the attachments of a single conversion, assigning each a unique name
+    (image1.png, image2.jpg, ...). Converters that support attachment extraction
+    (enabled with the extract_attachments keyword argument) add each image to the
+    collector, and refer to it by the returned name in the Markdown.
+    """
+
+    def __init__(self):
+        self.attachments: List[Attachment] = []
+        self._names_by_key: Dict[Hashable, str] = {}
+
+    def add(
+        self,
+        loader: Callable[[], bytes],
+        *,
+        mimetype: Optional[str] = None,
+        extension: Optional[str] = None,
+        key: Optional[Hashable] = None,
+    ) -> str:
+        """
+        Add an attachment, and return its name.
+
+        Args:
+        - loader: A function returning the content of the attachment.
+        - mimetype: The mimetype of the content, if known.
+        - extension: The file extension of the name (guessed from the mimetype if not given).
+        - key: Identifies the source of the content (e.g., an image's part in the
+          document package). Attachments added with the same key are only added
+          once, and share a name.
+        """
+        if key is not None and key in self._names_by_key:
+            return self._names_by_key[key]
+
+        if not extension and mimetype:
+            extension = _EXTENSIONS.get(mimetype) or mimetypes.guess_extension(mimetype)
+        name = f"image{len(self.attachments) + 1}{extension or '.bin'}"
+        self.attachments.append(Attachment(name=name, mimetype=mimetype, loader=loader))
+
+        if key is not None:
+            self._names_by_key[key] = name
+        return name
+
+    def get_name(self, key: Hashable) -> Optional[str]:
+        """Return the name of the attachment added with the given key, or None if there is none."""
+        return self._names_by_key.get(key)
+
+    def add_data_uri(self, uri: str) -> Optional[str]:
+        """
+        Add the image encoded in a base64 data URI (which is only decoded when the
+        attachment is read), and return its name. Returns None if the data URI is
+        not a base64-encoded image.
+        """
+        separator = uri.find(",")
+        if not uri.startswith("data:") or separator < 0:
+            return None
+        parts = uri[len("data:") : separator].split(";")
+        mimetype = parts[0].strip().lower()
+        if "base64" not in parts[1:] or mimetype not in _DATA_URI_IMAGE_MIMETYPES:
+            return None
+
+        # The payload is sliced out of the URI when it is decoded, rather than kept
+        # as a second copy in the meantime
+        offset = separator + 1
+
+        def loader() -> bytes:
+            try:
+                return base64.b64decode(uri[offset:])
+            except binascii.Error:
+                return b""
+
+        return self.add(loader, mimetype=mimetype, key=uri)
@@ -1,5 +1,6 @@
-from typing import Any, BinaryIO, Optional
+from typing import Any, BinaryIO, Iterator, List, Optional
 from ._stream_info import StreamInfo
+from ._attachments import Attachment
 
 
 class DocumentConverterResult:
@@ -10,6 +11,7 @@ class DocumentConverterResult:
         markdown: str,
         *,
         title: Optional[str] = None,
+        attachments: Optional[List[Attachment]] = None,
     ):
         """
         Initialize the DocumentConverterResult.
@@ -20,9 +22,13 @@ class DocumentConverterResult:
         Parameters:
         - markdown: The converted Markdown text.
         - title: Optional title of the document.
+        - attachments: Optional files extracted from the document (e.g., images), to
+          which the Markdown refers by name. Only filled by converters that support
+          it, when called with extract_attachments=True.
         """
         self.markdown = markdown
         self.title = title
+        self.attachments: List[Attachment] = list(attachments or [])
 
     @property
     def text_content(self) -> str:
@@ -42,6 +48,22 @@ class DocumentConverterResult:
 class DocumentConverter:
     """Abstract superclass of all DocumentConverters."""
 
+    # Optional, declarative description of the streams a converter can accept.
+    #
+    # If either list is set, accepts() promises to return False for any stream whose
+    # (lowercased) extension is not in accepted_file_extensions, AND whose mimetype
+    # does not start with one of the accepted_mime_type_prefixes. MarkItDown uses
+    # these declarations to index converters, and skips calling accepts() on those
+    # that can't possibly match. Converters that also accept streams on other
+    # grounds (e.g., by sniffing the content, or because a charset is present) must
+    # leave both as None, in which case accepts() is consulted for every stream.
+    #
+    # Declarations are only honored if they are made by the same class (or a subclass
+    # of the class) that implements accepts(), so that subclasses overriding accepts()
+    # are never filtered by the declarations of their parents.
+    accepted_file_extensions: Optional[List[str]] = None
+    accepted_mime_type_prefixes: Optional[List[str]] = None
+
     def accepts(
         self,
         file_stream: BinaryIO,
@@ -103,3 +125,25 @@ class DocumentConverter:
         - MissingDependencyException: If the converter requires a dependency that is not installed.
         """
         raise NotImplementedError("Subclasses must implement this method")
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        """
+        Convert a document to Markdown text, yielding the text in chunks as it is produced.
+
+        Converters of large, naturally segmented documents (e.g., pages, slides, sheets)
+        should override this method, so that callers can consume (and release) each segment
+        before the next is converted. Concatenated, the chunks must equal the markdown
+        returned by convert(). The default implementation yields the output of convert()
+        as a single chunk.
+
+        Parameters and exceptions are the same as for convert(). Exceptions are raised
+        when the iterator is advanced.
+        """
+        result = self.convert(file_stream, stream_info, **kwargs)
+        if result is not None and result.markdown:
+            yield result.markdown
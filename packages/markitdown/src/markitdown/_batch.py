@@ -0,0 +1,216 @@
+import os
+import collections
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Tuple, TYPE_CHECKING
+
+from ._base_converter import DocumentConverterResult
+from ._stream_info import StreamInfo
+from ._exceptions import (
+    MarkItDownException,
+    FileConversionException,
+    UnsupportedFormatException,
+)
+
+# Break otherwise circular import for type hinting
+if TYPE_CHECKING:
+    from ._markitdown import MarkItDown
+
+ACCEPTED_EXECUTORS = ["process", "thread"]
+
+# The MarkItDown instance owned by a worker process (see _init_worker)
+_worker_markitdown: Optional["MarkItDown"] = None
+
+
+class BatchConversionResult:
+    """The outcome of converting one source as part of a batch (see MarkItDown.convert_many)."""
+
+    def __init__(
+        self,
+        *,
+        index: int,
+        source: Any,
+        result: Optional[DocumentConverterResult] = None,
+        exception: Optional[MarkItDownException] = None,
+    ):
+        """
+        Initialize the BatchConversionResult.
+
+        Parameters:
+        - index: The position of the source in the input sequence.
+        - source: The source that was converted.
+        - result: The conversion result, if the conversion succeeded.
+        - exception: The FileConversionException or UnsupportedFormatException, if the conversion failed.
+        """
+        self.index = index
+        self.source = source
+        self.result = result
+        self.exception = exception
+
+    @property
+    def ok(self) -> bool:
+        """True if the conversion succeeded."""
+        return self.exception is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else type(self.exception).__name__
+        return f"BatchConversionResult(index={self.index}, source={self.source!r}, {status})"
+
+
+def _init_worker(markitdown_kwargs: Dict[str, Any]) -> None:
+    """Build the worker's MarkItDown instance once, so it is reused across tasks."""
+    global _worker_markitdown
+    from ._markitdown import MarkItDown
+
+    _worker_markitdown = MarkItDown(**markitdown_kwargs)
+
+
+def _convert_in_worker(
+    index: int, source: Any, stream_info: Optional[StreamInfo], kwargs: Dict[str, Any]
+) -> BatchConversionResult:
+    assert _worker_markitdown is not None
+    outcome = _convert_one(_worker_markitdown, index, source, stream_info, kwargs)
+
+    # Make sure the outcome can cross the process boundary. Titles may be str
+    # subclasses (e.g., BeautifulSoup's NavigableString, which references the
+    # whole parse tree), and exceptions carry tracebacks in their attempts.
+    if outcome.result is not None and outcome.result.title is not None:
+        outcome.result.title = str(outcome.result.title)
+    if isinstance(outcome.exception, FileConversionException):
+        outcome.exception = FileConversionException(str(outcome.exception))
+    return outcome
+
+
+def _convert_one(
+    markitdown: "MarkItDown",
+    index: int,
+    source: Any,
+    stream_info: Optional[StreamInfo],
+    kwargs: Dict[str, Any],
+) -> BatchConversionResult:
+    try:
+        result = markitdown.convert(source, stream_info=stream_info, **kwargs)
+        return BatchConversionResult(index=index, source=source, result=result)
+    except (FileConversionException, UnsupportedFormatException) as e:
+        return BatchConversionResult(index=index, source=source, exception=e)
+    except Exception as e:
+        # E.g., missing files or network errors. Report them like any other failed conversion.
+        return BatchConversionResult(
+            index=index,
+            source=source,
+            exception=FileConversionException(f"{type(e).__name__}: {e}"),
+        )
+
+
+def convert_many(
+    markitdown: "MarkItDown",
+    sources: Iterable[Any],
+    *,
+    markitdown_kwargs: Dict[str, Any],
+    max_workers: Optional[int] = None,
+    executor: str = "process",
+    ordered: bool = True,
+    stream_info: Optional[StreamInfo] = None,
+    **kwargs: Any,
+) -> Iterator[BatchConversionResult]:
+    """Implementation of MarkItDown.convert_many()"""
+    if executor not in ACCEPTED_EXECUTORS:
+        raise ValueError(
+            f"Unsupported executor: {executor}. Supported executors are: {', '.join(ACCEPTED_EXECUTORS)}"
+        )
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    def make_pool() -> concurrent.futures.Executor:
+        if executor == "process":
+            return concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(markitdown_kwargs,),
+            )
+        return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    pool = make_pool()
+
+    # The source of each task in flight, and the pool that runs it
+    submitted: Dict[
+        concurrent.futures.Future, Tuple[int, Any, concurrent.futures.Executor]
+    ] = {}
+
+    def replace_pool(broken_pool: concurrent.futures.Executor) -> None:
+        nonlocal pool
+        if broken_pool is pool:
+            pool.shutdown(wait=True, cancel_futures=True)
+            pool = make_pool()
+
+    # Submit lazily, keeping a bounded number of tasks in flight, so that
+    # arbitrarily long source iterables do not get materialized up front.
+    window = 2 * max_workers
+
+    def submit(index: int, source: Any) -> concurrent.futures.Future:
+        if executor == "process":
+            if not isinstance(source, (str, Path)):
+                raise TypeError(
+                    f"Invalid source type for the process executor: {type(source)}. Expected str or Path (use executor='thread' for streams)."
+                )
+            try:
+                future = pool.submit(
+                    _convert_in_worker, index, source, stream_info, kwargs
+                )
+            except BrokenProcessPool:
+                replace_pool(pool)
+                future = pool.submit(
+                    _convert_in_worker, index, source, stream_info, kwargs
+                )
+        else:
+            future = pool.submit(
+                _convert_one, markitdown, index, source, stream_info, kwargs
+            )
+        submitted[future] = (index, source, pool)
+        return future
+
+    def collect(future: concurrent.futures.Future) -> BatchConversionResult:
+        index, source, future_pool = submitted.pop(future)
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            # A worker process died (e.g., it crashed, or was killed for running
+            # out of memory), breaking the pool, and failing all the tasks in
+            # flight. Report them as failed, and go on with a new pool.
+            replace_pool(future_pool)
+            return BatchConversionResult(
+                index=index,
+                source=source,
+                exception=FileConversionException(f"{type(e).__name__}: {e}"),
+            )
+
+    try:
+        source_iter = enumerate(sources)
+        pending: Deque[concurrent.futures.Future] = collections.deque()
+        exhausted = False
+
+        while True:
+            while not exhausted and len(pending) < window:
+                try:
+                    index, source = next(source_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.append(submit(index, source))
+
+            if len(pending) == 0:
+                break
+
+            if ordered:
+                yield collect(pending.popleft())
+            else:
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in list(done):
+                    pending.remove(future)
+                    yield collect(future)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
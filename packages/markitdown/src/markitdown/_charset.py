@@ -0,0 +1,132 @@
+import codecs
+import io
+from typing import BinaryIO, List, Optional, Tuple
+
+import charset_normalizer
+
+from ._stream_info import StreamInfo
+
+# Byte order marks of the encodings whose lines are not delimited by a b"\n" byte
+_WIDE_BOMS = [
+    codecs.BOM_UTF32_LE,
+    codecs.BOM_UTF32_BE,
+    codecs.BOM_UTF16_LE,
+    codecs.BOM_UTF16_BE,
+]
+
+
+def normalize_charset(charset: Optional[str]) -> Optional[str]:
+    """Normalize a charset name to its canonical (codecs) form, e.g., "UTF8" to "utf-8"."""
+    if charset is None:
+        return None
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return charset
+
+
+class CharsetDetector:
+    """
+    Detects the charset of text streams with charset_normalizer, from a bounded
+    sample of the stream, rather than from all of it: windows of window_size
+    bytes, taken at the start of the stream, at its end, and evenly spaced in
+    between. Streams no larger than the sample are read whole.
+
+    Sampling the middle and the end (rather than only the start) catches the
+    files whose first lines are plain ASCII, but which contain other characters
+    further on (e.g., logs, or JSONL exports). The windows other than the first
+    start after a line break, and all but the last end after one, so that they
+    don't cut multi-byte characters in half.
+    """
+
+    def __init__(self, *, window_size: int = 4096, windows: int = 3):
+        """
+        Initialize the CharsetDetector.
+
+        Parameters:
+        - window_size: The size of each window, in bytes.
+        - windows: The number of windows. With 1, only the start of the stream is sampled.
+        """
+        if window_size < 1 or windows < 1:
+            raise ValueError("window_size and windows must be at least 1.")
+        self.window_size = window_size
+        self.windows = windows
+
+    def detect(self, file_stream: BinaryIO) -> Optional[str]:
+        """
+        Return the (normalized) charset of the stream, from its current position,
+        or None if it can't be detected. The stream position is restored.
+        """
+        cur_pos = file_stream.tell()
+        try:
+            sample = self._read_sample(file_stream)
+        finally:
+            file_stream.seek(cur_pos)
+
+        result = charset_normalizer.from_bytes(sample).best()
+        if result is None:
+            return None
+        return normalize_charset(result.encoding)
+
+    def detect_stream_info(
+        self, file_stream: BinaryIO, stream_info: StreamInfo
+    ) -> StreamInfo:
+        """
+        Return the stream info, with the detected charset filled in if it is
+        missing, so that the stream does not have to be sampled again.
+        """
+        if stream_info.charset is not None:
+            return stream_info
+        return stream_info.copy_and_update(charset=self.detect(file_stream))
+
+    def _read_sample(self, file_stream: BinaryIO) -> bytes:
+        start = file_stream.tell()
+        prefix = file_stream.read(self.window_size)
+        if self.windows == 1 or len(prefix) < self.window_size:
+            return prefix
+        if any(prefix.startswith(bom) for bom in _WIDE_BOMS):
+            return prefix
+
+        size = file_stream.seek(0, io.SEEK_END) - start
+        if size <= self.window_size * self.windows:
+            file_stream.seek(start)
+            return file_stream.read()
+
+        windows: List[bytes] = [_cut_after_last_line(prefix)]
+        for i in range(1, self.windows):
+            file_stream.seek(
+                start + (size - self.window_size) * i // (self.windows - 1)
+            )
+            window = file_stream.read(self.window_size)
+            line_start = window.find(b"\n") + 1
+            if line_start > 0:
+                window = window[line_start:]
+            if i < self.windows - 1:
+                window = _cut_after_last_line(window)
+            windows.append(window)
+        return b"".join(windows)
+
+
+def _cut_after_last_line(window: bytes) -> bytes:
+    line_end = window.rfind(b"\n") + 1
+    return window[:line_end] if line_end > 0 else window
+
+
+def get_text_encoding(
+    file_stream: BinaryIO,
+    stream_info: StreamInfo,
+    charset_detector: Optional[CharsetDetector] = None,
+) -> Tuple[str, str]:
+    """
+    Return the (encoding, errors) with which to decode a text stream. If the
+    stream info has a charset, it is used, and decoding errors are raised.
+    Otherwise, the charset is detected (or is UTF-8, if it can't be), undecodable
+    bytes are replaced, and a UTF-8 byte order mark is skipped.
+    """
+    if stream_info.charset:
+        return stream_info.charset, "strict"
+
+    charset = (charset_detector or CharsetDetector()).detect(file_stream)
+    if charset is None or charset == "utf-8":
+        return "utf-8-sig", "replace"
+    return charset, "replace"
@@ -0,0 +1,283 @@
+import os
+import sys
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+from ._base_converter import DocumentConverterResult
+
+# Size of the blocks read from the input stream when computing its content hash
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+# A cached entry: (markdown, title)
+_CacheEntry = Tuple[str, Optional[str]]
+
+
+def hash_stream(file_stream: BinaryIO) -> str:
+    """
+    Compute the SHA-256 digest of the remainder of a seekable stream.
+    The stream position is restored before returning.
+    """
+    digest = hashlib.sha256()
+    cur_pos = file_stream.tell()
+    try:
+        while True:
+            block = file_stream.read(_HASH_BLOCK_SIZE)
+            if not block:
+                break
+            digest.update(block)
+    finally:
+        file_stream.seek(cur_pos)
+    return digest.hexdigest()
+
+
+def make_cache_key(content_hash: str, options: Dict[str, Any]) -> Optional[str]:
+    """
+    Combine the content hash of an input with the options that affect its
+    conversion. Collections (e.g., a page_range given as a range or a set) are
+    represented by their items. Iterators (e.g., generators) can't be read without
+    consuming them, so if an option is one, None is returned: the conversion
+    can't be cached. Other values that are not JSON-serializable (e.g., LLM
+    clients) are represented by their type, since their identity does not survive
+    across processes.
+    """
+    try:
+        normalized = _normalize_option(options)
+    except _UncacheableOption:
+        return None
+    serialized = json.dumps(
+        {"content": content_hash, "options": normalized}, sort_keys=True
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class _UncacheableOption(Exception):
+    pass
+
+
+def _normalize_option(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (Iterator, bytes, bytearray, memoryview)):
+        raise _UncacheableOption()
+    if isinstance(value, dict):
+        return {str(k): _normalize_option(v) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize_option(v) for v in value), key=repr)
+    if isinstance(value, Iterable):
+        return [_normalize_option(v) for v in value]
+    return f"<{type(value).__module__}.{type(value).__qualname__}>"
+
+
+class ConversionCache:
+    """
+    A content-addressed cache of conversion results.
+
+    Results are kept in an in-memory LRU tier, and (optionally) in an on-disk
+    tier that persists across processes. Both tiers are bounded by size in
+    bytes, and evict the least recently used entries first.
+
+    Pass an instance to the MarkItDown constructor to enable caching:
+
+        md = MarkItDown(cache=ConversionCache(cache_dir="~/.cache/markitdown"))
+
+    Counters (hits, misses, memory_hits, disk_hits, evictions) are exposed as
+    attributes, for monitoring.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        cache_dir: Optional[str] = None,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+    ):
+        """
+        Initialize the ConversionCache.
+
+        Parameters:
+        - max_memory_bytes: The maximum size of the in-memory tier. Set to 0 to disable the memory tier.
+        - cache_dir: The directory of the on-disk tier. If None, the on-disk tier is disabled.
+        - max_disk_bytes: The maximum size of the on-disk tier.
+        """
+        self._max_memory_bytes = max_memory_bytes
+        self._max_disk_bytes = max_disk_bytes
+        self._cache_dir: Optional[str] = None
+        if cache_dir is not None:
+            self._cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+            os.makedirs(self._cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[_CacheEntry, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None  # Computed lazily
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the configuration is pickled (e.g., when sent to worker processes
+        # by MarkItDown.convert_many). The copy starts with an empty memory tier,
+        # but shares the on-disk tier.
+        return {
+            "max_memory_bytes": self._max_memory_bytes,
+            "cache_dir": self._cache_dir,
+            "max_disk_bytes": self._max_disk_bytes,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    @property
+    def memory_bytes(self) -> int:
+        """The current (approximate) size of the in-memory tier, in bytes."""
+        return self._memory_bytes
+
+    def get(self, key: str) -> Optional[DocumentConverterResult]:
+        """Return the cached result for the key, or None if it is not cached."""
+        with self._lock:
+            item = self._memory.get(key)
+            if item is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return self._to_result(item[0])
+
+        entry = self._disk_get(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._memory_put(key, entry)
+        return self._to_result(entry)
+
+    def put(self, key: str, result: DocumentConverterResult) -> None:
+        """Store a conversion result under the given key."""
+        # Titles may be str subclasses that reference large objects (e.g., a
+        # BeautifulSoup NavigableString), so store plain copies
+        title = None if result.title is None else str(result.title)
+        entry: _CacheEntry = (str(result.markdown), title)
+        with self._lock:
+            self._memory_put(key, entry)
+        self._disk_put(key, entry)
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers. Counters are not reset."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._cache_dir is not None:
+                for path, _, _ in self._disk_entries():
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                self._disk_bytes = 0
+
+    def _to_result(self, entry: _CacheEntry) -> DocumentConverterResult:
+        # Always return a fresh object, so callers can't mutate the cached copy
+        return DocumentConverterResult(markdown=entry[0], title=entry[1])
+
+    def _memory_put(self, key: str, entry: _CacheEntry) -> None:
+        # Must be called with the lock held
+        size = sys.getsizeof(entry[0]) + sys.getsizeof(entry[1])
+        if size > self._max_memory_bytes:
+            return
+
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old[1]
+
+        self._memory[key] = (entry, size)
+        self._memory_bytes += size
+
+        while self._memory_bytes > self._max_memory_bytes:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> str:
+        assert self._cache_dir is not None
+        return os.path.join(self._cache_dir, key[0:2], key + ".json")
+
+    def _disk_get(self, key: str) -> Optional[_CacheEntry]:
+        if self._cache_dir is None:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, "rt", encoding="utf-8") as fh:
+                data = json.load(fh)
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            return None
+
+        return (data["markdown"], data.get("title"))
+
+    def _disk_put(self, key: str, entry: _CacheEntry) -> None:
+        if self._cache_dir is None:
+            return
+
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write atomically, so that concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wt", encoding="utf-8") as fh:
+                json.dump({"markdown": entry[0], "title": entry[1]}, fh)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(s for _, s, _ in self._disk_entries())
+            else:
+                self._disk_bytes += size
+
+            if self._disk_bytes > self._max_disk_bytes:
+                self._disk_evict()
+
+    def _disk_entries(self):
+        assert self._cache_dir is not None
+        for root, _, files in os.walk(self._cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+    def _disk_evict(self) -> None:
+        # Must be called with the lock held. Evict the least recently used
+        # entries until the tier is back under its size limit.
+        entries = sorted(self._disk_entries(), key=lambda e: e[2])
+        total = sum(e[1] for e in entries)
+        for path, size, _ in entries:
+            if total <= self._max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._disk_bytes = total
@@ -0,0 +1,94 @@
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from ._base_converter import DocumentConverter
+from ._stream_info import StreamInfo
+
+# Break otherwise circular import for type hinting
+if TYPE_CHECKING:
+    from ._markitdown import ConverterRegistration
+
+
+def get_declared_accepts(
+    converter: DocumentConverter,
+) -> Optional[Tuple[List[str], List[str]]]:
+    """
+    Return the (extensions, mimetype prefixes) declared by a converter, or None if
+    the converter makes no (usable) declaration. See DocumentConverter.accepted_file_extensions.
+    """
+    extensions = converter.accepted_file_extensions
+    mime_type_prefixes = converter.accepted_mime_type_prefixes
+    if extensions is None and mime_type_prefixes is None:
+        return None
+
+    # The declarations must be made by the class that implements accepts(), or one
+    # of its subclasses. Otherwise, a subclass may have overridden accepts() with
+    # different criteria, and the inherited declarations can't be trusted.
+    mro = type(converter).__mro__
+    accepts_owner = next(c for c in mro if "accepts" in c.__dict__)
+    for attr in ["accepted_file_extensions", "accepted_mime_type_prefixes"]:
+        if attr in converter.__dict__:
+            return None
+        attr_owner = next(c for c in mro if attr in c.__dict__)
+        if attr_owner is not DocumentConverter and not issubclass(
+            attr_owner, accepts_owner
+        ):
+            return None
+
+    return (
+        [e.lower() for e in extensions or []],
+        [m.lower() for m in mime_type_prefixes or []],
+    )
+
+
+class ConverterIndex:
+    """
+    An index of converter registrations, sorted by priority, that maps a StreamInfo
+    to the (much smaller) list of registrations whose accepts() could return True.
+    Converters that make no declarations are always candidates.
+    """
+
+    def __init__(self, registrations: List["ConverterRegistration"]):
+        # The sort is guaranteed to be stable, so converters with the same priority will remain in the same order.
+        self.registrations = sorted(registrations, key=lambda x: x.priority)
+
+        self._always: Set[int] = set()
+        self._by_extension: Dict[str, Set[int]] = {}
+        self._by_major_type: Dict[str, List[Tuple[str, int]]] = {}
+        self._other_prefixes: List[Tuple[str, int]] = []
+
+        for position, registration in enumerate(self.registrations):
+            declared = get_declared_accepts(registration.converter)
+            if declared is None:
+                self._always.add(position)
+                continue
+
+            extensions, mime_type_prefixes = declared
+            for extension in extensions:
+                self._by_extension.setdefault(extension, set()).add(position)
+            for prefix in mime_type_prefixes:
+                major, slash, _ = prefix.partition("/")
+                if slash:
+                    self._by_major_type.setdefault(major, []).append((prefix, position))
+                else:
+                    # E.g., a prefix like "text", with no slash
+                    self._other_prefixes.append((prefix, position))
+
+    def candidates(self, stream_info: StreamInfo) -> List["ConverterRegistration"]:
+        """Return the registrations to try for the given StreamInfo, in priority order."""
+        positions = set(self._always)
+
+        extension = (stream_info.extension or "").lower()
+        if extension:
+            positions.update(self._by_extension.get(extension, ()))
+
+        mimetype = (stream_info.mimetype or "").lower()
+        if mimetype:
+            major = mimetype.partition("/")[0]
+            for prefix, position in self._by_major_type.get(major, ()):
+                if mimetype.startswith(prefix):
+                    positions.add(position)
+            for prefix, position in self._other_prefixes:
+                if mimetype.startswith(prefix):
+                    positions.add(position)
+
+        return [self.registrations[p] for p in sorted(positions)]
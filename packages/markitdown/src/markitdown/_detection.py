@@ -0,0 +1,183 @@
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from ._stream_info import StreamInfo
+
+# How _get_stream_info_guesses decides when to run the (comparatively expensive)
+# Magika model:
+# - "always_sniff": always run Magika (and, for text, charset detection).
+# - "verify": run a cheap magic-number sniffer first, and only run Magika if the
+#   sniffer is inconclusive, or disagrees with the extension/mimetype hints.
+# - "trust_hints": if an extension or mimetype was given, use it as-is (detecting
+#   only the charset of text, if none was given). Otherwise, behave like "verify".
+DETECTION_POLICIES = ("always_sniff", "verify", "trust_hints")
+
+# Mimetypes that don't tell us anything about the content
+_GENERIC_MIMETYPES = ["application/octet-stream", "binary/octet-stream"]
+
+# Text-based formats outside of the text/* tree
+_TEXT_APPLICATION_MIMETYPES = [
+    "application/json",
+    "application/xml",
+    "application/javascript",
+    "application/markdown",
+    "application/x-ipynb+json",
+]
+
+
+@dataclass(frozen=True)
+class SniffResult:
+    """The formats that a stream's magic number is consistent with (most likely first)."""
+
+    mimetypes: Tuple[str, ...]
+    extensions: Tuple[str, ...]
+
+    # True if the signature is shared by several unrelated formats (e.g., OLE2), in
+    # which case it can confirm hints, but can't identify the format on its own.
+    confirms_only: bool = False
+
+    def agrees_with(self, stream_info: StreamInfo) -> bool:
+        """True if the stream_info's extension and mimetype (where given) are consistent with this result."""
+        extension = (stream_info.extension or "").lower()
+        if extension and extension not in self.extensions:
+            return False
+
+        mimetype = get_informative_mimetype(stream_info)
+        if mimetype and mimetype not in self.mimetypes:
+            return False
+
+        return True
+
+
+_PDF = SniffResult(("application/pdf", "application/x-pdf"), (".pdf",))
+_PNG = SniffResult(("image/png",), (".png",))
+_JPEG = SniffResult(("image/jpeg", "image/jpg"), (".jpg", ".jpeg", ".jpe"))
+_ZIP = SniffResult(("application/zip", "application/x-zip-compressed"), (".zip",))
+_DOCX = SniffResult(
+    ("application/vnd.openxmlformats-officedocument.wordprocessingml.document",),
+    (".docx",),
+)
+_XLSX = SniffResult(
+    ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",),
+    (".xlsx",),
+)
+_PPTX = SniffResult(
+    ("application/vnd.openxmlformats-officedocument.presentationml.presentation",),
+    (".pptx",),
+)
+_EPUB = SniffResult(("application/epub+zip",), (".epub",))
+_OLE2 = SniffResult(
+    (
+        "application/vnd.ms-outlook",
+        "application/vnd.ms-excel",
+        "application/msword",
+        "application/vnd.ms-powerpoint",
+        "application/x-ole-storage",
+    ),
+    (".msg", ".xls", ".doc", ".ppt"),
+    confirms_only=True,
+)
+
+_OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# The top-level folder that identifies each OOXML document type
+_OOXML_FOLDERS = {"word/": _DOCX, "xl/": _XLSX, "ppt/": _PPTX}
+
+
+def get_informative_mimetype(stream_info: StreamInfo) -> str:
+    """Return the stream_info's lowercased mimetype (without parameters), or "" if it is missing or generic."""
+    mimetype = (stream_info.mimetype or "").split(";")[0].strip().lower()
+    return "" if mimetype in _GENERIC_MIMETYPES else mimetype
+
+
+def is_text_mimetype(mimetype: Optional[str]) -> bool:
+    """True if the mimetype is of a text-based format, for which a charset applies."""
+    mimetype = (mimetype or "").split(";")[0].strip().lower()
+    return (
+        mimetype.startswith("text/")
+        or mimetype.endswith("+xml")
+        or mimetype.endswith("+json")
+        or mimetype in _TEXT_APPLICATION_MIMETYPES
+    )
+
+
+def sniff_stream(file_stream: BinaryIO) -> Optional[SniffResult]:
+    """
+    Identify common container formats (PDF, ZIP and the OOXML/EPUB formats built on
+    it, OLE2, PNG and JPEG) from their magic numbers. Returns None if inconclusive.
+    The stream position is restored before returning.
+    """
+    cur_pos = file_stream.tell()
+    try:
+        header = file_stream.read(8)
+        if header.startswith(b"%PDF-"):
+            return _PDF
+        if header.startswith(b"\x89PNG\r\n\x1a\n"):
+            return _PNG
+        if header.startswith(b"\xff\xd8\xff"):
+            return _JPEG
+        if header == _OLE2_SIGNATURE:
+            return _OLE2
+        if header.startswith(b"PK\x03\x04"):
+            file_stream.seek(cur_pos)
+            return _sniff_zip(file_stream)
+        return None
+    finally:
+        file_stream.seek(cur_pos)
+
+
+def _sniff_zip(file_stream: BinaryIO) -> Optional[SniffResult]:
+    """Tell the ZIP-based formats apart, using only the central directory (and the EPUB mimetype entry)."""
+    try:
+        with zipfile.ZipFile(file_stream) as z:
+            names = z.namelist()
+            if "mimetype" in names:
+                if z.read("mimetype").strip() == b"application/epub+zip":
+                    return _EPUB
+            if "[Content_Types].xml" in names:
+                for name in names:
+                    for folder, result in _OOXML_FOLDERS.items():
+                        if name.startswith(folder):
+                            return result
+                # Some other OOXML format
+                return None
+            return _ZIP
+    except (zipfile.BadZipFile, OSError, KeyError):
+        return None
+
+
+class DetectionTimings:
+    """Accumulates the number of calls to, and the time spent in, each stage of stream type detection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, List[float]] = {}
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block, and add it to the named stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                totals = self._stages.setdefault(stage, [0, 0.0])
+                totals[0] += 1
+                totals[1] += elapsed
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return {stage: {"calls": ..., "seconds": ...}} for every stage timed so far."""
+        with self._lock:
+            return {
+                stage: {"calls": calls, "seconds": seconds}
+                for stage, (calls, seconds) in self._stages.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
@@ -0,0 +1,197 @@
+import concurrent.futures
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ._exceptions import InputTooLargeException
+from ._http_fetch import HttpCache, HttpFetcher
+
+# Resources larger than this are not downloaded
+DEFAULT_MAX_DOWNLOAD_SIZE = 20 * 1024 * 1024
+
+# (connect, read) timeouts, in seconds
+DEFAULT_DOWNLOAD_TIMEOUT = (10.0, 30.0)
+
+
+class DownloadResult:
+    """The outcome of downloading one resource (see ResourceDownloader)."""
+
+    def __init__(
+        self,
+        *,
+        url: str,
+        content: Optional[bytes] = None,
+        mimetype: Optional[str] = None,
+        error: Optional[str] = None,
+        from_cache: bool = False,
+    ):
+        """
+        Initialize the DownloadResult.
+
+        Parameters:
+        - url: The URL of the resource.
+        - content: The content of the resource, if the download succeeded.
+        - mimetype: The mimetype reported by the server (without parameters), if any.
+        - error: A description of the error, if the download failed.
+        - from_cache: True if the content was served from the on-disk cache.
+        """
+        self.url = url
+        self.content = content
+        self.mimetype = mimetype
+        self.error = error
+        self.from_cache = from_cache
+
+    @property
+    def ok(self) -> bool:
+        """True if the download succeeded."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else self.error
+        return f"DownloadResult(url={self.url!r}, {status})"
+
+
+class ResourceDownloader:
+    """
+    Downloads the resources referenced by documents (e.g., images) concurrently,
+    through a shared, pooled HTTP session.
+
+    At most max_connections_per_host requests are made to any one host at a time,
+    each request is subject to a timeout (and retried, see HttpFetcher), and
+    resources larger than max_size bytes are rejected. If an HttpCache is given,
+    responses are cached in it (e.g., keyed by URL, and revalidated with their
+    ETag), rather than downloaded again.
+
+    MarkItDown uses one to download the images of HTML documents (see the
+    download_images option), and it can be used on its own:
+
+        downloader = ResourceDownloader(cache=HttpCache("~/.cache/markitdown/http"))
+        results = downloader.download_many(image_urls)
+    """
+
+    def __init__(
+        self,
+        *,
+        session: Optional[requests.Session] = None,
+        max_workers: int = 8,
+        max_connections_per_host: int = 4,
+        timeout: Union[float, Tuple[float, float]] = DEFAULT_DOWNLOAD_TIMEOUT,
+        max_size: Optional[int] = DEFAULT_MAX_DOWNLOAD_SIZE,
+        cache: Optional[HttpCache] = None,
+        retries: int = 2,
+    ):
+        """
+        Initialize the ResourceDownloader.
+
+        Parameters:
+        - session: The requests session to use. If None, a session whose connection
+          pools are sized for max_connections_per_host is created.
+        - max_workers: The maximum number of concurrent downloads.
+        - max_connections_per_host: The maximum number of concurrent downloads from the same host.
+        - timeout: The requests timeout, in seconds (a number, or a (connect, read) tuple).
+        - max_size: The maximum size of a resource, in bytes. None for no limit.
+        - cache: The HttpCache in which to cache responses. If None, nothing is cached.
+        - retries: The number of times a failed request is retried.
+        """
+        self._max_workers = max_workers
+        self._max_connections_per_host = max_connections_per_host
+        self._timeout = timeout
+        self._max_size = max_size
+        self._retries = retries
+
+        self._provided_session = session
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=max_workers, pool_maxsize=max_connections_per_host
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self._fetcher = HttpFetcher(
+            session=session, cache=cache, timeout=timeout, retries=retries
+        )
+
+        self._lock = threading.Lock()
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the configuration is pickled (e.g., when sent to worker processes
+        # by MarkItDown.convert_many). The copy shares the on-disk cache.
+        return {
+            "session": self._provided_session,
+            "max_workers": self._max_workers,
+            "max_connections_per_host": self._max_connections_per_host,
+            "timeout": self._timeout,
+            "max_size": self._max_size,
+            "cache": self._fetcher.cache,
+            "retries": self._retries,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def download(self, url: str) -> DownloadResult:
+        """Download a single resource. Errors are reported in the result, rather than raised."""
+        if urlparse(url).scheme.lower() not in ["http", "https"]:
+            return DownloadResult(url=url, error=f"Unsupported URL: {url}")
+
+        with self._get_host_semaphore(url):
+            try:
+                return self._download(url)
+            except (requests.RequestException, InputTooLargeException, OSError) as e:
+                return DownloadResult(url=url, error=str(e) or type(e).__name__)
+
+    def download_many(self, urls: Iterable[str]) -> Dict[str, DownloadResult]:
+        """
+        Download several resources concurrently. Each distinct URL is downloaded
+        once. Returns a dict mapping each URL to its result, in input order.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        if len(unique_urls) <= 1:
+            return {url: self.download(url) for url in unique_urls}
+
+        executor = self._get_executor()
+        futures = [executor.submit(self.download, url) for url in unique_urls]
+        return {url: future.result() for url, future in zip(unique_urls, futures)}
+
+    def close(self) -> None:
+        """Shut down the worker threads, and close the session (unless it was provided by the caller)."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        if self._provided_session is None:
+            self._fetcher.session.close()
+
+    def _download(self, url: str) -> DownloadResult:
+        with self._fetcher.open(url, max_size=self._max_size) as fetched:
+            content = fetched.stream.read()
+            mimetype = (fetched.headers.get("content-type") or "").split(";")[0]
+            return DownloadResult(
+                url=url,
+                content=content,
+                mimetype=mimetype.strip() or None,
+                from_cache=fetched.from_cache,
+            )
+
+    def _get_host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self._max_connections_per_host)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="markitdown-download",
+                )
+            return self._executor
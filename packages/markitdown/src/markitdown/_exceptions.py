@@ -39,6 +39,15 @@ class UnsupportedFormatException(MarkItDownException):
     pass
 
 
+class InputTooLargeException(MarkItDownException):
+    """
+    Thrown when the input is larger than the maximum input size (see the
+    max_input_size option of MarkItDown).
+    """
+
+    pass
+
+
 class FailedConversionAttempt(object):
     """
     Represents an a single attempt to convert a file.
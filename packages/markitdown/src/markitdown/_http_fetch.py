@@ -0,0 +1,506 @@
+import email.utils
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from ._spool import (
+    DEFAULT_SPOOL_THRESHOLD,
+    SpoolingBuffer,
+    check_input_size,
+    get_content_length,
+    get_response_chunk_size,
+)
+
+# (connect, read) timeouts, in seconds
+DEFAULT_HTTP_TIMEOUT = (10.0, 60.0)
+
+# Responses with these statuses are retried (as are connection errors and timeouts)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Backoff delays are capped at this many seconds (including Retry-After delays)
+_MAX_BACKOFF = 60.0
+
+# The response headers that are stored with cached bodies
+_CACHED_HEADERS = [
+    "content-type",
+    "content-disposition",
+    "etag",
+    "last-modified",
+    "cache-control",
+    "expires",
+]
+
+
+@dataclass
+class HttpCacheEntry:
+    """A cached HTTP response (see HttpCache)."""
+
+    url: str
+    headers: Dict[str, str]
+    body_path: str
+    expires_at: Optional[float] = None  # None if it must always be revalidated
+
+    def is_fresh(self) -> bool:
+        """True if the response may be used without revalidating it with the server."""
+        return self.expires_at is not None and time.time() < self.expires_at
+
+    def get_validators(self) -> Dict[str, str]:
+        """The headers with which to revalidate the response (a conditional request)."""
+        validators = {}
+        if self.headers.get("etag"):
+            validators["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            validators["If-Modified-Since"] = self.headers["last-modified"]
+        return validators
+
+
+def get_expiry(headers: Any) -> Tuple[bool, Optional[float]]:
+    """
+    Interpret a response's caching headers. Returns (cacheable, expires_at), where
+    expires_at is the time until which the response is fresh (from Cache-Control
+    max-age, or Expires), or None if it must be revalidated before every use.
+    Responses are cacheable unless marked no-store, or if they can neither be
+    revalidated (no ETag or Last-Modified) nor are fresh for some time.
+    """
+    cache_control = (headers.get("cache-control") or "").lower()
+    directives = [d.strip() for d in cache_control.split(",")]
+    if "no-store" in directives:
+        return False, None
+
+    expires_at: Optional[float] = None
+    if "no-cache" not in directives:
+        max_age = re.search(r"(?:^|,)\s*max-age\s*=\s*(\d+)", cache_control)
+        if max_age:
+            expires_at = time.time() + int(max_age.group(1))
+        elif headers.get("expires"):
+            try:
+                expires_at = email.utils.parsedate_to_datetime(
+                    headers["expires"]
+                ).timestamp()
+            except (TypeError, ValueError):
+                expires_at = None
+
+    has_validators = bool(headers.get("etag") or headers.get("last-modified"))
+    fresh = expires_at is not None and expires_at > time.time()
+    return has_validators or fresh, expires_at if fresh else None
+
+
+class HttpCache:
+    """
+    An on-disk cache of HTTP responses (bodies, and the headers needed to reuse
+    them), shared by HttpFetcher and ResourceDownloader. Responses are cached
+    according to their Cache-Control/Expires headers, and revalidated with their
+    ETag/Last-Modified validators once stale. The total size of the cached bodies
+    is bounded, and the least recently used entries are evicted first.
+
+        md = MarkItDown(http_fetcher=HttpFetcher(cache=HttpCache("~/.cache/markitdown/http")))
+    """
+
+    def __init__(self, cache_dir: str, *, max_disk_bytes: int = 1024 * 1024 * 1024):
+        """
+        Initialize the HttpCache.
+
+        Parameters:
+        - cache_dir: The directory of the cache.
+        - max_disk_bytes: The maximum total size of the cached bodies.
+        """
+        self._cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        self._max_disk_bytes = max_disk_bytes
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None  # Computed lazily
+
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the configuration is pickled (e.g., when sent to worker processes)
+        return {"cache_dir": self._cache_dir, "max_disk_bytes": self._max_disk_bytes}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    def lookup(self, url: str) -> Optional[HttpCacheEntry]:
+        """Return the cached response for the URL, or None if there is none."""
+        path = self._entry_path(url)
+        try:
+            with open(path, "rt", encoding="utf-8") as fh:
+                data = json.load(fh)
+            entry = HttpCacheEntry(
+                url=data["url"],
+                headers=data["headers"],
+                body_path=path[: -len(".json")] + ".body",
+                expires_at=data.get("expires_at"),
+            )
+            os.utime(entry.body_path)  # Mark as recently used
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return entry if entry.url == url else None
+
+    def open_body(self, entry: HttpCacheEntry) -> BinaryIO:
+        """Open the cached body of a response."""
+        return open(entry.body_path, "rb")
+
+    @contextmanager
+    def body_writer(self) -> Iterator[Tuple[BinaryIO, str]]:
+        """
+        Yield a (file, path) to which to write the body of a response, before it is
+        stored with store(). The file is removed if it is not stored.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                yield fh, tmp_path
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def store(
+        self, url: str, headers: Any, body_path: str, expires_at: Optional[float]
+    ) -> HttpCacheEntry:
+        """
+        Store a response, moving the body written with body_writer() into the
+        cache. Raises OSError if it can't be stored.
+        """
+        entry_path = self._entry_path(url)
+        entry = HttpCacheEntry(
+            url=url,
+            headers=_select_headers(headers),
+            body_path=entry_path[: -len(".json")] + ".body",
+            expires_at=expires_at,
+        )
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+        # Any previous entry is removed first, so that its metadata is never paired
+        # with the new body. The body is then moved into place before the new
+        # metadata that refers to it is written.
+        self._remove(url)
+        size = os.path.getsize(body_path)
+        os.replace(body_path, entry.body_path)
+        self._write_entry(entry_path, entry)
+        self._add_disk_bytes(size)
+        return entry
+
+    def refresh(
+        self, entry: HttpCacheEntry, headers: Any, expires_at: Optional[float]
+    ) -> HttpCacheEntry:
+        """Update a revalidated (304 Not Modified) entry with the headers of the new response."""
+        updated = HttpCacheEntry(
+            url=entry.url,
+            headers={**entry.headers, **_select_headers(headers)},
+            body_path=entry.body_path,
+            expires_at=expires_at,
+        )
+        self._write_entry(self._entry_path(entry.url), updated)
+        return updated
+
+    def clear(self) -> None:
+        """Remove all entries. Counters are not reset."""
+        with self._lock:
+            for path, _, _ in self._disk_entries():
+                for p in [path, path[: -len(".body")] + ".json"]:
+                    try:
+                        os.remove(p)
+                    except OSError:
+                        pass
+            self._disk_bytes = 0
+
+    def _entry_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dir, key[0:2], key + ".json")
+
+    def _write_entry(self, path: str, entry: HttpCacheEntry) -> None:
+        # Write atomically, so that concurrent readers never see a partial entry
+        data = {
+            "url": entry.url,
+            "headers": entry.headers,
+            "expires_at": entry.expires_at,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wt", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _remove(self, url: str) -> None:
+        entry_path = self._entry_path(url)
+        body_path = entry_path[: -len(".json")] + ".body"
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+        try:
+            size = os.path.getsize(body_path)
+            os.remove(body_path)
+        except OSError:
+            return
+        self._add_disk_bytes(-size)
+
+    def _add_disk_bytes(self, size: int) -> None:
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(s for _, s, _ in self._disk_entries())
+            else:
+                self._disk_bytes += size
+
+            if self._disk_bytes > self._max_disk_bytes:
+                self._disk_evict()
+
+    def _disk_entries(self) -> List[Tuple[str, int, float]]:
+        """List (body path, size, last use) for every cached body."""
+        entries = []
+        for root, _, files in os.walk(self._cache_dir):
+            for name in files:
+                if name.endswith(".body"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _disk_evict(self) -> None:
+        # Must be called with the lock held
+        entries = sorted(self._disk_entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self._max_disk_bytes:
+                break
+            for p in [path[: -len(".body")] + ".json", path]:
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            total -= size
+            self.evictions += 1
+        self._disk_bytes = total
+
+
+def _select_headers(headers: Any) -> Dict[str, str]:
+    return {name: headers[name] for name in _CACHED_HEADERS if headers.get(name)}
+
+
+class FetchedResponse:
+    """A response opened by HttpFetcher, with its body in a seekable stream."""
+
+    def __init__(
+        self,
+        *,
+        url: str,
+        headers: Any,
+        stream: BinaryIO,
+        from_cache: bool = False,
+    ):
+        """
+        Initialize the FetchedResponse.
+
+        Parameters:
+        - url: The final URL of the response (after any redirects).
+        - headers: The (case-insensitive) response headers.
+        - stream: The body, positioned at its start.
+        - from_cache: True if the body was served from the HttpCache (fresh, or revalidated with a 304).
+        """
+        self.url = url
+        self.headers = headers
+        self.stream = stream
+        self.from_cache = from_cache
+
+
+class HttpFetcher:
+    """
+    Fetches HTTP(S) resources for MarkItDown (see convert_uri), with timeouts,
+    retries with exponential backoff (of connection errors, timeouts, and 429/5xx
+    responses), and, if given an HttpCache, conditional requests: unchanged
+    resources are answered with a 304, and served from the cache without being
+    downloaded again (and, with a ConversionCache, without being converted again).
+    """
+
+    def __init__(
+        self,
+        *,
+        session: Optional[requests.Session] = None,
+        cache: Optional[HttpCache] = None,
+        timeout: Union[None, float, Tuple[float, float]] = DEFAULT_HTTP_TIMEOUT,
+        retries: int = 2,
+        backoff_factor: float = 0.5,
+        retry_statuses: Tuple[int, ...] = RETRY_STATUSES,
+    ):
+        """
+        Initialize the HttpFetcher.
+
+        Parameters:
+        - session: The requests session to use. If None, a new session is created.
+        - cache: The HttpCache in which to cache responses. If None, nothing is cached.
+        - timeout: The requests timeout, in seconds (a number, a (connect, read) tuple, or None for no timeout).
+        - retries: The number of times a failed request is retried.
+        - backoff_factor: Retry n (from 0) waits backoff_factor * 2**n seconds (or as long as a Retry-After header asks).
+        - retry_statuses: The response statuses that are retried.
+        """
+        self._provided_session = session
+        self.session = requests.Session() if session is None else session
+        self.cache = cache
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff_factor = backoff_factor
+        self._retry_statuses = retry_statuses
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the configuration is pickled (e.g., when sent to worker processes)
+        return {
+            "session": self._provided_session,
+            "cache": self.cache,
+            "timeout": self._timeout,
+            "retries": self._retries,
+            "backoff_factor": self._backoff_factor,
+            "retry_statuses": self._retry_statuses,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)  # type: ignore[misc]
+
+    @contextmanager
+    def open(
+        self,
+        url: str,
+        *,
+        max_size: Optional[int] = None,
+        spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+    ) -> Iterator[FetchedResponse]:
+        """
+        Fetch a URL, and yield the FetchedResponse, whose stream is closed on exit.
+        Raises requests.HTTPError for error statuses (after any retries), and
+        InputTooLargeException if the body is larger than max_size bytes.
+        Responses that are not cached are buffered in memory up to spool_threshold
+        bytes, and on disk beyond that.
+        """
+        entry = None if self.cache is None else self.cache.lookup(url)
+        if entry is not None and entry.is_fresh():
+            assert self.cache is not None  # for mypy
+            self.cache.hits += 1
+            with self.cache.open_body(entry) as stream:
+                yield FetchedResponse(
+                    url=url,
+                    headers=CaseInsensitiveDict(entry.headers),
+                    stream=stream,
+                    from_cache=True,
+                )
+            return
+
+        headers = {} if entry is None else entry.get_validators()
+        with self._get(url, headers) as response:
+            if response.status_code == 304 and entry is not None:
+                assert self.cache is not None  # for mypy
+                self.cache.revalidations += 1
+                _, expires_at = get_expiry(response.headers)
+                entry = self.cache.refresh(entry, response.headers, expires_at)
+                with self.cache.open_body(entry) as stream:
+                    yield FetchedResponse(
+                        url=url,
+                        headers=CaseInsensitiveDict(entry.headers),
+                        stream=stream,
+                        from_cache=True,
+                    )
+                return
+
+            response.raise_for_status()
+            if self.cache is not None:
+                self.cache.misses += 1
+
+            # Fail early if the server reports that the body is too large
+            content_length = get_content_length(response.headers)
+            if content_length is not None:
+                check_input_size(content_length, max_size)
+            chunks = response.iter_content(
+                chunk_size=get_response_chunk_size(content_length)
+            )
+
+            # Buffer the body (spilling to disk if it is large) and, if it is
+            # cacheable, also write it into the cache
+            cacheable, expires_at = get_expiry(response.headers)
+            cache_body: Any = nullcontext(None)
+            if self.cache is not None and cacheable and response.url == url:
+                cache_body = self.cache.body_writer()
+
+            buffer = SpoolingBuffer(
+                spool_threshold=spool_threshold, max_input_size=max_size
+            )
+            try:
+                with cache_body as cache_file:
+                    for chunk in chunks:
+                        buffer.write(chunk)
+                        if cache_file is not None:
+                            cache_file[0].write(chunk)
+
+                    if cache_file is not None:
+                        assert self.cache is not None  # for mypy
+                        cache_file[0].close()
+                        try:
+                            self.cache.store(
+                                url, response.headers, cache_file[1], expires_at
+                            )
+                        except OSError:
+                            # E.g., the previous body is still open elsewhere (on Windows)
+                            pass
+            except BaseException:
+                buffer.close()
+                raise
+            stream = buffer.finish()
+
+            fetched = FetchedResponse(
+                url=response.url, headers=response.headers, stream=stream
+            )
+
+        with stream:
+            yield fetched
+
+    @contextmanager
+    def _get(self, url: str, headers: Dict[str, str]) -> Iterator[requests.Response]:
+        """GET the URL (streaming the body), retrying failed attempts."""
+        attempt = 0
+        while True:
+            try:
+                response = self.session.get(
+                    url, stream=True, timeout=self._timeout, headers=headers
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self._retries:
+                    raise
+                time.sleep(self._get_backoff(attempt, None))
+                attempt += 1
+                continue
+
+            if response.status_code in self._retry_statuses and attempt < self._retries:
+                delay = self._get_backoff(attempt, response.headers.get("retry-after"))
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            with response:
+                yield response
+            return
+
+    def _get_backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        delay = self._backoff_factor * (2**attempt)
+        if retry_after is not None and retry_after.strip().isdigit():
+            delay = max(delay, float(retry_after))
+        return min(delay, _MAX_BACKOFF)
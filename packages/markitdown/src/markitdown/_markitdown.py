@@ -4,20 +4,55 @@ import re
 import sys
 import shutil
 import traceback
+import threading
 import io
-from dataclasses import dataclass
+import asyncio
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
 from importlib.metadata import entry_points
-from typing import Any, List, Dict, Optional, Union, BinaryIO
+from typing import (
+    Any,
+    List,
+    Dict,
+    Iterable,
+    Iterator,
+    NoReturn,
+    Optional,
+    Tuple,
+    Union,
+    BinaryIO,
+)
 from pathlib import Path
-from urllib.parse import urlparse
 from warnings import warn
 import requests
-import magika
-import charset_normalizer
-import codecs
 
+from .__about__ import __version__
 from ._stream_info import StreamInfo
-from ._uri_utils import parse_data_uri, file_uri_to_path
+from ._uri_utils import parse_data_uri, file_uri_to_path, get_response_stream_info
+from ._conversion_cache import ConversionCache, hash_stream, make_cache_key
+from ._batch import BatchConversionResult, convert_many
+from ._converter_index import ConverterIndex
+from ._mmap_stream import open_mmap
+from ._spool import (
+    DEFAULT_SPOOL_THRESHOLD,
+    SpoolingBuffer,
+    check_input_size,
+    get_content_length,
+    get_response_chunk_size,
+    iter_stream_chunks,
+    spool_chunks,
+)
+from ._async import AsyncRunner
+from ._downloader import ResourceDownloader
+from ._http_fetch import HttpFetcher
+from ._charset import CharsetDetector, normalize_charset
+from ._detection import (
+    DETECTION_POLICIES,
+    DetectionTimings,
+    get_informative_mimetype,
+    is_text_mimetype,
+    sniff_stream,
+)
 
 from .converters import (
     PlainTextConverter,
@@ -62,6 +97,9 @@ PRIORITY_GENERIC_FILE_FORMAT = (
 
 _plugins: Union[None, List[Any]] = None  # If None, plugins have not been loaded yet.
 
+_magika: Any = None  # If None, the Magika model has not been loaded yet.
+_magika_lock = threading.Lock()
+
 
 def _load_plugins() -> Union[None, List[Any]]:
     """Lazy load plugins, exiting early if already loaded."""
@@ -83,6 +121,65 @@ def _load_plugins() -> Union[None, List[Any]]:
     return _plugins
 
 
+class _MarkdownNormalizer:
+    """
+    Incrementally applies the same normalization as MarkItDown._convert (strip
+    trailing whitespace from every line, and collapse runs of 3+ newlines to 2) to
+    Markdown that arrives in chunks, correctly handling lines and runs of blank
+    lines that span chunk boundaries.
+    """
+
+    def __init__(self):
+        self._partial_line = ""  # The last, incomplete, line seen so far
+        self._pending_newlines = 0  # Newlines seen since the last non-blank line
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk, returning the normalized text that is now final."""
+        lines = (self._partial_line + chunk).split("\n")
+        self._partial_line = lines.pop()
+
+        output: List[str] = []
+        for line in lines:
+            line = line.rstrip()
+            if line:
+                output.append(self._flush_newlines())
+                output.append(line)
+            self._pending_newlines += 1
+        return "".join(output)
+
+    def finish(self) -> str:
+        """Return whatever normalized text remains after the last chunk."""
+        line = self._partial_line.rstrip()
+        self._partial_line = ""
+        return self._flush_newlines() + line
+
+    def _flush_newlines(self) -> str:
+        newlines = (
+            "\n\n" if self._pending_newlines >= 3 else "\n" * self._pending_newlines
+        )
+        self._pending_newlines = 0
+        return newlines
+
+
+def _get_magika() -> Any:
+    """
+    Lazy load the Magika model, on first use. Loading the model is expensive, so a
+    single instance is shared by all MarkItDown instances in the process.
+    """
+    global _magika
+
+    # Skip if we've already loaded the model
+    if _magika is not None:
+        return _magika
+
+    with _magika_lock:
+        if _magika is None:
+            import magika
+
+            _magika = magika.Magika()
+    return _magika
+
+
 @dataclass(kw_only=True, frozen=True)
 class ConverterRegistration:
     """A registration of a converter with its priority and other metadata."""
@@ -105,13 +202,68 @@ class MarkItDown:
         self._builtins_enabled = False
         self._plugins_enabled = False
 
+        # Remember the constructor arguments, so that worker processes can build equivalent instances
+        self._init_kwargs: Dict[str, Any] = {
+            "enable_builtins": enable_builtins,
+            "enable_plugins": enable_plugins,
+            **kwargs,
+        }
+
         requests_session = kwargs.get("requests_session")
         if requests_session is None:
             self._requests_session = requests.Session()
         else:
             self._requests_session = requests_session
 
-        self._magika = magika.Magika()
+        # Optional cache of conversion results (see ConversionCache)
+        self._cache: Optional[ConversionCache] = kwargs.get("cache")
+
+        # When to run Magika, rather than trust the extension/mimetype hints (see DETECTION_POLICIES)
+        self._detection_policy: str = kwargs.get("detection_policy") or "verify"
+        if self._detection_policy not in DETECTION_POLICIES:
+            raise ValueError(
+                f"Invalid detection_policy: {self._detection_policy}. Expected one of: {', '.join(DETECTION_POLICIES)}"
+            )
+        self._detection_timings = DetectionTimings()
+
+        # Detects the charset of text inputs whose charset is not known, from a
+        # sample of windows at their start, middle and end (see CharsetDetector)
+        self._charset_detector: CharsetDetector = (
+            kwargs.get("charset_detector") or CharsetDetector()
+        )
+
+        # Read local files through a memory map, rather than regular file objects (see open_mmap)
+        self._use_mmap: bool = bool(kwargs.get("use_mmap"))
+
+        # Non-seekable inputs (e.g., stdin, HTTP responses) are buffered in memory up to
+        # spool_threshold bytes, and on disk beyond that (see spool_chunks). Inputs larger
+        # than max_input_size bytes (if set) are rejected with InputTooLargeException.
+        spool_threshold = kwargs.get("spool_threshold")
+        self._spool_threshold: int = (
+            DEFAULT_SPOOL_THRESHOLD if spool_threshold is None else spool_threshold
+        )
+        self._max_input_size: Optional[int] = kwargs.get("max_input_size")
+
+        # Fetches HTTP(S) URIs, with timeouts and retries and, if it has an HttpCache,
+        # conditional requests (see HttpFetcher). By default, one sharing the requests
+        # session, without a cache, is used.
+        self._http_fetcher: HttpFetcher = kwargs.get("http_fetcher") or HttpFetcher(
+            session=self._requests_session
+        )
+
+        # Downloads the images of HTML documents, when converting with
+        # download_images=True (see ResourceDownloader). By default, one sharing the
+        # requests session and the HttpFetcher's cache is created on first use.
+        self._resource_downloader: Optional[ResourceDownloader] = kwargs.get(
+            "resource_downloader"
+        )
+        self._resource_downloader_lock = threading.Lock()
+
+        # Worker threads and HTTP client for the async API (see aconvert)
+        self._async_runner = AsyncRunner(
+            max_workers=kwargs.get("max_async_workers"),
+            http_client=kwargs.get("async_http_client"),
+        )
 
         # TODO - remove these (see enable_builtins)
         self._llm_client: Any = None
@@ -122,6 +274,7 @@ class MarkItDown:
 
         # Register the converters
         self._converters: List[ConverterRegistration] = []
+        self._converter_index: Optional[ConverterIndex] = None
 
         if (
             enable_builtins is None or enable_builtins
@@ -294,6 +447,315 @@ class MarkItDown:
                 f"Invalid source type: {type(source)}. Expected str, requests.Response, BinaryIO."
             )
 
+    async def aconvert(
+        self,
+        source: Union[str, requests.Response, Path, BinaryIO],
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> DocumentConverterResult:
+        """
+        Like convert(), but for asyncio. The event loop is never blocked: HTTP(S) URIs
+        are fetched with a pooled async client (if httpx is installed), and everything
+        else, including the conversion itself, runs in a bounded pool of worker
+        threads (of size max_async_workers).
+
+        Args:
+            - source: as for convert()
+            - stream_info: optional stream info to use for the conversion. If None, infer from source
+            - timeout: optional time limit, in seconds, after which asyncio.TimeoutError is raised.
+              As on cancellation, a conversion that is already running in a worker thread runs to
+              completion in the background, and its result is discarded.
+            - kwargs: additional arguments to pass to the converter
+        """
+        if isinstance(source, str) and (
+            source.startswith("http:") or source.startswith("https:")
+        ):
+            # Rename the url argument to mock_url
+            # (Deprecated -- use stream_info)
+            _kwargs = {k: v for k, v in kwargs.items()}
+            if "url" in _kwargs:
+                _kwargs["mock_url"] = _kwargs["url"]
+                del _kwargs["url"]
+
+            return await self.aconvert_uri(
+                source, stream_info=stream_info, timeout=timeout, **_kwargs
+            )
+
+        return await asyncio.wait_for(
+            self._async_runner.run(
+                self.convert, source, stream_info=stream_info, **kwargs
+            ),
+            timeout,
+        )
+
+    async def aconvert_uri(
+        self,
+        uri: str,
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        mock_url: Optional[
+            str
+        ] = None,  # Mock the request as if it came from a different URL
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> DocumentConverterResult:
+        """Like convert_uri(), but for asyncio (see aconvert)."""
+        return await asyncio.wait_for(
+            self._aconvert_uri(
+                uri.strip(), stream_info=stream_info, mock_url=mock_url, **kwargs
+            ),
+            timeout,
+        )
+
+    async def _aconvert_uri(
+        self,
+        uri: str,
+        *,
+        stream_info: Optional[StreamInfo],
+        mock_url: Optional[str],
+        **kwargs: Any,
+    ) -> DocumentConverterResult:
+        # HTTP URIs are fetched with httpx, unless responses are cached (see HttpFetcher)
+        http_client = None
+        if (
+            uri.startswith("http:") or uri.startswith("https:")
+        ) and self._http_fetcher.cache is None:
+            http_client = self._async_runner.get_http_client()
+
+        # File and data URIs (and HTTP URIs, if httpx is not installed or responses
+        # are cached) are opened in a worker thread
+        if http_client is None:
+            return await self._async_runner.run(
+                self.convert_uri,
+                uri,
+                stream_info=stream_info,
+                mock_url=mock_url,
+                **kwargs,
+            )
+
+        async with http_client.stream("GET", uri) as response:
+            response.raise_for_status()
+
+            base_guess = get_response_stream_info(response.headers, str(response.url))
+            if stream_info is not None:
+                base_guess = base_guess.copy_and_update(stream_info)
+            if mock_url is not None:
+                base_guess = base_guess.copy_and_update(url=mock_url)
+
+            # Fail early if the server reports that the body is too large
+            content_length = get_content_length(response.headers)
+            if content_length is not None:
+                check_input_size(content_length, self._max_input_size)
+
+            # Buffer the body (spilling to disk if it is large), as in convert_response()
+            buffer = SpoolingBuffer(
+                spool_threshold=self._spool_threshold,
+                max_input_size=self._max_input_size,
+            )
+            try:
+                async for chunk in response.aiter_bytes(
+                    get_response_chunk_size(content_length)
+                ):
+                    buffer.write(chunk)
+            except BaseException:
+                buffer.close()
+                raise
+
+        return await self._async_runner.run(
+            self._convert_spooled, buffer.finish(), base_guess, kwargs
+        )
+
+    def _convert_spooled(
+        self, file_stream: BinaryIO, base_guess: StreamInfo, kwargs: Dict[str, Any]
+    ) -> DocumentConverterResult:
+        """Convert a spooled stream, closing it when done."""
+        with file_stream:
+            return self._convert_with_base_guess(
+                file_stream=file_stream, base_guess=base_guess, **kwargs
+            )
+
+    async def aconvert_stream(
+        self,
+        stream: BinaryIO,
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> DocumentConverterResult:
+        """Like convert_stream(), but for asyncio (see aconvert). The stream is read in a worker thread."""
+        return await asyncio.wait_for(
+            self._async_runner.run(
+                self.convert_stream, stream, stream_info=stream_info, **kwargs
+            ),
+            timeout,
+        )
+
+    async def wait_idle(self) -> None:
+        """
+        Wait until the conversions running in the async API's worker threads have
+        finished, including those whose result was discarded (e.g., after a timeout).
+        """
+        await self._async_runner.wait_idle()
+
+    async def aclose(self) -> None:
+        """Release the resources of the async API: the HTTP client (unless one was provided), and the worker threads."""
+        await self._async_runner.aclose()
+
+    def get_resource_downloader(self) -> ResourceDownloader:
+        """
+        Return the ResourceDownloader used to download the images of HTML documents
+        (when converting with download_images=True). It can also be used directly,
+        e.g., to download the images that a converted document refers to.
+        """
+        with self._resource_downloader_lock:
+            if self._resource_downloader is None:
+                self._resource_downloader = ResourceDownloader(
+                    session=self._requests_session, cache=self._http_fetcher.cache
+                )
+            return self._resource_downloader
+
+    def convert_many(
+        self,
+        sources: Iterable[Union[str, requests.Response, Path, BinaryIO]],
+        *,
+        max_workers: Optional[int] = None,
+        executor: str = "process",
+        ordered: bool = True,
+        stream_info: Optional[StreamInfo] = None,
+        **kwargs: Any,
+    ) -> Iterator[BatchConversionResult]:
+        """
+        Convert many sources in parallel, yielding a BatchConversionResult for each.
+
+        Failures do not abort the batch: the result's `exception` is set to the
+        FileConversionException or UnsupportedFormatException instead.
+
+        Args:
+            - sources: an iterable of sources, as accepted by convert(). Sources are consumed lazily.
+            - max_workers: the number of workers. Defaults to the number of CPUs.
+            - executor: "process" or "thread". Each worker process builds its own MarkItDown
+              instance once, from this instance's constructor arguments (which must be picklable),
+              and reuses it for all its tasks. Converters registered after construction are
+              only available with the "thread" executor, as are stream sources.
+            - ordered: if True, results are yielded in input order. Otherwise, as they complete.
+            - stream_info: optional stream info applied to every source
+            - kwargs: additional arguments to pass to the converter
+        """
+        return convert_many(
+            self,
+            sources,
+            markitdown_kwargs=self._init_kwargs,
+            max_workers=max_workers,
+            executor=executor,
+            ordered=ordered,
+            stream_info=stream_info,
+            **kwargs,
+        )
+
+    def convert_iter(
+        self,
+        source: Union[str, requests.Response, Path, BinaryIO],
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        """
+        Convert a source, yielding the Markdown in chunks (e.g., per page, slide, sheet,
+        spine item, or zip member) as they are produced, rather than as one string.
+        Concatenated, the chunks are equal to convert(source).markdown.
+
+        The source is only opened once iteration begins. As with convert(), converters
+        are tried in turn until one succeeds; but once a converter has produced its
+        first chunk, any later failure is raised as a FileConversionException.
+        Converters that don't implement convert_iter() yield their output as one chunk.
+        Cached results are served from the cache (if one is configured), but streamed
+        conversions are not added to it.
+
+        Args:
+            - source: can be a path (str or Path), url, or a requests.response object
+            - stream_info: optional stream info to use for the conversion. If None, infer from source
+            - kwargs: additional arguments to pass to the converter
+        """
+        with self._open_source(source, stream_info=stream_info, **kwargs) as (
+            file_stream,
+            base_guess,
+            _kwargs,
+        ):
+            yield from self._convert_iter_with_base_guess(
+                file_stream=file_stream, base_guess=base_guess, **_kwargs
+            )
+
+    @contextmanager
+    def _open_source(
+        self,
+        source: Union[str, requests.Response, Path, BinaryIO],
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        **kwargs: Any,
+    ) -> Iterator[Tuple[BinaryIO, StreamInfo, Dict[str, Any]]]:
+        """
+        Open any source accepted by convert(), yielding the (seekable) stream, the base
+        StreamInfo guess, and the kwargs that remain to be passed to the converters.
+        """
+        _kwargs = {k: v for k, v in kwargs.items()}
+        file_extension = _kwargs.pop("file_extension", None)
+
+        opener: Any = None
+        # Local path or url
+        if isinstance(source, str) and (
+            source.startswith("http:")
+            or source.startswith("https:")
+            or source.startswith("file:")
+            or source.startswith("data:")
+        ):
+            # The url argument is treated as mock_url
+            # (Deprecated -- use stream_info)
+            if "url" in _kwargs:
+                _kwargs["mock_url"] = _kwargs.pop("url")
+            opener = self._open_uri(
+                source,
+                stream_info=stream_info,
+                file_extension=file_extension,
+                mock_url=_kwargs.pop("mock_url", None),
+            )
+        # Local path, or Path object
+        elif isinstance(source, (str, Path)):
+            opener = self._open_local(
+                source,
+                stream_info=stream_info,
+                file_extension=file_extension,
+                url=_kwargs.pop("url", None),
+            )
+        # Request response
+        elif isinstance(source, requests.Response):
+            opener = self._open_response(
+                source,
+                stream_info=stream_info,
+                file_extension=file_extension,
+                url=_kwargs.pop("url", None),
+            )
+        # Binary stream
+        elif (
+            hasattr(source, "read")
+            and callable(source.read)
+            and not isinstance(source, io.TextIOBase)
+        ):
+            opener = self._open_stream(
+                source,
+                stream_info=stream_info,
+                file_extension=file_extension,
+                url=_kwargs.pop("url", None),
+            )
+        else:
+            raise TypeError(
+                f"Invalid source type: {type(source)}. Expected str, requests.Response, BinaryIO."
+            )
+
+        with opener as (file_stream, base_guess):
+            yield file_stream, base_guess, _kwargs
+
     def convert_local(
         self,
         path: Union[str, Path],
@@ -303,6 +765,22 @@ class MarkItDown:
         url: Optional[str] = None,  # Deprecated -- use stream_info
         **kwargs: Any,
     ) -> DocumentConverterResult:
+        with self._open_local(
+            path, stream_info=stream_info, file_extension=file_extension, url=url
+        ) as (fh, base_guess):
+            return self._convert_with_base_guess(
+                file_stream=fh, base_guess=base_guess, **kwargs
+            )
+
+    @contextmanager
+    def _open_local(
+        self,
+        path: Union[str, Path],
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        file_extension: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> Iterator[Tuple[BinaryIO, StreamInfo]]:
         if isinstance(path, Path):
             path = str(path)
 
@@ -325,11 +803,10 @@ class MarkItDown:
             # Deprecated -- use stream_info
             base_guess = base_guess.copy_and_update(url=url)
 
-        with open(path, "rb") as fh:
-            guesses = self._get_stream_info_guesses(
-                file_stream=fh, base_guess=base_guess
-            )
-            return self._convert(file_stream=fh, stream_info_guesses=guesses, **kwargs)
+        check_input_size(os.path.getsize(path), self._max_input_size)
+
+        with open_mmap(path) if self._use_mmap else open(path, "rb") as fh:
+            yield fh, base_guess
 
     def convert_stream(
         self,
@@ -340,8 +817,22 @@ class MarkItDown:
         url: Optional[str] = None,  # Deprecated -- use stream_info
         **kwargs: Any,
     ) -> DocumentConverterResult:
-        guesses: List[StreamInfo] = []
+        with self._open_stream(
+            stream, stream_info=stream_info, file_extension=file_extension, url=url
+        ) as (file_stream, base_guess):
+            return self._convert_with_base_guess(
+                file_stream=file_stream, base_guess=base_guess, **kwargs
+            )
 
+    @contextmanager
+    def _open_stream(
+        self,
+        stream: BinaryIO,
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        file_extension: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> Iterator[Tuple[BinaryIO, StreamInfo]]:
         # Do we have anything on which to base a guess?
         base_guess = None
         if stream_info is not None or file_extension is not None or url is not None:
@@ -361,22 +852,24 @@ class MarkItDown:
                 assert base_guess is not None  # for mypy
                 base_guess = base_guess.copy_and_update(url=url)
 
-        # Check if we have a seekable stream. If not, load the entire stream into memory.
+        # Check if we have a seekable stream. If not, buffer the entire stream (spilling to disk if it is large).
         if not stream.seekable():
-            buffer = io.BytesIO()
-            while True:
-                chunk = stream.read(4096)
-                if not chunk:
-                    break
-                buffer.write(chunk)
-            buffer.seek(0)
-            stream = buffer
-
-        # Add guesses based on stream content
-        guesses = self._get_stream_info_guesses(
-            file_stream=stream, base_guess=base_guess or StreamInfo()
-        )
-        return self._convert(file_stream=stream, stream_info_guesses=guesses, **kwargs)
+            with spool_chunks(
+                iter_stream_chunks(stream),
+                spool_threshold=self._spool_threshold,
+                max_input_size=self._max_input_size,
+            ) as buffer:
+                yield buffer, base_guess or StreamInfo()
+            return
+
+        if self._max_input_size is not None:
+            cur_pos = stream.tell()
+            check_input_size(
+                stream.seek(0, io.SEEK_END) - cur_pos, self._max_input_size
+            )
+            stream.seek(cur_pos)
+
+        yield stream, base_guess or StreamInfo()
 
     def convert_url(
         self,
@@ -408,6 +901,25 @@ class MarkItDown:
         ] = None,  # Mock the request as if it came from a different URL
         **kwargs: Any,
     ) -> DocumentConverterResult:
+        with self._open_uri(
+            uri,
+            stream_info=stream_info,
+            file_extension=file_extension,
+            mock_url=mock_url,
+        ) as (file_stream, base_guess):
+            return self._convert_with_base_guess(
+                file_stream=file_stream, base_guess=base_guess, **kwargs
+            )
+
+    @contextmanager
+    def _open_uri(
+        self,
+        uri: str,
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        file_extension: Optional[str] = None,
+        mock_url: Optional[str] = None,
+    ) -> Iterator[Tuple[BinaryIO, StreamInfo]]:
         uri = uri.strip()
 
         # File URIs
@@ -417,13 +929,13 @@ class MarkItDown:
                 raise ValueError(
                     f"Unsupported file URI: {uri}. Netloc must be empty or localhost."
                 )
-            return self.convert_local(
+            with self._open_local(
                 path,
                 stream_info=stream_info,
                 file_extension=file_extension,
                 url=mock_url,
-                **kwargs,
-            )
+            ) as opened:
+                yield opened
         # Data URIs
         elif uri.startswith("data:"):
             mimetype, attributes, data = parse_data_uri(uri)
@@ -435,24 +947,28 @@ class MarkItDown:
             if stream_info is not None:
                 base_guess = base_guess.copy_and_update(stream_info)
 
-            return self.convert_stream(
+            with self._open_stream(
                 io.BytesIO(data),
                 stream_info=base_guess,
                 file_extension=file_extension,
                 url=mock_url,
-                **kwargs,
-            )
+            ) as opened:
+                yield opened
         # HTTP/HTTPS URIs
         elif uri.startswith("http:") or uri.startswith("https:"):
-            response = self._requests_session.get(uri, stream=True)
-            response.raise_for_status()
-            return self.convert_response(
-                response,
-                stream_info=stream_info,
-                file_extension=file_extension,
-                url=mock_url,
-                **kwargs,
-            )
+            with self._http_fetcher.open(
+                uri,
+                max_size=self._max_input_size,
+                spool_threshold=self._spool_threshold,
+            ) as fetched:
+                base_guess = self._get_response_base_guess(
+                    fetched.headers,
+                    fetched.url,
+                    stream_info=stream_info,
+                    file_extension=file_extension,
+                    url=mock_url,
+                )
+                yield fetched.stream, base_guess
         else:
             raise ValueError(
                 f"Unsupported URI scheme: {uri.split(':')[0]}. Supported schemes are: file:, data:, http:, https:"
@@ -467,47 +983,55 @@ class MarkItDown:
         url: Optional[str] = None,  # Deprecated -- use stream_info
         **kwargs: Any,
     ) -> DocumentConverterResult:
-        # If there is a content-type header, get the mimetype and charset (if present)
-        mimetype: Optional[str] = None
-        charset: Optional[str] = None
-
-        if "content-type" in response.headers:
-            parts = response.headers["content-type"].split(";")
-            mimetype = parts.pop(0).strip()
-            for part in parts:
-                if part.strip().startswith("charset="):
-                    _charset = part.split("=")[1].strip()
-                    if len(_charset) > 0:
-                        charset = _charset
-
-        # If there is a content-disposition header, get the filename and possibly the extension
-        filename: Optional[str] = None
-        extension: Optional[str] = None
-        if "content-disposition" in response.headers:
-            m = re.search(r"filename=([^;]+)", response.headers["content-disposition"])
-            if m:
-                filename = m.group(1).strip("\"'")
-                _, _extension = os.path.splitext(filename)
-                if len(_extension) > 0:
-                    extension = _extension
-
-        # If there is still no filename, try to read it from the url
-        if filename is None:
-            parsed_url = urlparse(response.url)
-            _, _extension = os.path.splitext(parsed_url.path)
-            if len(_extension) > 0:  # Looks like this might be a file!
-                filename = os.path.basename(parsed_url.path)
-                extension = _extension
-
-        # Create an initial guess from all this information
-        base_guess = StreamInfo(
-            mimetype=mimetype,
-            charset=charset,
-            filename=filename,
-            extension=extension,
-            url=response.url,
+        with self._open_response(
+            response, stream_info=stream_info, file_extension=file_extension, url=url
+        ) as (file_stream, base_guess):
+            return self._convert_with_base_guess(
+                file_stream=file_stream, base_guess=base_guess, **kwargs
+            )
+
+    @contextmanager
+    def _open_response(
+        self,
+        response: requests.Response,
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        file_extension: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> Iterator[Tuple[BinaryIO, StreamInfo]]:
+        base_guess = self._get_response_base_guess(
+            response.headers,
+            response.url,
+            stream_info=stream_info,
+            file_extension=file_extension,
+            url=url,
         )
 
+        # Fail early if the server reports that the body is too large
+        content_length = get_content_length(response.headers)
+        if content_length is not None:
+            check_input_size(content_length, self._max_input_size)
+
+        # Buffer the body (spilling to disk if it is large)
+        with spool_chunks(
+            response.iter_content(chunk_size=get_response_chunk_size(content_length)),
+            spool_threshold=self._spool_threshold,
+            max_input_size=self._max_input_size,
+        ) as buffer:
+            yield buffer, base_guess
+
+    def _get_response_base_guess(
+        self,
+        headers: Any,
+        response_url: str,
+        *,
+        stream_info: Optional[StreamInfo] = None,
+        file_extension: Optional[str] = None,
+        url: Optional[str] = None,
+    ) -> StreamInfo:
+        # Create an initial guess from the response headers and url
+        base_guess = get_response_stream_info(headers, response_url)
+
         # Update with any additional info from the arguments
         if stream_info is not None:
             base_guess = base_guess.copy_and_update(stream_info)
@@ -517,18 +1041,85 @@ class MarkItDown:
         if url is not None:
             # Deprecated -- use stream_info
             base_guess = base_guess.copy_and_update(url=url)
+        return base_guess
 
-        # Read into BytesIO
-        buffer = io.BytesIO()
-        for chunk in response.iter_content(chunk_size=512):
-            buffer.write(chunk)
-        buffer.seek(0)
+    def _convert_with_base_guess(
+        self, *, file_stream: BinaryIO, base_guess: StreamInfo, **kwargs
+    ) -> DocumentConverterResult:
+        """
+        Guess the stream info and convert the stream, consulting the result cache
+        (if one is configured) first. On a cache hit, neither stream info guessing
+        nor conversion takes place. Results with attachments (which are not cached)
+        bypass the cache.
+        """
+        cache_key: Optional[str] = None
+        if self._cache is not None and not kwargs.get("extract_attachments"):
+            cache_key = self._get_cache_key(file_stream, base_guess, kwargs)
+            cached = None if cache_key is None else self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-        # Convert
         guesses = self._get_stream_info_guesses(
-            file_stream=buffer, base_guess=base_guess
+            file_stream=file_stream, base_guess=base_guess
+        )
+        res = self._convert(
+            file_stream=file_stream, stream_info_guesses=guesses, **kwargs
+        )
+
+        if cache_key is not None:
+            assert self._cache is not None  # for mypy
+            self._cache.put(cache_key, res)
+        return res
+
+    def _convert_iter_with_base_guess(
+        self, *, file_stream: BinaryIO, base_guess: StreamInfo, **kwargs
+    ) -> Iterator[str]:
+        """
+        Streaming counterpart of _convert_with_base_guess. Cache hits are yielded as a
+        single chunk; streamed results are not added to the cache.
+        """
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._get_cache_key(file_stream, base_guess, kwargs)
+        if cache_key is not None:
+            assert self._cache is not None  # for mypy
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                if cached.markdown:
+                    yield cached.markdown
+                return
+
+        guesses = self._get_stream_info_guesses(
+            file_stream=file_stream, base_guess=base_guess
+        )
+        yield from self._convert_iter(
+            file_stream=file_stream, stream_info_guesses=guesses, **kwargs
         )
-        return self._convert(file_stream=buffer, stream_info_guesses=guesses, **kwargs)
+
+    def _get_cache_key(
+        self, file_stream: BinaryIO, base_guess: StreamInfo, kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Compute the cache key for a conversion: the hash of the stream content, plus
+        the effective options, the stream info hints, and the registered converters.
+        Returns None if the options can't be cached (see make_cache_key).
+        """
+        options: Dict[str, Any] = {
+            "version": __version__,
+            "converters": [
+                f"{type(r.converter).__module__}.{type(r.converter).__qualname__}:{r.priority}"
+                for r in self._converters
+            ],
+            "stream_info": asdict(base_guess),
+            "kwargs": kwargs,
+            "llm_client": self._llm_client,
+            "llm_model": self._llm_model,
+            "llm_prompt": self._llm_prompt,
+            "style_map": self._style_map,
+            "exiftool_path": self._exiftool_path,
+            "detection_policy": self._detection_policy,
+        }
+        return make_cache_key(hash_stream(file_stream), options)
 
     def _convert(
         self, *, file_stream: BinaryIO, stream_info_guesses: List[StreamInfo], **kwargs
@@ -538,50 +1129,163 @@ class MarkItDown:
         # Keep track of which converters throw exceptions
         failed_attempts: List[FailedConversionAttempt] = []
 
-        # Create a copy of the page_converters list, sorted by priority.
-        # We do this with each call to _convert because the priority of converters may change between calls.
-        # The sort is guaranteed to be stable, so converters with the same priority will remain in the same order.
-        sorted_registrations = sorted(self._converters, key=lambda x: x.priority)
+        # Remember the initial stream position so that we can return to it
+        cur_pos = file_stream.tell()
+
+        for converter, stream_info, _kwargs in self._iter_accepting_converters(
+            file_stream, stream_info_guesses, kwargs
+        ):
+            # Attempt the conversion
+            try:
+                res = converter.convert(file_stream, stream_info, **_kwargs)
+            except Exception:
+                failed_attempts.append(
+                    FailedConversionAttempt(
+                        converter=converter, exc_info=sys.exc_info()
+                    )
+                )
+            finally:
+                file_stream.seek(cur_pos)
+
+            if res is not None:
+                # Normalize the content
+                res.text_content = "\n".join(
+                    [line.rstrip() for line in re.split(r"\r?\n", res.text_content)]
+                )
+                res.text_content = re.sub(r"\n{3,}", "\n\n", res.text_content)
+                return res
+
+        self._raise_conversion_failure(failed_attempts)
+
+    def _convert_iter(
+        self, *, file_stream: BinaryIO, stream_info_guesses: List[StreamInfo], **kwargs
+    ) -> Iterator[str]:
+        """
+        Streaming counterpart of _convert. The content is normalized incrementally, as
+        it is yielded.
+        """
+        # Keep track of which converters throw exceptions
+        failed_attempts: List[FailedConversionAttempt] = []
 
         # Remember the initial stream position so that we can return to it
         cur_pos = file_stream.tell()
 
-        for stream_info in stream_info_guesses + [StreamInfo()]:
-            for converter_registration in sorted_registrations:
-                converter = converter_registration.converter
-                # Sanity check -- make sure the cur_pos is still the same
-                assert (
-                    cur_pos == file_stream.tell()
-                ), "File stream position should NOT change between guess iterations"
+        for converter, stream_info, _kwargs in self._iter_accepting_converters(
+            file_stream, stream_info_guesses, kwargs
+        ):
+            # Attempt the conversion. Until the converter has produced its first chunk,
+            # we can still fall back to the next converter if it fails.
+            chunks: Iterator[str] = iter([])
+            try:
+                chunks = iter(
+                    converter.convert_iter(file_stream, stream_info, **_kwargs)
+                )
+                first_chunk = next(chunks, None)
+            except Exception:
+                failed_attempts.append(
+                    FailedConversionAttempt(
+                        converter=converter, exc_info=sys.exc_info()
+                    )
+                )
+                file_stream.seek(cur_pos)
+                continue
+
+            # From here on, we are committed to this converter
+            normalizer = _MarkdownNormalizer()
+            try:
+                if first_chunk is not None:
+                    normalized = normalizer.feed(first_chunk)
+                    if normalized:
+                        yield normalized
+                    for chunk in chunks:
+                        normalized = normalizer.feed(chunk)
+                        if normalized:
+                            yield normalized
+            except Exception:
+                raise FileConversionException(
+                    attempts=[
+                        FailedConversionAttempt(
+                            converter=converter, exc_info=sys.exc_info()
+                        )
+                    ]
+                )
+            finally:
+                close = getattr(chunks, "close", None)
+                if close is not None:
+                    close()
+                file_stream.seek(cur_pos)
 
-                _kwargs = {k: v for k, v in kwargs.items()}
+            normalized = normalizer.finish()
+            if normalized:
+                yield normalized
+            return
+
+        self._raise_conversion_failure(failed_attempts)
+
+    def _iter_accepting_converters(
+        self,
+        file_stream: BinaryIO,
+        stream_info_guesses: List[StreamInfo],
+        kwargs: Dict[str, Any],
+    ) -> Iterator[Tuple[DocumentConverter, StreamInfo, Dict[str, Any]]]:
+        """
+        Yield (converter, stream_info, kwargs) for each converter that accepts the
+        stream, in the order in which the conversions should be attempted. Callers
+        must restore the stream position after each attempt.
+        """
+        # Look up the converters (already sorted by priority) in the dispatch index
+        converter_index = self._get_converter_index()
+
+        # Remember the initial stream position
+        cur_pos = file_stream.tell()
 
-                # Copy any additional global options
-                if "llm_client" not in _kwargs and self._llm_client is not None:
-                    _kwargs["llm_client"] = self._llm_client
+        # Copy any additional global options
+        base_kwargs = {k: v for k, v in kwargs.items()}
 
-                if "llm_model" not in _kwargs and self._llm_model is not None:
-                    _kwargs["llm_model"] = self._llm_model
+        if "llm_client" not in base_kwargs and self._llm_client is not None:
+            base_kwargs["llm_client"] = self._llm_client
 
-                if "llm_prompt" not in _kwargs and self._llm_prompt is not None:
-                    _kwargs["llm_prompt"] = self._llm_prompt
+        if "llm_model" not in base_kwargs and self._llm_model is not None:
+            base_kwargs["llm_model"] = self._llm_model
 
-                if "style_map" not in _kwargs and self._style_map is not None:
-                    _kwargs["style_map"] = self._style_map
+        if "llm_prompt" not in base_kwargs and self._llm_prompt is not None:
+            base_kwargs["llm_prompt"] = self._llm_prompt
 
-                if "exiftool_path" not in _kwargs and self._exiftool_path is not None:
-                    _kwargs["exiftool_path"] = self._exiftool_path
+        if "style_map" not in base_kwargs and self._style_map is not None:
+            base_kwargs["style_map"] = self._style_map
 
-                # Add the list of converters for nested processing
-                _kwargs["_parent_converters"] = self._converters
+        if "exiftool_path" not in base_kwargs and self._exiftool_path is not None:
+            base_kwargs["exiftool_path"] = self._exiftool_path
 
-                # Add legaxy kwargs
-                if stream_info is not None:
-                    if stream_info.extension is not None:
-                        _kwargs["file_extension"] = stream_info.extension
+        if "charset_detector" not in base_kwargs:
+            base_kwargs["charset_detector"] = self._charset_detector
 
-                    if stream_info.url is not None:
-                        _kwargs["url"] = stream_info.url
+        if base_kwargs.get("download_images"):
+            base_kwargs["resource_downloader"] = self.get_resource_downloader()
+
+        # Add the list of converters for nested processing
+        base_kwargs["_parent_converters"] = self._converters
+
+        for stream_info in stream_info_guesses + [StreamInfo()]:
+            # Converters receive their own copy (via **), so the kwargs only need
+            # to be assembled once per guess, rather than once per converter.
+            _kwargs = dict(base_kwargs)
+
+            # Add legaxy kwargs
+            if stream_info is not None:
+                if stream_info.extension is not None:
+                    _kwargs["file_extension"] = stream_info.extension
+
+                if stream_info.url is not None:
+                    _kwargs["url"] = stream_info.url
+
+            # Only converters whose declarations match the stream info are candidates
+            for converter_registration in converter_index.candidates(stream_info):
+                converter = converter_registration.converter
+                # Sanity check -- make sure the cur_pos is still the same
+                assert (
+                    cur_pos == file_stream.tell()
+                ), "File stream position should NOT change between guess iterations"
 
                 # Check if the converter will accept the file, and if so, try to convert it
                 _accepts = False
@@ -595,27 +1299,12 @@ class MarkItDown:
                     cur_pos == file_stream.tell()
                 ), f"{type(converter).__name__}.accept() should NOT change the file_stream position"
 
-                # Attempt the conversion
                 if _accepts:
-                    try:
-                        res = converter.convert(file_stream, stream_info, **_kwargs)
-                    except Exception:
-                        failed_attempts.append(
-                            FailedConversionAttempt(
-                                converter=converter, exc_info=sys.exc_info()
-                            )
-                        )
-                    finally:
-                        file_stream.seek(cur_pos)
-
-                if res is not None:
-                    # Normalize the content
-                    res.text_content = "\n".join(
-                        [line.rstrip() for line in re.split(r"\r?\n", res.text_content)]
-                    )
-                    res.text_content = re.sub(r"\n{3,}", "\n\n", res.text_content)
-                    return res
+                    yield converter, stream_info, _kwargs
 
+    def _raise_conversion_failure(
+        self, failed_attempts: List[FailedConversionAttempt]
+    ) -> NoReturn:
         # If we got this far without success, report any exceptions
         if len(failed_attempts) > 0:
             raise FileConversionException(attempts=failed_attempts)
@@ -648,7 +1337,8 @@ class MarkItDown:
         priority PRIORITY_SPECIFIC_FILE_FORMAT (== 10), with lower values
         being tried first (i.e., higher priority).
 
-        Just prior to conversion, the converters are sorted by priority, using
+        The converters are sorted by priority (and indexed by the extensions and
+        mimetypes they declare) when first needed after a registration, using
         a stable sort. This means that converters with the same priority will
         remain in the same order, with the most recently registered converters
         appearing first.
@@ -665,46 +1355,111 @@ class MarkItDown:
             0, ConverterRegistration(converter=converter, priority=priority)
         )
 
+        # Invalidate the dispatch index
+        self._converter_index = None
+
+    def _get_converter_index(self) -> ConverterIndex:
+        """
+        Return the dispatch index of the registered converters, (re)building it if
+        the registrations have changed since it was built.
+        """
+        if self._converter_index is None or len(
+            self._converter_index.registrations
+        ) != len(self._converters):
+            self._converter_index = ConverterIndex(self._converters)
+        return self._converter_index
+
+    @property
+    def detection_timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        The number of calls to, and the total time spent in, each stage of stream type
+        detection so far: "total", "sniff" (magic numbers), "magika", and "charset".
+        E.g., {"total": {"calls": 10, "seconds": 0.12}, "sniff": {...}, ...}
+        """
+        return self._detection_timings.snapshot()
+
     def _get_stream_info_guesses(
         self, file_stream: BinaryIO, base_guess: StreamInfo
     ) -> List[StreamInfo]:
         """
-        Given a base guess, attempt to guess or expand on the stream info using the stream content (via magika).
+        Given a base guess, attempt to guess or expand on the stream info using the stream content
+        (via a magic-number sniffer and/or magika, depending on the detection policy).
         """
-        guesses: List[StreamInfo] = []
+        with self._detection_timings.time("total"):
+            # Enhance the base guess with information based on the extension or mimetype
+            enhanced_guess = base_guess.copy_and_update()
+
+            # If there's an extension and no mimetype, try to guess the mimetype
+            if base_guess.mimetype is None and base_guess.extension is not None:
+                _m, _ = mimetypes.guess_type(
+                    "placeholder" + base_guess.extension, strict=False
+                )
+                if _m is not None:
+                    enhanced_guess = enhanced_guess.copy_and_update(mimetype=_m)
 
-        # Enhance the base guess with information based on the extension or mimetype
-        enhanced_guess = base_guess.copy_and_update()
+            # If there's a mimetype and no extension, try to guess the extension
+            if base_guess.mimetype is not None and base_guess.extension is None:
+                _e = mimetypes.guess_all_extensions(base_guess.mimetype, strict=False)
+                if len(_e) > 0:
+                    enhanced_guess = enhanced_guess.copy_and_update(extension=_e[0])
 
-        # If there's an extension and no mimetype, try to guess the mimetype
-        if base_guess.mimetype is None and base_guess.extension is not None:
-            _m, _ = mimetypes.guess_type(
-                "placeholder" + base_guess.extension, strict=False
+            has_hints = base_guess.extension is not None or bool(
+                get_informative_mimetype(base_guess)
             )
-            if _m is not None:
-                enhanced_guess = enhanced_guess.copy_and_update(mimetype=_m)
 
-        # If there's a mimetype and no extension, try to guess the extension
-        if base_guess.mimetype is not None and base_guess.extension is None:
-            _e = mimetypes.guess_all_extensions(base_guess.mimetype, strict=False)
-            if len(_e) > 0:
-                enhanced_guess = enhanced_guess.copy_and_update(extension=_e[0])
+            # Trust the hints, only filling in the charset of text if it is missing
+            if self._detection_policy == "trust_hints" and has_hints:
+                if enhanced_guess.charset is None and is_text_mimetype(
+                    enhanced_guess.mimetype
+                ):
+                    with self._detection_timings.time("charset"):
+                        enhanced_guess = self._charset_detector.detect_stream_info(
+                            file_stream, enhanced_guess
+                        )
+                return [enhanced_guess]
+
+            # Sniff the magic number, skipping magika if it confirms the hints (or,
+            # if there are none, if it identifies the format on its own)
+            if self._detection_policy != "always_sniff":
+                with self._detection_timings.time("sniff"):
+                    sniffed = sniff_stream(file_stream)
+                if sniffed is not None and (
+                    sniffed.agrees_with(base_guess)
+                    if has_hints
+                    else not sniffed.confirms_only
+                ):
+                    return [
+                        enhanced_guess.copy_and_update(
+                            mimetype=(
+                                enhanced_guess.mimetype
+                                if get_informative_mimetype(enhanced_guess)
+                                else sniffed.mimetypes[0]
+                            ),
+                            extension=enhanced_guess.extension or sniffed.extensions[0],
+                        )
+                    ]
+
+            return self._get_magika_guesses(file_stream, base_guess, enhanced_guess)
+
+    def _get_magika_guesses(
+        self, file_stream: BinaryIO, base_guess: StreamInfo, enhanced_guess: StreamInfo
+    ) -> List[StreamInfo]:
+        """
+        Guess the stream info using magika, reconciling its guess with the base guess.
+        """
+        guesses: List[StreamInfo] = []
 
         # Call magika to guess from the stream
         cur_pos = file_stream.tell()
         try:
-            result = self._magika.identify_stream(file_stream)
+            with self._detection_timings.time("magika"):
+                result = _get_magika().identify_stream(file_stream)
             if result.status == "ok" and result.prediction.output.label != "unknown":
                 # If it's text, also guess the charset
                 charset = None
                 if result.prediction.output.is_text:
-                    # Read the first 4k to guess the charset
                     file_stream.seek(cur_pos)
-                    stream_page = file_stream.read(4096)
-                    charset_result = charset_normalizer.from_bytes(stream_page).best()
-
-                    if charset_result is not None:
-                        charset = self._normalize_charset(charset_result.encoding)
+                    charset = self._guess_charset(file_stream)
 
                 # Normalize the first extension listed
                 guessed_extension = None
@@ -766,13 +1521,15 @@ class MarkItDown:
 
         return guesses
 
+    def _guess_charset(self, file_stream: BinaryIO) -> Optional[str]:
+        """
+        Guess the charset of a text stream (see CharsetDetector). The stream position is restored.
+        """
+        with self._detection_timings.time("charset"):
+            return self._charset_detector.detect(file_stream)
+
     def _normalize_charset(self, charset: str | None) -> str | None:
         """
         Normalize a charset string to a canonical form.
         """
-        if charset is None:
-            return None
-        try:
-            return codecs.lookup(charset).name
-        except LookupError:
-            return charset
+        return normalize_charset(charset)
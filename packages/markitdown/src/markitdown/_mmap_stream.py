@@ -0,0 +1,115 @@
+import io
+import mmap
+import os
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Union
+
+
+class MemoryViewStream(io.BufferedIOBase):
+    """
+    A seekable, read-only binary stream over a buffer (e.g., a memory-mapped file).
+    Unlike io.BytesIO, the buffer is never copied: read() copies only the bytes it
+    returns, and getbuffer() lends out slices of the buffer without copying at all.
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._check_open()
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._check_open()
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        return self.getbuffer(size).tobytes()
+
+    def read1(self, size: Optional[int] = -1) -> bytes:
+        return self.read(size)
+
+    def readinto(self, buffer) -> int:
+        view = self.getbuffer(len(memoryview(buffer).cast("B")))
+        memoryview(buffer).cast("B")[: len(view)] = view
+        return len(view)
+
+    def readinto1(self, buffer) -> int:
+        return self.readinto(buffer)
+
+    def getbuffer(self, size: Optional[int] = -1) -> memoryview:
+        """
+        Like read(), but returns a read-only memoryview of the underlying buffer,
+        rather than a copy. The view remains valid after the stream is closed.
+        """
+        self._check_open()
+        start = min(self._position, len(self._view))
+        end = len(self._view) if size is None or size < 0 else start + size
+        view = self._view[start:end].toreadonly()
+        self._position = start + len(view)
+        return view
+
+    def close(self) -> None:
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+    def _check_open(self) -> None:
+        if self.closed:
+            raise ValueError("I/O operation on closed stream.")
+
+
+def read_buffer(file_stream: BinaryIO, size: int = -1) -> memoryview:
+    """
+    Read up to size bytes (or all remaining bytes) from a stream, as a memoryview.
+    For a MemoryViewStream, this is a view of the underlying buffer (no copy is made).
+    """
+    if isinstance(file_stream, MemoryViewStream):
+        return file_stream.getbuffer(size)
+    return memoryview(file_stream.read(size))
+
+
+@contextmanager
+def open_mmap(path: Union[str, os.PathLike]) -> Iterator[BinaryIO]:
+    """
+    Open a local file as a read-only MemoryViewStream over a memory map of the file,
+    so that its pages are loaded by the OS on demand, and are never copied onto the
+    heap. Falls back to a regular file object if the file can't be memory-mapped
+    (e.g., if it is empty, or is not a regular file).
+    """
+    with open(path, "rb") as fh:
+        try:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            yield fh
+            return
+
+    stream = MemoryViewStream(mapped)
+    try:
+        yield stream
+    finally:
+        stream.close()
+        try:
+            mapped.close()
+        except BufferError:
+            # Views of the map are still held elsewhere. It will be unmapped once they are released.
+            pass
@@ -0,0 +1,115 @@
+import io
+import tempfile
+from typing import BinaryIO, Iterable, Iterator, Mapping, Optional
+
+from ._exceptions import InputTooLargeException
+
+# Inputs up to this size are buffered in memory, larger ones in a temporary file
+DEFAULT_SPOOL_THRESHOLD = 16 * 1024 * 1024
+
+# Bounds of the adaptive read size (see iter_stream_chunks)
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+
+
+def iter_stream_chunks(stream: BinaryIO) -> Iterator[bytes]:
+    """
+    Read a stream to its end, in chunks. The chunk size starts at MIN_CHUNK_SIZE,
+    and doubles (up to MAX_CHUNK_SIZE) every time a read fills the whole chunk, so
+    small inputs are read in a few small reads, and large ones in few large reads.
+    """
+    chunk_size = MIN_CHUNK_SIZE
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+        if len(chunk) == chunk_size:
+            chunk_size = min(chunk_size * 2, MAX_CHUNK_SIZE)
+
+
+def get_response_chunk_size(content_length: Optional[int]) -> int:
+    """Choose the chunk size with which to download a response body of the given (expected) length."""
+    if content_length is None:
+        return MIN_CHUNK_SIZE
+    return max(MIN_CHUNK_SIZE, min(content_length // 16, MAX_CHUNK_SIZE))
+
+
+def get_content_length(headers: Mapping[str, str]) -> Optional[int]:
+    """Return the Content-Length of an HTTP response, or None if it is missing or invalid."""
+    try:
+        return int(headers.get("content-length", ""))
+    except ValueError:
+        return None
+
+
+def check_input_size(size: int, max_input_size: Optional[int]) -> None:
+    """Raise InputTooLargeException if size exceeds max_input_size (if one is set)."""
+    if max_input_size is not None and size > max_input_size:
+        raise InputTooLargeException(
+            f"The input is larger than the maximum input size ({max_input_size} bytes)."
+        )
+
+
+class SpoolingBuffer:
+    """
+    Accumulates chunks written to it in a seekable stream. Like
+    tempfile.SpooledTemporaryFile, the chunks are kept in memory until they exceed
+    spool_threshold bytes, and are then moved to a temporary file on disk. Unlike
+    it, the resulting stream is the BytesIO or temporary file itself, rather than a
+    wrapper (which Magika does not accept).
+    """
+
+    def __init__(
+        self,
+        *,
+        spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+        max_input_size: Optional[int] = None,
+    ):
+        self._spool_threshold = spool_threshold
+        self._max_input_size = max_input_size
+        self._buffer: BinaryIO = io.BytesIO()
+        self._size = 0
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk. Raises InputTooLargeException if the total now exceeds max_input_size."""
+        self._size += len(chunk)
+        check_input_size(self._size, self._max_input_size)
+        if self._size > self._spool_threshold and isinstance(self._buffer, io.BytesIO):
+            spooled = tempfile.TemporaryFile()
+            spooled.write(self._buffer.getbuffer())
+            self._buffer.close()
+            self._buffer = spooled  # type: ignore[assignment]
+        self._buffer.write(chunk)
+
+    def finish(self) -> BinaryIO:
+        """Return the stream, positioned at its start. The caller is responsible for closing it."""
+        self._buffer.seek(0)
+        return self._buffer
+
+    def close(self) -> None:
+        self._buffer.close()
+
+
+def spool_chunks(
+    chunks: Iterable[bytes],
+    *,
+    spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+    max_input_size: Optional[int] = None,
+) -> BinaryIO:
+    """
+    Buffer the chunks in a seekable stream, positioned at its start (see
+    SpoolingBuffer). Raises InputTooLargeException as soon as more than
+    max_input_size bytes have been read. The caller is responsible for closing the
+    returned stream.
+    """
+    buffer = SpoolingBuffer(
+        spool_threshold=spool_threshold, max_input_size=max_input_size
+    )
+    try:
+        for chunk in chunks:
+            buffer.write(chunk)
+    except BaseException:
+        buffer.close()
+        raise
+    return buffer.finish()
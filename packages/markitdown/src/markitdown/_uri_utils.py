@@ -1,9 +1,12 @@
 import base64
 import os
-from typing import Tuple, Dict
+import re
+from typing import Tuple, Dict, Mapping, Optional
 from urllib.request import url2pathname
 from urllib.parse import urlparse, unquote_to_bytes
 
+from ._stream_info import StreamInfo
+
 
 def file_uri_to_path(file_uri: str) -> Tuple[str | None, str]:
     """Convert a file URI to a local file path"""
@@ -50,3 +53,50 @@ def parse_data_uri(uri: str) -> Tuple[str | None, Dict[str, str], bytes]:
     content = base64.b64decode(data) if is_base64 else unquote_to_bytes(data)
 
     return mime_type, attributes, content
+
+
+def get_response_stream_info(headers: Mapping[str, str], url: str) -> StreamInfo:
+    """
+    Build a StreamInfo from the headers (a case-insensitive mapping, as provided by
+    both requests and httpx) and final url of an HTTP response.
+    """
+    # If there is a content-type header, get the mimetype and charset (if present)
+    mimetype: Optional[str] = None
+    charset: Optional[str] = None
+
+    if "content-type" in headers:
+        parts = headers["content-type"].split(";")
+        mimetype = parts.pop(0).strip()
+        for part in parts:
+            if part.strip().startswith("charset="):
+                _charset = part.split("=")[1].strip()
+                if len(_charset) > 0:
+                    charset = _charset
+
+    # If there is a content-disposition header, get the filename and possibly the extension
+    filename: Optional[str] = None
+    extension: Optional[str] = None
+    if "content-disposition" in headers:
+        m = re.search(r"filename=([^;]+)", headers["content-disposition"])
+        if m:
+            filename = m.group(1).strip("\"'")
+            _, _extension = os.path.splitext(filename)
+            if len(_extension) > 0:
+                extension = _extension
+
+    # If there is still no filename, try to read it from the url
+    if filename is None:
+        parsed_url = urlparse(url)
+        _, _extension = os.path.splitext(parsed_url.path)
+        if len(_extension) > 0:  # Looks like this might be a file!
+            filename = os.path.basename(parsed_url.path)
+            extension = _extension
+
+    # Create an initial guess from all this information
+    return StreamInfo(
+        mimetype=mimetype,
+        charset=charset,
+        filename=filename,
+        extension=extension,
+        url=url,
+    )
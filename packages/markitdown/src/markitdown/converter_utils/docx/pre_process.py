@@ -1,3 +1,4 @@
+import shutil
 import zipfile
 from io import BytesIO
 from typing import BinaryIO
@@ -137,11 +138,11 @@ def pre_process_docx(input_docx: BinaryIO) -> BinaryIO:
         "word/endnotes.xml",
     ]
     with zipfile.ZipFile(input_docx, mode="r") as zip_input:
-        files = {name: zip_input.read(name) for name in zip_input.namelist()}
         with zipfile.ZipFile(output_docx, mode="w") as zip_output:
             zip_output.comment = zip_input.comment
-            for name, content in files.items():
+            for name in zip_input.namelist():
                 if name in pre_process_enable_files:
+                    content = zip_input.read(name)
                     try:
                         # Pre-process the content
                         updated_content = _pre_process_math(content)
@@ -150,7 +151,11 @@ def pre_process_docx(input_docx: BinaryIO) -> BinaryIO:
                     except Exception:
                         # If there is an error in processing the content, write the original content
                         zip_output.writestr(name, content)
+                elif name.endswith("/"):
+                    zip_output.writestr(name, b"")
                 else:
-                    zip_output.writestr(name, content)
+                    # Copy the other files in chunks, rather than holding them all in memory at once
+                    with zip_input.open(name) as src, zip_output.open(name, "w") as dst:
+                        shutil.copyfileobj(src, dst)
     output_docx.seek(0)
     return output_docx
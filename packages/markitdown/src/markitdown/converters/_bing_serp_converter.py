@@ -3,11 +3,9 @@ import base64
 import binascii
 from urllib.parse import parse_qs, urlparse
 from typing import Any, BinaryIO
-from bs4 import BeautifulSoup
 
 from .._base_converter import DocumentConverter, DocumentConverterResult
 from .._stream_info import StreamInfo
-from ._markdownify import _CustomMarkdownify
 
 ACCEPTED_MIME_TYPE_PREFIXES = [
     "text/html",
@@ -26,6 +24,9 @@ class BingSerpConverter(DocumentConverter):
     NOTE: It is better to use the Bing API
     """
 
+    accepted_file_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def accepts(
         self,
         file_stream: BinaryIO,
@@ -66,6 +67,10 @@ class BingSerpConverter(DocumentConverter):
         parsed_params = parse_qs(urlparse(stream_info.url).query)
         query = parsed_params.get("q", [""])[0]
 
+        # Deferred until needed, as bs4 is slow to import
+        from bs4 import BeautifulSoup
+        from ._markdownify import _CustomMarkdownify
+
         # Parse the stream
         encoding = "utf-8" if stream_info.charset is None else stream_info.charset
         soup = BeautifulSoup(file_stream, "html.parser", from_encoding=encoding)
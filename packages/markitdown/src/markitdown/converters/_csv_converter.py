@@ -1,9 +1,11 @@
 import csv
 import io
-from typing import BinaryIO, Any
-from charset_normalizer import from_bytes
+import itertools
+from typing import BinaryIO, Any, Iterator, List, Optional
 from .._base_converter import DocumentConverter, DocumentConverterResult
+from .._charset import get_text_encoding
 from .._stream_info import StreamInfo
+from ._markdown_table import MarkdownTableWriter
 
 ACCEPTED_MIME_TYPE_PREFIXES = [
     "text/csv",
@@ -11,12 +13,25 @@ ACCEPTED_MIME_TYPE_PREFIXES = [
 ]
 ACCEPTED_FILE_EXTENSIONS = [".csv"]
 
+# CSV cells are written as they are (rather than escaped as Markdown), except for
+# pipes and line breaks, which would break the table
+_table_writer = MarkdownTableWriter(escape_markdown=False)
+
+# With csv_dialect="sniff", the dialect is detected from this many characters at the start of the file
+DIALECT_SNIFFING_SAMPLE_SIZE = 64 * 1024
+
+# The Markdown is yielded this many rows at a time
+_ROWS_PER_CHUNK = 1000
+
 
 class CsvConverter(DocumentConverter):
     """
     Converts CSV files to Markdown tables.
     """
 
+    accepted_file_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def __init__(self):
         super().__init__()
 
@@ -41,37 +56,71 @@ class CsvConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
-        # Read the file content
-        if stream_info.charset:
-            content = file_stream.read().decode(stream_info.charset)
-        else:
-            content = str(from_bytes(file_stream.read()).best())
-
-        # Parse CSV content
-        reader = csv.reader(io.StringIO(content))
-        rows = list(reader)
+        md_content = "".join(self.convert_iter(file_stream, stream_info, **kwargs))
+        return DocumentConverterResult(markdown=md_content)
 
-        if not rows:
-            return DocumentConverterResult(markdown="")
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        """
+        Yields the Markdown table, a chunk of rows at a time. The file is decoded
+        incrementally, and each row is written as it is read, so memory use does
+        not grow with the size of the file.
+        """
+        max_rows: Optional[int] = kwargs.get("max_rows")
+        dialect = kwargs.get("csv_dialect") or "excel"
 
-        # Create markdown table
-        markdown_table = []
+        # Detect the charset from a sample of the file, if it is not known
+        encoding, errors = get_text_encoding(
+            file_stream, stream_info, kwargs.get("charset_detector")
+        )
 
-        # Add header row
-        markdown_table.append("| " + " | ".join(rows[0]) + " |")
+        text_stream = io.TextIOWrapper(
+            file_stream, encoding=encoding, errors=errors, newline=""
+        )
+        try:
+            if dialect == "sniff":
+                dialect = _sniff_dialect(text_stream)
 
-        # Add separator row
-        markdown_table.append("| " + " | ".join(["---"] * len(rows[0])) + " |")
+            reader = csv.reader(text_stream, dialect)
+            header = next(reader, None)
+            if header is None:
+                return
 
-        # Add data rows
-        for row in rows[1:]:
-            # Make sure row has the same number of columns as header
-            while len(row) < len(rows[0]):
-                row.append("")
-            # Truncate if row has more columns than header
-            row = row[: len(rows[0])]
-            markdown_table.append("| " + " | ".join(row) + " |")
+            # Rows are padded with empty cells, or truncated, to the number of
+            # columns of the header
+            width = len(header)
+            chunk: List[str] = []
+            for n, line in enumerate(
+                _table_writer.iter_lines(
+                    itertools.chain([header], (row[:width] for row in reader)), width
+                )
+            ):
+                if max_rows is not None and n >= max_rows + 2:
+                    chunk += [
+                        "",
+                        f"*Only the first {max_rows} rows of this file are shown.*",
+                    ]
+                    break
+                chunk.append(line)
+                if len(chunk) >= _ROWS_PER_CHUNK:
+                    yield "\n".join(chunk)
+                    chunk = [""]
+            if chunk != [""]:
+                yield "\n".join(chunk)
+        finally:
+            # Leave the file stream open (closing the wrapper would close it)
+            text_stream.detach()
 
-        result = "\n".join(markdown_table)
 
-        return DocumentConverterResult(markdown=result)
+def _sniff_dialect(text_stream: io.TextIOWrapper) -> Any:
+    """Guess the dialect of the file from its first characters, and rewind it (excel if it can't be guessed)."""
+    sample = text_stream.read(DIALECT_SNIFFING_SAMPLE_SIZE)
+    text_stream.seek(0)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        return "excel"
@@ -1,3 +1,4 @@
+import functools
 import sys
 import re
 import os
@@ -8,43 +9,56 @@ from .._base_converter import DocumentConverter, DocumentConverterResult
 from .._stream_info import StreamInfo
 from .._exceptions import MissingDependencyException
 
-# Try loading optional (but in this case, required) dependencies
-# Save reporting of any exceptions for later
-_dependency_exc_info = None
-try:
-    from azure.ai.documentintelligence import DocumentIntelligenceClient
-    from azure.ai.documentintelligence.models import (
-        AnalyzeDocumentRequest,
-        AnalyzeResult,
-        DocumentAnalysisFeature,
-    )
-    from azure.core.credentials import AzureKeyCredential, TokenCredential
-    from azure.identity import DefaultAzureCredential
-except ImportError:
-    # Preserve the error and stack trace for later
-    _dependency_exc_info = sys.exc_info()
 
-    # Define these types for type hinting when the package is not available
-    class AzureKeyCredential:
-        pass
+# Try loading optional (but in this case, required) dependencies on first use, as
+# they are slow to import. Save reporting of any exceptions for later
+@functools.lru_cache(maxsize=None)
+def _load_dependencies() -> Any:
+    global DocumentIntelligenceClient, AnalyzeDocumentRequest, AnalyzeResult
+    global DocumentAnalysisFeature, AzureKeyCredential, TokenCredential
+    global DefaultAzureCredential
+    try:
+        from azure.ai.documentintelligence import DocumentIntelligenceClient
+        from azure.ai.documentintelligence.models import (
+            AnalyzeDocumentRequest,
+            AnalyzeResult,
+            DocumentAnalysisFeature,
+        )
+        from azure.core.credentials import AzureKeyCredential, TokenCredential
+        from azure.identity import DefaultAzureCredential
+    except ImportError:
+        # Preserve the error and stack trace for later
+        return sys.exc_info()
+    return None
+
+
+# Define these types for type hinting until the package is loaded (or when it is not available)
+class AzureKeyCredential:
+    pass
+
+
+class TokenCredential:
+    pass
+
+
+class DocumentIntelligenceClient:
+    pass
+
+
+class AnalyzeDocumentRequest:
+    pass
 
-    class TokenCredential:
-        pass
 
-    class DocumentIntelligenceClient:
-        pass
+class AnalyzeResult:
+    pass
 
-    class AnalyzeDocumentRequest:
-        pass
 
-    class AnalyzeResult:
-        pass
+class DocumentAnalysisFeature:
+    pass
 
-    class DocumentAnalysisFeature:
-        pass
 
-    class DefaultAzureCredential:
-        pass
+class DefaultAzureCredential:
+    pass
 
 
 # TODO: currently, there is a bug in the document intelligence SDK with importing the "ContentFormat" enum.
@@ -163,6 +177,7 @@ class DocumentIntelligenceConverter(DocumentConverter):
         # Raise an error if the dependencies are not available.
         # This is different than other converters since this one isn't even instantiated
         # unless explicitly requested.
+        _dependency_exc_info = _load_dependencies()
         if _dependency_exc_info is not None:
             raise MissingDependencyException(
                 "DocumentIntelligenceConverter requires the optional dependency [az-doc-intel] (or [all]) to be installed. E.g., `pip install markitdown[az-doc-intel]`"
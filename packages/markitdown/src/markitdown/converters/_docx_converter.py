@@ -1,31 +1,39 @@
+import functools
 import sys
 import io
 from warnings import warn
 
-from typing import BinaryIO, Any
+from typing import BinaryIO, Any, Dict, Optional
 
 from ._html_converter import HtmlConverter
-from ..converter_utils.docx.pre_process import pre_process_docx
 from .._base_converter import DocumentConverterResult
 from .._stream_info import StreamInfo
+from .._attachments import AttachmentCollector
 from .._exceptions import MissingDependencyException, MISSING_DEPENDENCY_MESSAGE
 
-# Try loading optional (but in this case, required) dependencies
-# Save reporting of any exceptions for later
-_dependency_exc_info = None
-try:
-    import mammoth
-    import mammoth.docx.files
 
-    def mammoth_files_open(self, uri):
-        warn("DOCX: processing of r:link resources (e.g., linked images) is disabled.")
-        return io.BytesIO(b"")
+# Try loading optional (but in this case, required) dependencies on first use, as
+# they are slow to import. Save reporting of any exceptions for later
+@functools.lru_cache(maxsize=None)
+def _load_dependencies() -> Any:
+    global mammoth
+    try:
+        import mammoth
+        import mammoth.docx.files
+        import mammoth.images
 
-    mammoth.docx.files.Files.open = mammoth_files_open
+        def mammoth_files_open(self, uri):
+            warn(
+                "DOCX: processing of r:link resources (e.g., linked images) is disabled."
+            )
+            return io.BytesIO(b"")
+
+        mammoth.docx.files.Files.open = mammoth_files_open
 
-except ImportError:
-    # Preserve the error and stack trace for later
-    _dependency_exc_info = sys.exc_info()
+    except ImportError:
+        # Preserve the error and stack trace for later
+        return sys.exc_info()
+    return None
 
 
 ACCEPTED_MIME_TYPE_PREFIXES = [
@@ -40,6 +48,9 @@ class DocxConverter(HtmlConverter):
     Converts DOCX files to Markdown. Style information (e.g.m headings) and tables are preserved where possible.
     """
 
+    accepted_file_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def __init__(self):
         super().__init__()
         self._html_converter = HtmlConverter()
@@ -69,6 +80,7 @@ class DocxConverter(HtmlConverter):
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
         # Check: the dependencies
+        _dependency_exc_info = _load_dependencies()
         if _dependency_exc_info is not None:
             raise MissingDependencyException(
                 MISSING_DEPENDENCY_MESSAGE.format(
@@ -82,9 +94,41 @@ class DocxConverter(HtmlConverter):
                 _dependency_exc_info[2]
             )
 
+        # Deferred until needed, as bs4 is slow to import
+        from ..converter_utils.docx.pre_process import pre_process_docx
+
+        # Images are extracted as attachments if requested. Otherwise, they are only
+        # base64-encoded into data URIs if those are kept (they are truncated otherwise)
+        attachments: Optional[AttachmentCollector] = kwargs.get("attachment_collector")
+        if attachments is None and kwargs.get("extract_attachments"):
+            attachments = AttachmentCollector()
+        kwargs["attachment_collector"] = attachments
+
+        if attachments is not None:
+
+            @mammoth.images.img_element
+            def convert_image(image) -> Dict[str, str]:
+                # The image is read now, as the package is closed after conversion
+                with image.open() as image_bytes:
+                    data = image_bytes.read()
+                assert attachments is not None  # for mypy
+                name = attachments.add(lambda: data, mimetype=image.content_type)
+                return {"src": name}
+
+        elif kwargs.get("keep_data_uris", False):
+            convert_image = mammoth.images.data_uri
+        else:
+
+            @mammoth.images.img_element
+            def convert_image(image) -> Dict[str, str]:
+                # The src that the (unread) data URI would be truncated to
+                return {"src": f"data:{image.content_type};base64,"}
+
         style_map = kwargs.get("style_map", None)
         pre_process_stream = pre_process_docx(file_stream)
         return self._html_converter.convert_string(
-            mammoth.convert_to_html(pre_process_stream, style_map=style_map).value,
+            mammoth.convert_to_html(
+                pre_process_stream, style_map=style_map, convert_image=convert_image
+            ).value,
             **kwargs,
         )
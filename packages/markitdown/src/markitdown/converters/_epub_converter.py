@@ -1,13 +1,17 @@
+import mimetypes
 import os
+import posixpath
 import zipfile
+from urllib.parse import unquote, urlparse
 from defusedxml import minidom
 from xml.dom.minidom import Document
 
-from typing import BinaryIO, Any, Dict, List
+from typing import BinaryIO, Any, Dict, Iterator, List, Optional, Tuple
 
 from ._html_converter import HtmlConverter
 from .._base_converter import DocumentConverterResult
 from .._stream_info import StreamInfo
+from .._attachments import AttachmentCollector
 
 ACCEPTED_MIME_TYPE_PREFIXES = [
     "application/epub",
@@ -28,6 +32,9 @@ class EpubConverter(HtmlConverter):
     Converts EPUB files to Markdown. Style information (e.g.m headings) and tables are preserved where possible.
     """
 
+    accepted_file_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def __init__(self):
         super().__init__()
         self._html_converter = HtmlConverter()
@@ -56,78 +63,155 @@ class EpubConverter(HtmlConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
-        with zipfile.ZipFile(file_stream, "r") as z:
-            # Extracts metadata (title, authors, language, publisher, date, description, cover) from an EPUB file."""
+        attachments: Optional[AttachmentCollector] = kwargs.get("attachment_collector")
+        if attachments is None and kwargs.get("extract_attachments"):
+            attachments = AttachmentCollector()
 
-            # Locate content.opf
-            container_dom = minidom.parse(z.open("META-INF/container.xml"))
-            opf_path = container_dom.getElementsByTagName("rootfile")[0].getAttribute(
-                "full-path"
+        with zipfile.ZipFile(file_stream, "r") as z:
+            metadata, spine = self._read_package(z)
+            return DocumentConverterResult(
+                markdown="".join(
+                    self._convert_package(z, metadata, spine, attachments)
+                ),
+                title=metadata["title"],
+                attachments=None if attachments is None else attachments.attachments,
             )
 
-            # Parse content.opf
-            opf_dom = minidom.parse(z.open(opf_path))
-            metadata: Dict[str, Any] = {
-                "title": self._get_text_from_node(opf_dom, "dc:title"),
-                "authors": self._get_all_texts_from_nodes(opf_dom, "dc:creator"),
-                "language": self._get_text_from_node(opf_dom, "dc:language"),
-                "publisher": self._get_text_from_node(opf_dom, "dc:publisher"),
-                "date": self._get_text_from_node(opf_dom, "dc:date"),
-                "description": self._get_text_from_node(opf_dom, "dc:description"),
-                "identifier": self._get_text_from_node(opf_dom, "dc:identifier"),
-            }
-
-            # Extract manifest items (ID → href mapping)
-            manifest = {
-                item.getAttribute("id"): item.getAttribute("href")
-                for item in opf_dom.getElementsByTagName("item")
-            }
-
-            # Extract spine order (ID refs)
-            spine_items = opf_dom.getElementsByTagName("itemref")
-            spine_order = [item.getAttribute("idref") for item in spine_items]
-
-            # Convert spine order to actual file paths
-            base_path = "/".join(
-                opf_path.split("/")[:-1]
-            )  # Get base directory of content.opf
-            spine = [
-                f"{base_path}/{manifest[item_id]}" if base_path else manifest[item_id]
-                for item_id in spine_order
-                if item_id in manifest
-            ]
-
-            # Extract and convert the content
-            markdown_content: List[str] = []
-            for file in spine:
-                if file in z.namelist():
-                    with z.open(file) as f:
-                        filename = os.path.basename(file)
-                        extension = os.path.splitext(filename)[1].lower()
-                        mimetype = MIME_TYPE_MAPPING.get(extension)
-                        converted_content = self._html_converter.convert(
-                            f,
-                            StreamInfo(
-                                mimetype=mimetype,
-                                extension=extension,
-                                filename=filename,
-                            ),
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        """Yields the metadata of the EPUB, then the Markdown of each spine item."""
+        with zipfile.ZipFile(file_stream, "r") as z:
+            metadata, spine = self._read_package(z)
+            yield from self._convert_package(z, metadata, spine)
+
+    def _read_package(self, z: zipfile.ZipFile) -> Tuple[Dict[str, Any], List[str]]:
+        """Extracts metadata (title, authors, language, publisher, date, description, cover) and the spine from an EPUB file."""
+        # Locate content.opf
+        container_dom = minidom.parse(z.open("META-INF/container.xml"))
+        opf_path = container_dom.getElementsByTagName("rootfile")[0].getAttribute(
+            "full-path"
+        )
+
+        # Parse content.opf
+        opf_dom = minidom.parse(z.open(opf_path))
+        metadata: Dict[str, Any] = {
+            "title": self._get_text_from_node(opf_dom, "dc:title"),
+            "authors": self._get_all_texts_from_nodes(opf_dom, "dc:creator"),
+            "language": self._get_text_from_node(opf_dom, "dc:language"),
+            "publisher": self._get_text_from_node(opf_dom, "dc:publisher"),
+            "date": self._get_text_from_node(opf_dom, "dc:date"),
+            "description": self._get_text_from_node(opf_dom, "dc:description"),
+            "identifier": self._get_text_from_node(opf_dom, "dc:identifier"),
+        }
+
+        # Extract manifest items (ID → href mapping)
+        manifest = {
+            item.getAttribute("id"): item.getAttribute("href")
+            for item in opf_dom.getElementsByTagName("item")
+        }
+
+        # Extract spine order (ID refs)
+        spine_items = opf_dom.getElementsByTagName("itemref")
+        spine_order = [item.getAttribute("idref") for item in spine_items]
+
+        # Convert spine order to actual file paths
+        base_path = "/".join(
+            opf_path.split("/")[:-1]
+        )  # Get base directory of content.opf
+        spine = [
+            f"{base_path}/{manifest[item_id]}" if base_path else manifest[item_id]
+            for item_id in spine_order
+            if item_id in manifest
+        ]
+
+        return metadata, spine
+
+    def _convert_package(
+        self,
+        z: zipfile.ZipFile,
+        metadata: Dict[str, Any],
+        spine: List[str],
+        attachments: Optional[AttachmentCollector] = None,
+    ) -> Iterator[str]:
+        # Format and yield the metadata
+        metadata_markdown = []
+        for key, value in metadata.items():
+            if isinstance(value, list):
+                value = ", ".join(value)
+            if value:
+                metadata_markdown.append(f"**{key.capitalize()}:** {value}")
+
+        yield "\n".join(metadata_markdown)
+
+        # Extract and convert the content
+        namelist = set(z.namelist())
+        for file in spine:
+            if file in namelist:
+                with z.open(file) as f:
+                    filename = os.path.basename(file)
+                    extension = os.path.splitext(filename)[1].lower()
+                    mimetype = MIME_TYPE_MAPPING.get(extension)
+                    stream_info = StreamInfo(
+                        mimetype=mimetype,
+                        extension=extension,
+                        filename=filename,
+                    )
+                    if attachments is None:
+                        converted_content = self._html_converter.convert(f, stream_info)
+                    else:
+                        converted_content = self._convert_with_attachments(
+                            f, stream_info, z, file, attachments
                         )
-                        markdown_content.append(converted_content.markdown.strip())
-
-            # Format and add the metadata
-            metadata_markdown = []
-            for key, value in metadata.items():
-                if isinstance(value, list):
-                    value = ", ".join(value)
-                if value:
-                    metadata_markdown.append(f"**{key.capitalize()}:** {value}")
+                    yield "\n\n" + converted_content.markdown.strip()
 
-            markdown_content.insert(0, "\n".join(metadata_markdown))
-
-            return DocumentConverterResult(
-                markdown="\n\n".join(markdown_content), title=metadata["title"]
+    def _convert_with_attachments(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        z: zipfile.ZipFile,
+        path: str,
+        attachments: AttachmentCollector,
+    ) -> DocumentConverterResult:
+        """
+        Convert a content document, extracting the images it refers to (packaged
+        images, as well as data URIs) as attachments.
+        """
+        # Deferred until needed, as bs4 is slow to import
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(file_stream, "html.parser", from_encoding="utf-8")
+        namelist = set(z.namelist())
+        for img in soup.find_all("img"):
+            src = str(img.get("src") or "")
+            if not src or urlparse(src).scheme:
+                continue
+
+            # Resolve the src against the content document, to a path in the package
+            image_path = posixpath.normpath(
+                posixpath.join(posixpath.dirname(path), unquote(urlparse(src).path))
             )
+            if image_path not in namelist:
+                continue
+
+            name = attachments.get_name(image_path)
+            if name is None:
+                # The image is read now, as the package is closed after conversion
+                data = z.read(image_path)
+                name = attachments.add(
+                    lambda data=data: data,
+                    mimetype=mimetypes.guess_type(image_path)[0],
+                    extension=posixpath.splitext(image_path)[1].lower(),
+                    key=image_path,
+                )
+            img["src"] = name
+
+        return self._html_converter.convert_string(
+            str(soup), attachment_collector=attachments
+        )
 
     def _get_text_from_node(self, dom: Document, tag_name: str) -> str | None:
         """Convenience function to extract a single occurrence of a tag (e.g., title)."""
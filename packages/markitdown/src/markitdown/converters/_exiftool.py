@@ -3,6 +3,8 @@ import locale
 import subprocess
 from typing import Any, BinaryIO, Union
 
+from .._mmap_stream import read_buffer
+
 
 def _parse_version(version: str) -> tuple:
     return tuple(map(int, (version.split("."))))
@@ -40,7 +42,7 @@ def exiftool_metadata(
     try:
         output = subprocess.run(
             [exiftool_path, "-json", "-"],
-            input=file_stream.read(),
+            input=read_buffer(file_stream),
             capture_output=True,
             text=False,
         ).stdout
@@ -1,10 +1,11 @@
 import io
+import mimetypes
 from typing import Any, BinaryIO, Optional
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin, urlparse
 
 from .._base_converter import DocumentConverter, DocumentConverterResult
 from .._stream_info import StreamInfo
-from ._markdownify import _CustomMarkdownify
+from .._attachments import AttachmentCollector
 
 ACCEPTED_MIME_TYPE_PREFIXES = [
     "text/html",
@@ -20,6 +21,9 @@ ACCEPTED_FILE_EXTENSIONS = [
 class HtmlConverter(DocumentConverter):
     """Anything with content type text/html"""
 
+    accepted_file_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def accepts(
         self,
         file_stream: BinaryIO,
@@ -44,6 +48,10 @@ class HtmlConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
+        # Deferred until needed, as bs4 is slow to import
+        from bs4 import BeautifulSoup
+        from ._markdownify import _CustomMarkdownify
+
         # Parse the stream
         encoding = "utf-8" if stream_info.charset is None else stream_info.charset
         soup = BeautifulSoup(file_stream, "html.parser", from_encoding=encoding)
@@ -52,6 +60,18 @@ class HtmlConverter(DocumentConverter):
         for script in soup(["script", "style"]):
             script.extract()
 
+        # Images are extracted into the given collector (if called by another
+        # converter), or into a new one if attachments were requested
+        attachments: Optional[AttachmentCollector] = kwargs.get("attachment_collector")
+        if attachments is None and kwargs.get("extract_attachments"):
+            attachments = AttachmentCollector()
+        kwargs["attachment_collector"] = attachments
+
+        # Download the images referenced by URL as attachments, if requested
+        downloader = kwargs.get("resource_downloader")
+        if attachments is not None and downloader is not None:
+            self._download_images(soup, stream_info.url, attachments, downloader)
+
         # Print only the main content
         body_elm = soup.find("body")
         webpage_text = ""
@@ -68,8 +88,41 @@ class HtmlConverter(DocumentConverter):
         return DocumentConverterResult(
             markdown=webpage_text,
             title=None if soup.title is None else soup.title.string,
+            attachments=None if attachments is None else attachments.attachments,
         )
 
+    def _download_images(
+        self,
+        soup: Any,
+        url: Optional[str],
+        attachments: AttachmentCollector,
+        downloader: Any,
+    ) -> None:
+        """
+        Download (concurrently) the http(s) images of the document, resolving relative
+        srcs against its URL, add them to the attachments, and point the srcs at them.
+        Images that fail to download keep their src.
+        """
+        images = []
+        for img in soup.find_all("img"):
+            src = str(img.get("src") or "")
+            if not src or src.startswith("data:"):
+                continue
+            image_url = urljoin(url, src) if url else src
+            if urlparse(image_url).scheme.lower() in ["http", "https"]:
+                images.append((img, image_url))
+
+        results = downloader.download_many(image_url for _, image_url in images)
+        for img, image_url in images:
+            result = results[image_url]
+            if not result.ok:
+                continue
+            img["src"] = attachments.add(
+                lambda content=result.content: content,
+                mimetype=result.mimetype or mimetypes.guess_type(image_url)[0],
+                key=image_url,
+            )
+
     def convert_string(
         self, html_content: str, *, url: Optional[str] = None, **kwargs
     ) -> DocumentConverterResult:
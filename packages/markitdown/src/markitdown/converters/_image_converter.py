@@ -3,6 +3,7 @@ import base64
 import mimetypes
 from ._exiftool import exiftool_metadata
 from .._base_converter import DocumentConverter, DocumentConverterResult
+from .._mmap_stream import read_buffer
 from .._stream_info import StreamInfo
 
 ACCEPTED_MIME_TYPE_PREFIXES = [
@@ -18,6 +19,9 @@ class ImageConverter(DocumentConverter):
     Converts images to markdown via extraction of metadata (if `exiftool` is installed), and description via a multimodal LLM (if an llm_client is configured).
     """
 
+    accepted_file_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def accepts(
         self,
         file_stream: BinaryIO,
@@ -108,7 +112,7 @@ class ImageConverter(DocumentConverter):
         # Convert to base64
         cur_pos = file_stream.tell()
         try:
-            base64_image = base64.b64encode(file_stream.read()).decode("utf-8")
+            base64_image = base64.b64encode(read_buffer(file_stream)).decode("utf-8")
         except Exception as e:
             return None
         finally:
@@ -15,6 +15,9 @@ ACCEPTED_FILE_EXTENSIONS = [".ipynb"]
 class IpynbConverter(DocumentConverter):
     """Converts Jupyter Notebook (.ipynb) files to Markdown."""
 
+    accepted_file_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = CANDIDATE_MIME_TYPE_PREFIXES
+
     def accepts(
         self,
         file_stream: BinaryIO,
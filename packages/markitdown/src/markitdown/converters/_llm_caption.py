@@ -1,6 +1,9 @@
-from typing import BinaryIO, Union
+from typing import BinaryIO, Callable, Dict, Hashable, Optional, Union
 import base64
+import concurrent.futures
+import io
 import mimetypes
+from .._mmap_stream import read_buffer
 from .._stream_info import StreamInfo
 
 
@@ -20,7 +23,7 @@ def llm_caption(
     # Convert to base64
     cur_pos = file_stream.tell()
     try:
-        base64_image = base64.b64encode(file_stream.read()).decode("utf-8")
+        base64_image = base64.b64encode(read_buffer(file_stream)).decode("utf-8")
     except Exception as e:
         return None
     finally:
@@ -48,3 +51,76 @@ def llm_caption(
     # Call the OpenAI API
     response = client.chat.completions.create(model=model, messages=messages)
     return response.choices[0].message.content
+
+
+class LlmCaptioner:
+    """
+    Captions the images of a document with llm_caption, each distinct image only
+    once (images are identified by a key, e.g., a hash of their content). With
+    max_workers > 1, the images can be submitted ahead of time, and are captioned
+    concurrently by a bounded pool of threads while the document is converted.
+    Captioning errors result in empty captions.
+    """
+
+    def __init__(self, *, client, model, prompt=None, max_workers: int = 1):
+        """
+        Initialize the LlmCaptioner.
+
+        Parameters:
+        - client: The OpenAI-compatible client.
+        - model: The model with which to caption the images.
+        - prompt: The prompt (see llm_caption).
+        - max_workers: The maximum number of concurrent LLM requests. With 1, images are captioned when their caption is needed.
+        """
+        self._client = client
+        self._model = model
+        self._prompt = prompt
+        self._captions: Dict[Hashable, str] = {}
+        self._futures: Dict[Hashable, concurrent.futures.Future] = {}
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        if max_workers > 1:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="markitdown-caption"
+            )
+
+    def submit(
+        self, key: Hashable, loader: Callable[[], bytes], stream_info: StreamInfo
+    ) -> None:
+        """Start captioning an image in the background (if there are workers), unless it was already submitted."""
+        if self._executor is not None and key not in self._futures:
+            self._futures[key] = self._executor.submit(
+                self._caption, loader, stream_info
+            )
+
+    def caption(
+        self, key: Hashable, loader: Callable[[], bytes], stream_info: StreamInfo
+    ) -> str:
+        """Return the caption of an image, waiting for it if it is being generated."""
+        self.submit(key, loader, stream_info)
+        future = self._futures.get(key)
+        if future is not None:
+            return future.result()
+        if key not in self._captions:
+            self._captions[key] = self._caption(loader, stream_info)
+        return self._captions[key]
+
+    def close(self) -> None:
+        """Stop the workers, cancelling the captions that have not started yet."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _caption(self, loader: Callable[[], bytes], stream_info: StreamInfo) -> str:
+        try:
+            return (
+                llm_caption(
+                    io.BytesIO(loader()),
+                    stream_info,
+                    client=self._client,
+                    model=self._model,
+                    prompt=self._prompt,
+                )
+                or ""
+            )
+        except Exception:
+            # Unable to generate a description
+            return ""
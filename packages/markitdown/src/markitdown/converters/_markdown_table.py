@@ -0,0 +1,140 @@
+import re
+from typing import Any, Iterable, Iterator, List, Sequence
+
+# Runs of spaces and tabs within a cell are collapsed to a single space
+_SPACES_RE = re.compile(r"[\t ]+")
+
+
+class MarkdownTableWriter:
+    """
+    Writes Markdown (GitHub Flavored Markdown) tables directly from rows of cells,
+    rather than by building an HTML table and converting it with markdownify. The
+    first row is the header.
+
+    Cells are converted to text with str() (None is an empty cell). Whitespace is
+    collapsed, line breaks are replaced with line_break, and pipes are escaped, so
+    that every row stays on one line, with the right number of columns. Rows are
+    padded with empty cells to the width of the table.
+
+    Tables can be written incrementally, a row at a time (see iter_lines), or, with
+    align=True, all at once, with the cells of each column padded to the same width.
+    """
+
+    def __init__(
+        self,
+        *,
+        escape_markdown: bool = True,
+        line_break: str = " ",
+        align: bool = False,
+    ):
+        """
+        Initialize the MarkdownTableWriter.
+
+        Parameters:
+        - escape_markdown: Escape asterisks and underscores (as markdownify does), so that they are not read as emphasis.
+        - line_break: The text with which line breaks within cells are replaced (e.g., "<br>").
+        - align: Pad the cells of each column to the same width. The rows are then buffered (see render).
+        """
+        self._escape_markdown = escape_markdown
+        self._line_break = line_break
+        self._align = align
+
+    def format_cell(self, value: Any) -> str:
+        """Convert a cell's value to its Markdown text."""
+        if value is None:
+            return ""
+        text = value if isinstance(value, str) else str(value)
+
+        if "\n" in text or "\r" in text:
+            lines = (_SPACES_RE.sub(" ", line).strip() for line in text.splitlines())
+            text = self._line_break.join(line for line in lines if line)
+        else:
+            text = _SPACES_RE.sub(" ", text).strip()
+
+        if self._escape_markdown:
+            text = text.replace("*", r"\*").replace("_", r"\_")
+        return text.replace("|", r"\|")
+
+    def format_row(self, cells: Sequence[Any], width: int) -> str:
+        """Format a row, padded with empty cells (or truncated) to width columns."""
+        texts = [self.format_cell(value) for value in cells[:width]]
+        texts.extend([""] * (width - len(texts)))
+        return "| " + " | ".join(texts) + " |"
+
+    def format_separator(self, width: int) -> str:
+        """Format the line that separates the header from the body of a table of width columns."""
+        return "| " + " | ".join(["---"] * width) + " |"
+
+    def iter_lines(
+        self, rows: Iterable[Sequence[Any]], width: int = 0
+    ) -> Iterator[str]:
+        """
+        Yield the lines of the table, formatting each row as it is read. The table
+        has width columns, or as many as the header if it is wider (the cells of
+        wider rows are dropped). Nothing is yielded if there are no rows, or no
+        columns. Columns are not aligned, even if align is set.
+        """
+        rows = iter(rows)
+        header = next(rows, None)
+        if header is None:
+            return
+
+        width = max(width, len(header))
+        if width == 0:
+            return
+        yield self.format_row(header, width)
+        yield self.format_separator(width)
+        for row in rows:
+            yield self.format_row(row, width)
+
+    def render(self, rows: Iterable[Sequence[Any]], width: int = 0) -> str:
+        """
+        Return the table (see iter_lines), with its columns aligned if align is set.
+        Unlike iter_lines, the table is widened to fit its widest row, so that no
+        cells are dropped.
+        """
+        table: List[List[str]] = []
+        for row in rows:
+            texts = [self.format_cell(value) for value in row]
+            while texts and texts[-1] == "":
+                texts.pop()
+            table.append(texts)
+        width = max([width] + [len(row) for row in table])
+        if not table or width == 0:
+            return ""
+        for row in table:
+            row.extend([""] * (width - len(row)))
+
+        if not self._align:
+            lines = ["| " + " | ".join(row) + " |" for row in table]
+            lines.insert(1, self.format_separator(width))
+            return "\n".join(lines)
+
+        column_widths = [max(3, *(len(row[i]) for row in table)) for i in range(width)]
+        lines = [_format_aligned_row(table[0], column_widths)]
+        lines.append(
+            _format_aligned_row(["-" * w for w in column_widths], column_widths)
+        )
+        lines.extend(_format_aligned_row(row, column_widths) for row in table[1:])
+        return "\n".join(lines)
+
+
+def _format_aligned_row(texts: Sequence[str], column_widths: Sequence[int]) -> str:
+    return "| " + " | ".join(t.ljust(w) for t, w in zip(texts, column_widths)) + " |"
+
+
+def format_dataframe_rows(df: Any) -> Iterator[List[str]]:
+    """
+    Yield the header and rows of a pandas DataFrame, with the values formatted as
+    DataFrame.to_html(index=False) formats them (e.g., floats to a common
+    precision, missing values as NaN).
+    """
+    # Series.to_string() formats the values like to_html(), a value per line (line
+    # breaks within values are escaped), padded to a common width
+    columns = [
+        [value.strip() for value in column.to_string(index=False).split("\n")]
+        for _, column in df.items()
+    ]
+    yield [str(name) for name in df.columns]
+    for i in range(len(df)):
+        yield [column[i] for column in columns]
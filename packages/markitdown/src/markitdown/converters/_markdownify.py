@@ -12,6 +12,7 @@ class _CustomMarkdownify(markdownify.MarkdownConverter):
     - Altering the default heading style to use '#', '##', etc.
     - Removing javascript hyperlinks.
     - Truncating images with large data:uri sources.
+    - Optionally, extracting images with data:uri sources as attachments.
     - Ensuring URIs are properly escaped, and do not conflict with Markdown syntax
     """
 
@@ -103,9 +104,14 @@ class _CustomMarkdownify(markdownify.MarkdownConverter):
         ):
             return alt
 
-        # Remove dataURIs
-        if src.startswith("data:") and not self.options["keep_data_uris"]:
-            src = src.split(",")[0] + "..."
+        # Extract dataURIs as attachments, or remove them
+        if src.startswith("data:"):
+            attachments = self.options.get("attachment_collector")
+            name = None if attachments is None else attachments.add_data_uri(src)
+            if name is not None:
+                src = name
+            elif not self.options["keep_data_uris"]:
+                src = src.split(",")[0] + "..."
 
         return "![%s](%s%s)" % (alt, src, title_part)
 
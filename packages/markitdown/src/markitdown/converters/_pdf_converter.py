@@ -1,23 +1,40 @@
+import functools
 import sys
 import io
+import math
+import collections
+import concurrent.futures
 
-from typing import BinaryIO, Any
+from typing import BinaryIO, Any, Deque, Iterable, Iterator, List, Optional
 
 
 from .._base_converter import DocumentConverter, DocumentConverterResult
 from .._stream_info import StreamInfo
+from .._attachments import AttachmentCollector
 from .._exceptions import MissingDependencyException, MISSING_DEPENDENCY_MESSAGE
 
 
-# Try loading optional (but in this case, required) dependencies
-# Save reporting of any exceptions for later
-_dependency_exc_info = None
-try:
-    import pdfminer
-    import pdfminer.high_level
-except ImportError:
-    # Preserve the error and stack trace for later
-    _dependency_exc_info = sys.exc_info()
+# Try loading optional (but in this case, required) dependencies on first use, as
+# they are slow to import. Save reporting of any exceptions for later
+@functools.lru_cache(maxsize=None)
+def _load_dependencies() -> Any:
+    global pdfminer, TextConverter, LAParams, PDFPageInterpreter, PDFResourceManager
+    global PDFPage, PDFParser, PDFDocument, PDFStream, resolve1
+    global LITERALS_DCT_DECODE, LITERALS_JPX_DECODE
+    try:
+        import pdfminer
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdftypes import PDFStream, resolve1
+        from pdfminer.pdftypes import LITERALS_DCT_DECODE, LITERALS_JPX_DECODE
+    except ImportError:
+        # Preserve the error and stack trace for later
+        return sys.exc_info()
+    return None
 
 
 ACCEPTED_MIME_TYPE_PREFIXES = [
@@ -27,12 +44,21 @@ ACCEPTED_MIME_TYPE_PREFIXES = [
 
 ACCEPTED_FILE_EXTENSIONS = [".pdf"]
 
+# The bytes of the PDF being converted by a worker process (see _init_worker)
+_worker_pdf_bytes: Optional[bytes] = None
+
+# Number of shards per worker, to balance the load when some pages are slower than others
+_SHARDS_PER_WORKER = 4
+
 
 class PdfConverter(DocumentConverter):
     """
     Converts PDFs to Markdown. Most style information is ignored, so the results are essentially plain-text.
     """
 
+    accepted_file_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def accepts(
         self,
         file_stream: BinaryIO,
@@ -57,7 +83,25 @@ class PdfConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
+        attachments: Optional[AttachmentCollector] = kwargs.get("attachment_collector")
+        if attachments is None and kwargs.get("extract_attachments"):
+            attachments = AttachmentCollector()
+        kwargs["attachment_collector"] = attachments
+
+        return DocumentConverterResult(
+            markdown="".join(self.convert_iter(file_stream, stream_info, **kwargs)),
+            attachments=None if attachments is None else attachments.attachments,
+        )
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        """Yields the text of the PDF, one page at a time."""
         # Check the dependencies
+        _dependency_exc_info = _load_dependencies()
         if _dependency_exc_info is not None:
             raise MissingDependencyException(
                 MISSING_DEPENDENCY_MESSAGE.format(
@@ -72,6 +116,189 @@ class PdfConverter(DocumentConverter):
             )
 
         assert isinstance(file_stream, io.IOBase)  # for mypy
-        return DocumentConverterResult(
-            markdown=pdfminer.high_level.extract_text(file_stream),
+
+        # Optional page selection (0-based page numbers), and the number of worker
+        # processes across which to shard the pages (1 to convert them in-process)
+        max_pages: Optional[int] = kwargs.get("max_pages")
+        page_range: Optional[Iterable[int]] = kwargs.get("page_range")
+        pdf_workers: int = kwargs.get("pdf_workers") or 1
+
+        # Embedded JPEG (and JPEG 2000) images are extracted as attachments, and
+        # referenced at the end of the text of their page, if requested
+        attachments: Optional[AttachmentCollector] = kwargs.get("attachment_collector")
+
+        page_numbers = None if page_range is None else sorted(set(page_range))
+        if pdf_workers > 1:
+            # Shard the pages across a pool of worker processes
+            pdf_bytes = file_stream.read()
+            page_numbers = _select_page_numbers(
+                _count_pages(pdf_bytes), page_numbers, max_pages
+            )
+            if len(page_numbers) > 1:
+                texts = _extract_pages_in_parallel(pdf_bytes, page_numbers, pdf_workers)
+                if attachments is None:
+                    yield from texts
+                    return
+
+                # The images are collected here, as the pages' text is extracted by the workers
+                wanted = set(page_numbers)
+                parser = PDFParser(io.BytesIO(pdf_bytes))
+                pages = (
+                    page
+                    for page_number, page in enumerate(
+                        PDFPage.create_pages(PDFDocument(parser, caching=True))
+                    )
+                    if page_number in wanted
+                )
+                for text, page in zip(texts, pages):
+                    yield _add_page_images(text, page, attachments)
+                return
+            file_stream = io.BytesIO(pdf_bytes)
+            max_pages = None
+
+        yield from _extract_pages(file_stream, page_numbers, max_pages, attachments)
+
+
+def _extract_pages(
+    file_stream: BinaryIO,
+    page_numbers: Optional[List[int]] = None,
+    max_pages: Optional[int] = None,
+    attachments: Optional[AttachmentCollector] = None,
+) -> Iterator[str]:
+    """
+    Yield the text of the selected (0-based) pages, or of all of the pages, in order,
+    stopping after max_pages pages. Each page's text ends with a form feed. If an
+    AttachmentCollector is given, the pages' images are added to it (see
+    _add_page_images).
+    """
+    # The same pipeline as pdfminer.high_level.extract_text(), but the output
+    # buffer is drained after each page
+    with io.StringIO() as output_string:
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = TextConverter(rsrcmgr, output_string, laparams=LAParams())
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+
+        wanted = None if page_numbers is None else set(page_numbers)
+        last_page = None if page_numbers is None else max(page_numbers, default=-1)
+        extracted = 0
+        for page_number, page in enumerate(
+            PDFPage.get_pages(file_stream, caching=True)
+        ):
+            if max_pages is not None and extracted >= max_pages:
+                break
+            if last_page is not None and page_number > last_page:
+                break
+            if wanted is not None and page_number not in wanted:
+                continue
+
+            interpreter.process_page(page)
+            extracted += 1
+            text = output_string.getvalue()
+            output_string.seek(0)
+            output_string.truncate()
+            if attachments is not None:
+                text = _add_page_images(text, page, attachments)
+            yield text
+
+
+def _add_page_images(text: str, page: Any, attachments: AttachmentCollector) -> str:
+    """
+    Add the JPEG and JPEG 2000 images drawn directly on a page to the attachments,
+    and append references to them to the page's text (before its form feed). Their
+    stream data is a complete image file, and is only read when the attachment is.
+    Images with other encodings (e.g., raw or Flate-compressed pixels) are skipped.
+    """
+    references = []
+    xobjects = resolve1((page.resources or {}).get("XObject")) or {}
+    for xobject_name, xobject_ref in xobjects.items():
+        stream = resolve1(xobject_ref)
+        if not isinstance(stream, PDFStream):
+            continue
+        subtype = stream.get("Subtype")
+        if getattr(subtype, "name", None) != "Image":
+            continue
+
+        filters = stream.get_filters()
+        if len(filters) != 1:
+            continue
+        if filters[0][0] in LITERALS_DCT_DECODE:
+            mimetype = "image/jpeg"
+        elif filters[0][0] in LITERALS_JPX_DECODE:
+            mimetype = "image/jp2"
+        else:
+            continue
+
+        name = attachments.add(
+            stream.get_data,
+            mimetype=mimetype,
+            key=stream.objid if stream.objid is not None else id(stream),
         )
+        references.append(f"![{xobject_name}]({name})\n")
+
+    if not references:
+        return text
+    if text.endswith("\f"):
+        return text[:-1] + "\n" + "".join(references) + "\f"
+    return text + "\n" + "".join(references)
+
+
+def _count_pages(pdf_bytes: bytes) -> int:
+    """Count the pages of a PDF, without analyzing their content."""
+    parser = PDFParser(io.BytesIO(pdf_bytes))
+    document = PDFDocument(parser, caching=True)
+    return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def _select_page_numbers(
+    page_count: int, page_numbers: Optional[List[int]], max_pages: Optional[int]
+) -> List[int]:
+    """Return the (sorted, 0-based) numbers of the pages to extract."""
+    if page_numbers is None:
+        page_numbers = list(range(page_count))
+    selected = [n for n in page_numbers if 0 <= n < page_count]
+    return selected if max_pages is None else selected[:max_pages]
+
+
+def _init_worker(pdf_bytes: bytes) -> None:
+    """Initializer for worker processes. The PDF is sent to each worker once, rather than with every shard."""
+    global _worker_pdf_bytes
+    _load_dependencies()
+    _worker_pdf_bytes = pdf_bytes
+
+
+def _extract_shard(page_numbers: List[int]) -> List[str]:
+    """Extract the text of a shard of pages, in a worker process."""
+    assert _worker_pdf_bytes is not None
+    return list(_extract_pages(io.BytesIO(_worker_pdf_bytes), page_numbers))
+
+
+def _extract_pages_in_parallel(
+    pdf_bytes: bytes, page_numbers: List[int], pdf_workers: int
+) -> Iterator[str]:
+    """
+    Extract the text of the selected pages across a pool of worker processes, each
+    running pdfminer's layout analysis on a contiguous shard of pages. Pages are
+    yielded in order, as soon as their shard (and all earlier shards) are done.
+    """
+    max_workers = min(pdf_workers, len(page_numbers))
+    shard_size = math.ceil(len(page_numbers) / (max_workers * _SHARDS_PER_WORKER))
+    shards = [
+        page_numbers[i : i + shard_size]
+        for i in range(0, len(page_numbers), shard_size)
+    ]
+
+    pool = concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(pdf_bytes,)
+    )
+    try:
+        # Keep a bounded number of shards in flight, so that finished pages don't
+        # pile up while an early shard is still being processed
+        pending: Deque[concurrent.futures.Future] = collections.deque()
+        next_shard = 0
+        while next_shard < len(shards) or pending:
+            while next_shard < len(shards) and len(pending) < 2 * max_workers:
+                pending.append(pool.submit(_extract_shard, shards[next_shard]))
+                next_shard += 1
+            yield from pending.popleft().result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -1,19 +1,10 @@
-import sys
-
-from typing import BinaryIO, Any
-from charset_normalizer import from_bytes
+import codecs
+from typing import BinaryIO, Any, Iterator
 from .._base_converter import DocumentConverter, DocumentConverterResult
+from .._charset import get_text_encoding
+from .._spool import iter_stream_chunks
 from .._stream_info import StreamInfo
 
-# Try loading optional (but in this case, required) dependencies
-# Save reporting of any exceptions for later
-_dependency_exc_info = None
-try:
-    import mammoth  # noqa: F401
-except ImportError:
-    # Preserve the error and stack trace for later
-    _dependency_exc_info = sys.exc_info()
-
 ACCEPTED_MIME_TYPE_PREFIXES = [
     "text/",
     "application/json",
@@ -63,9 +54,28 @@ class PlainTextConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
-        if stream_info.charset:
-            text_content = file_stream.read().decode(stream_info.charset)
-        else:
-            text_content = str(from_bytes(file_stream.read()).best())
+        md_content = "".join(self.convert_iter(file_stream, stream_info, **kwargs))
+        return DocumentConverterResult(markdown=md_content)
 
-        return DocumentConverterResult(markdown=text_content)
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        """
+        Yields the text as it is decoded. If the charset is not known, it is
+        detected from a sample of the stream (see CharsetDetector), rather than
+        from all of it.
+        """
+        encoding, errors = get_text_encoding(
+            file_stream, stream_info, kwargs.get("charset_detector")
+        )
+        decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+        for chunk in iter_stream_chunks(file_stream):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
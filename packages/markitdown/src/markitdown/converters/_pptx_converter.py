@@ -1,27 +1,31 @@
+import functools
 import sys
 import base64
 import os
-import io
 import re
-import html
 
-from typing import BinaryIO, Any
+from typing import BinaryIO, Any, Iterable, Iterator, List, Optional, Sequence
 from operator import attrgetter
 
-from ._html_converter import HtmlConverter
-from ._llm_caption import llm_caption
+from ._llm_caption import LlmCaptioner
+from ._markdown_table import MarkdownTableWriter
 from .._base_converter import DocumentConverter, DocumentConverterResult
 from .._stream_info import StreamInfo
+from .._attachments import AttachmentCollector
 from .._exceptions import MissingDependencyException, MISSING_DEPENDENCY_MESSAGE
 
-# Try loading optional (but in this case, required) dependencies
-# Save reporting of any exceptions for later
-_dependency_exc_info = None
-try:
-    import pptx
-except ImportError:
-    # Preserve the error and stack trace for later
-    _dependency_exc_info = sys.exc_info()
+
+# Try loading optional (but in this case, required) dependencies on first use, as
+# they are slow to import. Save reporting of any exceptions for later
+@functools.lru_cache(maxsize=None)
+def _load_dependencies() -> Any:
+    global pptx
+    try:
+        import pptx
+    except ImportError:
+        # Preserve the error and stack trace for later
+        return sys.exc_info()
+    return None
 
 
 ACCEPTED_MIME_TYPE_PREFIXES = [
@@ -30,15 +34,16 @@ ACCEPTED_MIME_TYPE_PREFIXES = [
 
 ACCEPTED_FILE_EXTENSIONS = [".pptx"]
 
+_table_writer = MarkdownTableWriter()
+
 
 class PptxConverter(DocumentConverter):
     """
     Converts PPTX files to Markdown. Supports heading, tables and images with alt text.
     """
 
-    def __init__(self):
-        super().__init__()
-        self._html_converter = HtmlConverter()
+    accepted_file_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
 
     def accepts(
         self,
@@ -64,7 +69,26 @@ class PptxConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
+        attachments: Optional[AttachmentCollector] = kwargs.get("attachment_collector")
+        if attachments is None and kwargs.get("extract_attachments"):
+            attachments = AttachmentCollector()
+        kwargs["attachment_collector"] = attachments
+
+        md_content = "".join(self.convert_iter(file_stream, stream_info, **kwargs))
+        return DocumentConverterResult(
+            markdown=md_content.strip(),
+            attachments=None if attachments is None else attachments.attachments,
+        )
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        """Yields the Markdown of the presentation, one slide at a time."""
         # Check the dependencies
+        _dependency_exc_info = _load_dependencies()
         if _dependency_exc_info is not None:
             raise MissingDependencyException(
                 MISSING_DEPENDENCY_MESSAGE.format(
@@ -78,126 +102,152 @@ class PptxConverter(DocumentConverter):
                 _dependency_exc_info[2]
             )
 
-        # Perform the conversion
+        # Optional slide selection (0-based slide numbers). Only the selected slides
+        # are parsed.
+        slide_range: Optional[Iterable[int]] = kwargs.get("slide_range")
+
         presentation = pptx.Presentation(file_stream)
-        md_content = ""
-        slide_num = 0
-        for slide in presentation.slides:
-            slide_num += 1
-
-            md_content += f"\n\n<!-- Slide number: {slide_num} -->\n"
-
-            title = slide.shapes.title
-
-            def get_shape_content(shape, **kwargs):
-                nonlocal md_content
-                # Pictures
-                if self._is_picture(shape):
-                    # https://github.com/scanny/python-pptx/pull/512#issuecomment-1713100069
-
-                    llm_description = ""
-                    alt_text = ""
-
-                    # Potentially generate a description using an LLM
-                    llm_client = kwargs.get("llm_client")
-                    llm_model = kwargs.get("llm_model")
-                    if llm_client is not None and llm_model is not None:
-                        # Prepare a file_stream and stream_info for the image data
-                        image_filename = shape.image.filename
-                        image_extension = None
-                        if image_filename:
-                            image_extension = os.path.splitext(image_filename)[1]
-                        image_stream_info = StreamInfo(
-                            mimetype=shape.image.content_type,
-                            extension=image_extension,
-                            filename=image_filename,
+        slide_count = len(presentation.slides)
+        slide_numbers: Sequence[int] = range(slide_count)
+        if slide_range is not None:
+            slide_numbers = [
+                n for n in sorted(set(slide_range)) if 0 <= n < slide_count
+            ]
+
+        # Pictures are captioned by the LLM (if one is configured), each distinct
+        # image once. With caption_workers > 1, the pictures of all the selected
+        # slides are submitted up front, and captioned concurrently while the
+        # slides are converted.
+        captioner: Optional[LlmCaptioner] = None
+        caption_workers: int = kwargs.get("caption_workers") or 1
+        llm_client = kwargs.get("llm_client")
+        llm_model = kwargs.get("llm_model")
+        if llm_client is not None and llm_model is not None:
+            captioner = LlmCaptioner(
+                client=llm_client,
+                model=llm_model,
+                prompt=kwargs.get("llm_prompt"),
+                max_workers=caption_workers,
+            )
+
+        # Perform the conversion
+        try:
+            if captioner is not None and caption_workers > 1:
+                for n in slide_numbers:
+                    for shape in self._iter_pictures(presentation.slides[n].shapes):
+                        image = shape.image
+                        captioner.submit(
+                            image.sha1,
+                            lambda image=image: image.blob,
+                            _get_image_stream_info(image),
                         )
 
-                        image_stream = io.BytesIO(shape.image.blob)
-
-                        # Caption the image
-                        try:
-                            llm_description = llm_caption(
-                                image_stream,
-                                image_stream_info,
-                                client=llm_client,
-                                model=llm_model,
-                                prompt=kwargs.get("llm_prompt"),
-                            )
-                        except Exception:
-                            # Unable to generate a description
-                            pass
-
-                    # Also grab any description embedded in the deck
-                    try:
-                        alt_text = shape._element._nvXxPr.cNvPr.attrib.get("descr", "")
-                    except Exception:
-                        # Unable to get alt text
-                        pass
-
-                    # Prepare the alt, escaping any special characters
-                    alt_text = "\n".join([llm_description, alt_text]) or shape.name
-                    alt_text = re.sub(r"[\r\n\[\]]", " ", alt_text)
-                    alt_text = re.sub(r"\s+", " ", alt_text).strip()
-
-                    # If keep_data_uris is True, use base64 encoding for images
-                    if kwargs.get("keep_data_uris", False):
-                        blob = shape.image.blob
-                        content_type = shape.image.content_type or "image/png"
-                        b64_string = base64.b64encode(blob).decode("utf-8")
-                        md_content += f"\n![{alt_text}](data:{content_type};base64,{b64_string})\n"
-                    else:
-                        # A placeholder name
-                        filename = re.sub(r"\W", "", shape.name) + ".jpg"
-                        md_content += "\n![" + alt_text + "](" + filename + ")\n"
-
-                # Tables
-                if self._is_table(shape):
-                    md_content += self._convert_table_to_markdown(shape.table, **kwargs)
-
-                # Charts
-                if shape.has_chart:
-                    md_content += self._convert_chart_to_markdown(shape.chart)
-
-                # Text areas
-                elif shape.has_text_frame:
-                    if shape == title:
-                        md_content += "# " + shape.text.lstrip() + "\n"
-                    else:
-                        md_content += shape.text + "\n"
-
-                # Group Shapes
-                if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.GROUP:
-                    sorted_shapes = sorted(
-                        shape.shapes,
-                        key=lambda x: (
-                            float("-inf") if not x.top else x.top,
-                            float("-inf") if not x.left else x.left,
-                        ),
+            for i, n in enumerate(slide_numbers):
+                slide_md = self._convert_slide(
+                    presentation.slides[n], n + 1, captioner=captioner, **kwargs
+                )
+                yield slide_md if i == 0 else "\n\n" + slide_md
+        finally:
+            if captioner is not None:
+                captioner.close()
+
+    def _convert_slide(
+        self,
+        slide,
+        slide_num: int,
+        captioner: Optional[LlmCaptioner] = None,
+        **kwargs: Any,
+    ) -> str:
+        # The Markdown of the slide is assembled in a list, and joined once
+        parts: List[str] = [f"<!-- Slide number: {slide_num} -->\n"]
+
+        title = slide.shapes.title
+
+        def get_shape_content(shape, **kwargs):
+            # Pictures
+            if self._is_picture(shape):
+                # https://github.com/scanny/python-pptx/pull/512#issuecomment-1713100069
+
+                llm_description = ""
+                alt_text = ""
+
+                # Potentially generate a description using an LLM
+                if captioner is not None:
+                    image = shape.image
+                    llm_description = captioner.caption(
+                        image.sha1, lambda: image.blob, _get_image_stream_info(image)
                     )
-                    for subshape in sorted_shapes:
-                        get_shape_content(subshape, **kwargs)
-
-            sorted_shapes = sorted(
-                slide.shapes,
-                key=lambda x: (
-                    float("-inf") if not x.top else x.top,
-                    float("-inf") if not x.left else x.left,
-                ),
-            )
-            for shape in sorted_shapes:
-                get_shape_content(shape, **kwargs)
 
-            md_content = md_content.strip()
+                # Also grab any description embedded in the deck
+                try:
+                    alt_text = shape._element._nvXxPr.cNvPr.attrib.get("descr", "")
+                except Exception:
+                    # Unable to get alt text
+                    pass
+
+                # Prepare the alt, escaping any special characters
+                alt_text = "\n".join([llm_description, alt_text]) or shape.name
+                alt_text = re.sub(r"[\r\n\[\]]", " ", alt_text)
+                alt_text = re.sub(r"\s+", " ", alt_text).strip()
+
+                # Extract the image as an attachment (read from the package on
+                # demand) if requested, else, if keep_data_uris is True, use base64
+                # encoding for images
+                attachments = kwargs.get("attachment_collector")
+                if attachments is not None:
+                    image = shape.image
+                    filename = attachments.add(
+                        lambda: image.blob,
+                        mimetype=image.content_type,
+                        extension="." + image.ext,
+                        key=image.sha1,
+                    )
+                    parts.append("\n![" + alt_text + "](" + filename + ")\n")
+                elif kwargs.get("keep_data_uris", False):
+                    blob = shape.image.blob
+                    content_type = shape.image.content_type or "image/png"
+                    b64_string = base64.b64encode(blob).decode("utf-8")
+                    parts.append(
+                        f"\n![{alt_text}](data:{content_type};base64,{b64_string})\n"
+                    )
+                else:
+                    # A placeholder name
+                    filename = re.sub(r"\W", "", shape.name) + ".jpg"
+                    parts.append("\n![" + alt_text + "](" + filename + ")\n")
+
+            # Tables
+            if self._is_table(shape):
+                parts.append(self._convert_table_to_markdown(shape.table, **kwargs))
+
+            # Charts
+            if shape.has_chart:
+                parts.append(self._convert_chart_to_markdown(shape.chart))
+
+            # Text areas
+            elif shape.has_text_frame:
+                if shape == title:
+                    parts.append("# " + shape.text.lstrip() + "\n")
+                else:
+                    parts.append(shape.text + "\n")
+
+            # Group Shapes
+            if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.GROUP:
+                for subshape in _sort_shapes(shape.shapes):
+                    get_shape_content(subshape, **kwargs)
 
-            if slide.has_notes_slide:
-                md_content += "\n\n### Notes:\n"
-                notes_frame = slide.notes_slide.notes_text_frame
-                if notes_frame is not None:
-                    md_content += notes_frame.text
-                md_content = md_content.strip()
+        for shape in _sort_shapes(slide.shapes):
+            get_shape_content(shape, **kwargs)
 
-        return DocumentConverterResult(markdown=md_content.strip())
+        md_content = "".join(parts).strip()
+
+        if slide.has_notes_slide:
+            md_content += "\n\n### Notes:\n"
+            notes_frame = slide.notes_slide.notes_text_frame
+            if notes_frame is not None:
+                md_content += notes_frame.text
+            md_content = md_content.strip()
+
+        return md_content
 
     def _is_picture(self, shape):
         if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.PICTURE:
@@ -207,30 +257,22 @@ class PptxConverter(DocumentConverter):
                 return True
         return False
 
+    def _iter_pictures(self, shapes) -> Iterator[Any]:
+        """Yield the pictures among the shapes, including those in groups."""
+        for shape in shapes:
+            if self._is_picture(shape):
+                yield shape
+            if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.GROUP:
+                yield from self._iter_pictures(shape.shapes)
+
     def _is_table(self, shape):
         if shape.shape_type == pptx.enum.shapes.MSO_SHAPE_TYPE.TABLE:
             return True
         return False
 
     def _convert_table_to_markdown(self, table, **kwargs):
-        # Write the table as HTML, then convert it to Markdown
-        html_table = "<html><body><table>"
-        first_row = True
-        for row in table.rows:
-            html_table += "<tr>"
-            for cell in row.cells:
-                if first_row:
-                    html_table += "<th>" + html.escape(cell.text) + "</th>"
-                else:
-                    html_table += "<td>" + html.escape(cell.text) + "</td>"
-            html_table += "</tr>"
-            first_row = False
-        html_table += "</table></body></html>"
-
-        return (
-            self._html_converter.convert_string(html_table, **kwargs).markdown.strip()
-            + "\n"
-        )
+        rows = ([cell.text for cell in row.cells] for row in table.rows)
+        return _table_writer.render(rows) + "\n"
 
     def _convert_chart_to_markdown(self, chart):
         try:
@@ -262,3 +304,24 @@ class PptxConverter(DocumentConverter):
         except Exception:
             # Catch any other exceptions that might occur
             return "\n\n[unsupported chart]\n\n"
+
+
+def _sort_shapes(shapes) -> List[Any]:
+    """Sort shapes in reading order: top to bottom, then left to right."""
+    return sorted(
+        shapes,
+        key=lambda x: (
+            float("-inf") if not x.top else x.top,
+            float("-inf") if not x.left else x.left,
+        ),
+    )
+
+
+def _get_image_stream_info(image) -> StreamInfo:
+    """The stream info of a picture's image, with which it is captioned."""
+    extension = None
+    if image.filename:
+        extension = os.path.splitext(image.filename)[1]
+    return StreamInfo(
+        mimetype=image.content_type, extension=extension, filename=image.filename
+    )
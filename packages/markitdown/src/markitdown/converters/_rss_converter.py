@@ -1,9 +1,7 @@
 from defusedxml import minidom
 from xml.dom.minidom import Document, Element
 from typing import BinaryIO, Any, Union
-from bs4 import BeautifulSoup
 
-from ._markdownify import _CustomMarkdownify
 from .._stream_info import StreamInfo
 from .._base_converter import DocumentConverter, DocumentConverterResult
 
@@ -29,6 +27,11 @@ CANDIDATE_FILE_EXTENSIONS = [
 class RssConverter(DocumentConverter):
     """Convert RSS / Atom type to markdown"""
 
+    accepted_file_extensions = PRECISE_FILE_EXTENSIONS + CANDIDATE_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = (
+        PRECISE_MIME_TYPE_PREFIXES + CANDIDATE_MIME_TYPE_PREFIXES
+    )
+
     def __init__(self):
         super().__init__()
         self._kwargs = {}
@@ -169,6 +172,10 @@ class RssConverter(DocumentConverter):
 
     def _parse_content(self, content: str) -> str:
         """Parse the content of an RSS feed item"""
+        # Deferred until needed, as bs4 is slow to import
+        from bs4 import BeautifulSoup
+        from ._markdownify import _CustomMarkdownify
+
         try:
             # using bs4 because many RSS feeds have HTML-styled content
             soup = BeautifulSoup(content, "html.parser")
@@ -1,27 +1,33 @@
+import functools
 import io
 import sys
-from typing import BinaryIO
+from typing import Any, BinaryIO
 from .._exceptions import MissingDependencyException
 
-# Try loading optional (but in this case, required) dependencies
-# Save reporting of any exceptions for later
-_dependency_exc_info = None
-try:
-    # Suppress some warnings on library import
-    import warnings
 
-    with warnings.catch_warnings():
-        warnings.filterwarnings("ignore", category=DeprecationWarning)
-        warnings.filterwarnings("ignore", category=SyntaxWarning)
-        import speech_recognition as sr
-        import pydub
-except ImportError:
-    # Preserve the error and stack trace for later
-    _dependency_exc_info = sys.exc_info()
+# Try loading optional (but in this case, required) dependencies on first use, as
+# they are slow to import. Save reporting of any exceptions for later
+@functools.lru_cache(maxsize=None)
+def _load_dependencies() -> Any:
+    global sr, pydub
+    try:
+        # Suppress some warnings on library import
+        import warnings
+
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=DeprecationWarning)
+            warnings.filterwarnings("ignore", category=SyntaxWarning)
+            import speech_recognition as sr
+            import pydub
+    except ImportError:
+        # Preserve the error and stack trace for later
+        return sys.exc_info()
+    return None
 
 
 def transcribe_audio(file_stream: BinaryIO, *, audio_format: str = "wav") -> str:
     # Check for installed dependencies
+    _dependency_exc_info = _load_dependencies()
     if _dependency_exc_info is not None:
         raise MissingDependencyException(
             "Speech transcription requires installing MarkItdown with the [audio-transcription] optional dependencies. E.g., `pip install markitdown[audio-transcription]` or `pip install markitdown[all]`"
@@ -1,25 +1,36 @@
+import functools
+import random
 import sys
-from typing import BinaryIO, Any
-from ._html_converter import HtmlConverter
+from typing import BinaryIO, Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+from ._markdown_table import MarkdownTableWriter, format_dataframe_rows
 from .._base_converter import DocumentConverter, DocumentConverterResult
 from .._exceptions import MissingDependencyException, MISSING_DEPENDENCY_MESSAGE
 from .._stream_info import StreamInfo
 
-# Try loading optional (but in this case, required) dependencies
-# Save reporting of any exceptions for later
-_xlsx_dependency_exc_info = None
-try:
-    import pandas as pd
-    import openpyxl  # noqa: F401
-except ImportError:
-    _xlsx_dependency_exc_info = sys.exc_info()
-
-_xls_dependency_exc_info = None
-try:
-    import pandas as pd  # noqa: F811
-    import xlrd  # noqa: F401
-except ImportError:
-    _xls_dependency_exc_info = sys.exc_info()
+
+# Try loading optional (but in this case, required) dependencies on first use, as
+# they are slow to import. Save reporting of any exceptions for later
+@functools.lru_cache(maxsize=None)
+def _load_xlsx_dependencies() -> Any:
+    global pd, openpyxl
+    try:
+        import pandas as pd
+        import openpyxl
+    except ImportError:
+        return sys.exc_info()
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_xls_dependencies() -> Any:
+    global pd, xlrd
+    try:
+        import pandas as pd  # noqa: F811
+        import xlrd
+    except ImportError:
+        return sys.exc_info()
+    return None
+
 
 ACCEPTED_XLSX_MIME_TYPE_PREFIXES = [
     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
@@ -32,15 +43,26 @@ ACCEPTED_XLS_MIME_TYPE_PREFIXES = [
 ]
 ACCEPTED_XLS_FILE_EXTENSIONS = [".xls"]
 
+# How sheets are read (see the spreadsheet_engine option): with pandas, into a
+# DataFrame per sheet, or row by row, writing each row's Markdown directly
+SPREADSHEET_ENGINES = ["pandas", "streaming"]
+
+# (name, number of columns, rows) of a sheet read by the streaming engine
+_Sheet = Tuple[str, int, Iterator[Sequence[Any]]]
+
+# The streaming engine yields the Markdown of this many rows at a time
+_STREAMING_ROWS_PER_CHUNK = 1000
+
+_table_writer = MarkdownTableWriter()
+
 
 class XlsxConverter(DocumentConverter):
     """
     Converts XLSX files to Markdown, with each sheet presented as a separate Markdown table.
     """
 
-    def __init__(self):
-        super().__init__()
-        self._html_converter = HtmlConverter()
+    accepted_file_extensions = ACCEPTED_XLSX_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = ACCEPTED_XLSX_MIME_TYPE_PREFIXES
 
     def accepts(
         self,
@@ -66,7 +88,18 @@ class XlsxConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
+        md_content = "".join(self.convert_iter(file_stream, stream_info, **kwargs))
+        return DocumentConverterResult(markdown=md_content.strip())
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        """Yields the Markdown of the workbook, one sheet at a time."""
         # Check the dependencies
+        _xlsx_dependency_exc_info = _load_xlsx_dependencies()
         if _xlsx_dependency_exc_info is not None:
             raise MissingDependencyException(
                 MISSING_DEPENDENCY_MESSAGE.format(
@@ -80,19 +113,10 @@ class XlsxConverter(DocumentConverter):
                 _xlsx_dependency_exc_info[2]
             )
 
-        sheets = pd.read_excel(file_stream, sheet_name=None, engine="openpyxl")
-        md_content = ""
-        for s in sheets:
-            md_content += f"## {s}\n"
-            html_content = sheets[s].to_html(index=False)
-            md_content += (
-                self._html_converter.convert_string(
-                    html_content, **kwargs
-                ).markdown.strip()
-                + "\n\n"
-            )
-
-        return DocumentConverterResult(markdown=md_content.strip())
+        if _get_spreadsheet_engine(kwargs) == "streaming":
+            yield from _join_sheets(_iter_xlsx_sheets(file_stream), **kwargs)
+        else:
+            yield from _convert_sheets(file_stream, engine="openpyxl", **kwargs)
 
 
 class XlsConverter(DocumentConverter):
@@ -100,9 +124,8 @@ class XlsConverter(DocumentConverter):
     Converts XLS files to Markdown, with each sheet presented as a separate Markdown table.
     """
 
-    def __init__(self):
-        super().__init__()
-        self._html_converter = HtmlConverter()
+    accepted_file_extensions = ACCEPTED_XLS_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = ACCEPTED_XLS_MIME_TYPE_PREFIXES
 
     def accepts(
         self,
@@ -128,7 +151,18 @@ class XlsConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
+        md_content = "".join(self.convert_iter(file_stream, stream_info, **kwargs))
+        return DocumentConverterResult(markdown=md_content.strip())
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        """Yields the Markdown of the workbook, one sheet at a time."""
         # Load the dependencies
+        _xls_dependency_exc_info = _load_xls_dependencies()
         if _xls_dependency_exc_info is not None:
             raise MissingDependencyException(
                 MISSING_DEPENDENCY_MESSAGE.format(
@@ -142,16 +176,207 @@ class XlsConverter(DocumentConverter):
                 _xls_dependency_exc_info[2]
             )
 
-        sheets = pd.read_excel(file_stream, sheet_name=None, engine="xlrd")
-        md_content = ""
-        for s in sheets:
-            md_content += f"## {s}\n"
-            html_content = sheets[s].to_html(index=False)
-            md_content += (
-                self._html_converter.convert_string(
-                    html_content, **kwargs
-                ).markdown.strip()
-                + "\n\n"
+        if _get_spreadsheet_engine(kwargs) == "streaming":
+            yield from _join_sheets(_iter_xls_sheets(file_stream), **kwargs)
+        else:
+            yield from _convert_sheets(file_stream, engine="xlrd", **kwargs)
+
+
+def _get_spreadsheet_engine(kwargs: Any) -> str:
+    engine = kwargs.get("spreadsheet_engine") or "pandas"
+    if engine not in SPREADSHEET_ENGINES:
+        raise ValueError(
+            f"Invalid spreadsheet_engine: {engine}. Expected one of: {', '.join(SPREADSHEET_ENGINES)}"
+        )
+    return engine
+
+
+def _convert_sheets(
+    file_stream: BinaryIO, *, engine: str, **kwargs: Any
+) -> Iterator[str]:
+    """Yield each sheet of the workbook as a Markdown table, parsing one sheet at a time."""
+    sheet_names: Optional[Iterable[str]] = kwargs.get("sheet_names")
+    max_rows: Optional[int] = kwargs.get("max_rows_per_sheet")
+    sample_rows: Optional[int] = kwargs.get("sample_rows_per_sheet")
+
+    allowed = None if sheet_names is None else set(sheet_names)
+    with pd.ExcelFile(file_stream, engine=engine) as workbook:
+        i = 0
+        for sheet_name in workbook.sheet_names:
+            if allowed is not None and sheet_name not in allowed:
+                continue
+
+            # One row more than requested is read, to tell whether any were left out
+            df = workbook.parse(
+                sheet_name, nrows=None if max_rows is None else max_rows + 1
             )
+            note = ""
+            truncated = max_rows is not None and len(df) > max_rows
+            if truncated:
+                df = df.head(max_rows)
+                note = "\n\n" + _get_truncation_note(len(df))
+            if sample_rows is not None and len(df) > sample_rows:
+                note = "\n\n" + _get_sample_note(sample_rows, len(df), truncated)
+                df = df.sample(n=sample_rows, random_state=0).sort_index()
 
-        return DocumentConverterResult(markdown=md_content.strip())
+            # The values are formatted as DataFrame.to_html() formats them
+            table = _table_writer.render(format_dataframe_rows(df))
+            md_content = f"## {sheet_name}\n" + table + note
+            yield md_content if i == 0 else "\n\n" + md_content
+            i += 1
+
+
+def _iter_xlsx_sheets(file_stream: BinaryIO) -> Iterator[_Sheet]:
+    """
+    Yield (name, width, rows) for each sheet of an XLSX workbook, where rows lazily
+    yields the cell values of each row. The workbook is opened in openpyxl's
+    read-only mode, in which rows are parsed as they are iterated.
+    """
+    workbook = openpyxl.load_workbook(file_stream, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            rows = worksheet.iter_rows(values_only=True)
+            yield worksheet.title, worksheet.max_column or 0, rows
+    finally:
+        workbook.close()
+
+
+def _iter_xls_sheets(file_stream: BinaryIO) -> Iterator[_Sheet]:
+    """
+    Yield (name, width, rows) for each sheet of an XLS workbook, like
+    _iter_xlsx_sheets. xlrd loads one sheet at a time, and each is unloaded once
+    its rows have been read.
+    """
+    workbook = xlrd.open_workbook(file_contents=file_stream.read(), on_demand=True)
+    try:
+        for sheet_name in workbook.sheet_names():
+            sheet = workbook.sheet_by_name(sheet_name)
+            rows = (
+                [_get_xls_cell_value(cell, workbook.datemode) for cell in sheet.row(i)]
+                for i in range(sheet.nrows)
+            )
+            yield sheet_name, sheet.ncols, rows
+            workbook.unload_sheet(sheet_name)
+    finally:
+        workbook.release_resources()
+
+
+def _get_xls_cell_value(cell: Any, datemode: int) -> Any:
+    # As pandas reads them: whole numbers as ints, and dates as datetimes
+    if cell.ctype == xlrd.XL_CELL_EMPTY or cell.ctype == xlrd.XL_CELL_BLANK:
+        return None
+    if cell.ctype == xlrd.XL_CELL_NUMBER and float(cell.value).is_integer():
+        return int(cell.value)
+    if cell.ctype == xlrd.XL_CELL_DATE:
+        try:
+            return xlrd.xldate_as_datetime(cell.value, datemode)
+        except (ValueError, OverflowError, xlrd.xldate.XLDateError):
+            return cell.value
+    if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(cell.value)
+    return cell.value
+
+
+def _join_sheets(sheets: Iterator[_Sheet], **kwargs: Any) -> Iterator[str]:
+    """
+    Yield the Markdown of the sheets (see _iter_xlsx_sheets), a chunk of rows at a
+    time. Rows are rendered as they are read, so memory use does not grow with the
+    size of the sheets (except for the rows kept for sample_rows_per_sheet).
+    """
+    sheet_names: Optional[Iterable[str]] = kwargs.get("sheet_names")
+    max_rows: Optional[int] = kwargs.get("max_rows_per_sheet")
+    sample_rows: Optional[int] = kwargs.get("sample_rows_per_sheet")
+
+    allowed = None if sheet_names is None else set(sheet_names)
+    i = 0
+    for sheet_name, width, rows in sheets:
+        if allowed is not None and sheet_name not in allowed:
+            continue
+
+        chunk = [f"## {sheet_name}" if i == 0 else f"\n\n## {sheet_name}"]
+        for line in _iter_table_lines(rows, width, max_rows, sample_rows):
+            chunk.append(line)
+            if len(chunk) >= _STREAMING_ROWS_PER_CHUNK:
+                yield "\n".join(chunk)
+                chunk = [""]
+        yield "\n".join(chunk)
+        i += 1
+
+
+def _iter_table_lines(
+    rows: Iterator[Sequence[Any]],
+    width: int,
+    max_rows: Optional[int],
+    sample_rows: Optional[int],
+) -> Iterator[str]:
+    """
+    Yield the lines of the Markdown table of a sheet's rows, the first of which is
+    the header. Blank rows at the end of the sheet are dropped. If rows were left
+    out (see max_rows_per_sheet and sample_rows_per_sheet), the table is followed
+    by a note saying so.
+    """
+    rows = _drop_trailing_blank_rows(rows)
+    header = next(rows, None)
+    if header is None:
+        return
+
+    width = max(width, len(header))
+    yield from _table_writer.iter_lines([header], width)
+
+    if sample_rows is None:
+        for n, row in enumerate(rows):
+            if max_rows is not None and n >= max_rows:
+                yield from ["", _get_truncation_note(max_rows)]
+                return
+            yield _table_writer.format_row(row, width)
+        return
+
+    # Reservoir sampling (with a fixed seed, so that the sample is reproducible)
+    # keeps sample_rows rows at most, which are then written in their original order
+    rng = random.Random(0)
+    sample: List[Tuple[int, str]] = []
+    total = 0
+    truncated = False
+    for n, row in enumerate(rows):
+        if max_rows is not None and n >= max_rows:
+            truncated = True
+            break
+        total += 1
+        if len(sample) < sample_rows:
+            sample.append((n, _table_writer.format_row(row, width)))
+        else:
+            j = rng.randint(0, n)
+            if j < sample_rows:
+                sample[j] = (n, _table_writer.format_row(row, width))
+    sample.sort()
+    for _, line in sample:
+        yield line
+    if total > sample_rows:
+        yield from ["", _get_sample_note(sample_rows, total, truncated)]
+    elif truncated:
+        yield from ["", _get_truncation_note(max_rows or 0)]
+
+
+def _drop_trailing_blank_rows(
+    rows: Iterator[Sequence[Any]],
+) -> Iterator[Sequence[Any]]:
+    # Only the number of pending blank rows is kept, until a non-blank row follows them
+    blank_rows = 0
+    for row in rows:
+        if all(value is None or value == "" for value in row):
+            blank_rows += 1
+            continue
+        for _ in range(blank_rows):
+            yield ()
+        blank_rows = 0
+        yield row
+
+
+def _get_truncation_note(max_rows: int) -> str:
+    return f"*Only the first {max_rows} rows of this sheet are shown.*"
+
+
+def _get_sample_note(sample_rows: int, total_rows: int, truncated: bool) -> str:
+    # If the sheet was also cut at max_rows_per_sheet, the sample is of its first rows
+    rows = f"first {total_rows} rows" if truncated else f"{total_rows} rows"
+    return f"*A sample of {sample_rows} of the {rows} of this sheet is shown.*"
@@ -1,12 +1,14 @@
 import zipfile
 import io
 import os
+import struct
 
-from typing import BinaryIO, Any, TYPE_CHECKING
+from typing import BinaryIO, Any, Iterator, TYPE_CHECKING
 
 from .._base_converter import DocumentConverter, DocumentConverterResult
 from .._stream_info import StreamInfo
 from .._exceptions import UnsupportedFormatException, FileConversionException
+from .._mmap_stream import MemoryViewStream
 
 # Break otherwise circular import for type hinting
 if TYPE_CHECKING:
@@ -58,6 +60,9 @@ class ZipConverter(DocumentConverter):
     - Cleans up temporary files after processing
     """
 
+    accepted_file_extensions = ACCEPTED_FILE_EXTENSIONS
+    accepted_mime_type_prefixes = ACCEPTED_MIME_TYPE_PREFIXES
+
     def __init__(
         self,
         *,
@@ -90,27 +95,66 @@ class ZipConverter(DocumentConverter):
         stream_info: StreamInfo,
         **kwargs: Any,  # Options to pass to the converter
     ) -> DocumentConverterResult:
+        md_content = "".join(self.convert_iter(file_stream, stream_info, **kwargs))
+        return DocumentConverterResult(markdown=md_content.strip())
+
+    def convert_iter(
+        self,
+        file_stream: BinaryIO,
+        stream_info: StreamInfo,
+        **kwargs: Any,  # Options to pass to the converter
+    ) -> Iterator[str]:
+        """Yields the Markdown of the archive, one member at a time."""
         file_path = stream_info.url or stream_info.local_path or stream_info.filename
-        md_content = f"Content from the zip file `{file_path}`:\n\n"
 
         with zipfile.ZipFile(file_stream, "r") as zipObj:
+            yield f"Content from the zip file `{file_path}`:"
             for name in zipObj.namelist():
                 try:
-                    z_file_stream = io.BytesIO(zipObj.read(name))
+                    z_file_stream = _open_member(zipObj, name, file_stream)
                     z_file_stream_info = StreamInfo(
                         extension=os.path.splitext(name)[1],
                         filename=os.path.basename(name),
                     )
-                    result = self._markitdown.convert_stream(
-                        stream=z_file_stream,
-                        stream_info=z_file_stream_info,
-                    )
+                    with z_file_stream:
+                        result = self._markitdown.convert_stream(
+                            stream=z_file_stream,
+                            stream_info=z_file_stream_info,
+                        )
                     if result is not None:
-                        md_content += f"## File: {name}\n\n"
-                        md_content += result.markdown + "\n\n"
+                        yield f"\n\n## File: {name}\n\n" + result.markdown.rstrip()
                 except UnsupportedFormatException:
                     pass
                 except FileConversionException:
                     pass
 
-        return DocumentConverterResult(markdown=md_content.strip())
+
+def _open_member(
+    zip_file: zipfile.ZipFile, name: str, file_stream: BinaryIO
+) -> BinaryIO:
+    """
+    Open a member of the archive as a seekable stream. If the archive is itself a
+    MemoryViewStream (e.g., a memory-mapped file), uncompressed members are served
+    as views of the archive's buffer, without copying. Other members are read into
+    memory.
+    """
+    info = zip_file.getinfo(name)
+    if (
+        not isinstance(file_stream, MemoryViewStream)
+        or info.compress_type != zipfile.ZIP_STORED
+        or info.flag_bits & 0x1  # Encrypted
+    ):
+        return io.BytesIO(zip_file.read(name))
+
+    # Skip the member's local file header, whose variable-length fields may differ from the central directory's
+    cur_pos = file_stream.tell()
+    try:
+        file_stream.seek(info.header_offset)
+        header = file_stream.read(zipfile.sizeFileHeader)
+        if len(header) != zipfile.sizeFileHeader or header[0:4] != b"PK\x03\x04":
+            return io.BytesIO(zip_file.read(name))
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        file_stream.seek(name_length + extra_length, io.SEEK_CUR)
+        return MemoryViewStream(file_stream.getbuffer(info.file_size))
+    finally:
+        file_stream.seek(cur_pos)
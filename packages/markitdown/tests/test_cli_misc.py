@@ -1,7 +1,11 @@
 #!/usr/bin/env python3 -m pytest
+import os
+import shutil
 import subprocess
 from markitdown import __version__
 
+TEST_FILES_DIR = os.path.join(os.path.dirname(__file__), "test_files")
+
 # This file contains CLI tests that are not directly tested by the FileTestVectors.
 # This includes things like help messages, version numbers, and invalid flags.
 
@@ -27,6 +31,82 @@ def test_invalid_flag() -> None:
     assert "SYNTAX" in result.stderr, "Expected 'SYNTAX' to appear in STDERR"
 
 
+def test_batch_mode(tmp_path) -> None:
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    os.makedirs(input_dir / "nested")
+    shutil.copy(os.path.join(TEST_FILES_DIR, "test.json"), input_dir)
+    shutil.copy(os.path.join(TEST_FILES_DIR, "random.bin"), input_dir)
+    shutil.copy(os.path.join(TEST_FILES_DIR, "test_blog.html"), input_dir / "nested")
+
+    result = subprocess.run(
+        [
+            "python",
+            "-m",
+            "markitdown",
+            str(input_dir),
+            "-o",
+            str(output_dir),
+            "-j",
+            "2",
+        ],
+        capture_output=True,
+        text=True,
+    )
+
+    # random.bin is not supported, but does not stop the batch
+    assert result.returncode == 1
+    assert "random.bin" in result.stderr
+    assert os.path.isfile(output_dir / "test.json.md")
+    assert os.path.isfile(output_dir / "nested" / "test_blog.html.md")
+    assert "Converted 2 file(s)" in result.stderr
+
+    # A second run resumes from the manifest, and has nothing left to do
+    result = subprocess.run(
+        ["python", "-m", "markitdown", str(input_dir), "-o", str(output_dir)],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, f"CLI exited with error: {result.stderr}"
+    assert "skipped 2 up-to-date file(s)" in result.stderr
+    assert "skipped 1 previously failed file(s)" in result.stderr
+
+    # Failures are retried when asked
+    result = subprocess.run(
+        [
+            "python",
+            "-m",
+            "markitdown",
+            str(input_dir),
+            "-o",
+            str(output_dir),
+            "--retry-failed",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 1
+    assert "random.bin" in result.stderr
+    assert "skipped 2 up-to-date file(s), 1 failure(s)" in result.stderr
+
+    # Glob patterns select a subset of files
+    glob_output_dir = tmp_path / "glob_output"
+    result = subprocess.run(
+        [
+            "python",
+            "-m",
+            "markitdown",
+            str(input_dir / "**" / "*.html"),
+            "-o",
+            str(glob_output_dir),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, f"CLI exited with error: {result.stderr}"
+    assert os.listdir(glob_output_dir / "nested") == ["test_blog.html.md"]
+
+
 if __name__ == "__main__":
     """Runs this file's tests from the command line."""
     test_version()
@@ -1,19 +1,43 @@
 #!/usr/bin/env python3 -m pytest
+import asyncio
+import base64
 import io
 import os
+import pickle
 import re
 import shutil
+import subprocess
+import sys
+import threading
+import time
+import zipfile
 import pytest
+import requests
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock
 
 from markitdown._uri_utils import parse_data_uri, file_uri_to_path
+from markitdown._detection import sniff_stream
+from markitdown._mmap_stream import MemoryViewStream, read_buffer
+from markitdown._spool import spool_chunks
 
 from markitdown import (
     MarkItDown,
     UnsupportedFormatException,
     FileConversionException,
+    InputTooLargeException,
     StreamInfo,
+    ConversionCache,
+    DocumentConverter,
+    DocumentConverterResult,
+    ResourceDownloader,
+    HttpFetcher,
+    HttpCache,
+    CharsetDetector,
 )
+from markitdown.converters import HtmlConverter, PlainTextConverter
+from markitdown.converters._markdown_table import MarkdownTableWriter
 
 # This file contains module tests that are not directly tested by the FileTestVectors.
 # This includes things like helper functions and runtime conversion options
@@ -441,6 +465,908 @@ def test_markitdown_llm() -> None:
     validate_strings(result, PPTX_TEST_STRINGS)
 
 
+def test_conversion_cache(tmp_path) -> None:
+    docx_file = os.path.join(TEST_FILES_DIR, "test_with_comment.docx")
+    cache = ConversionCache(cache_dir=str(tmp_path))
+
+    markitdown = MarkItDown(cache=cache)
+    result = markitdown.convert(docx_file)
+    validate_strings(result, DOCX_COMMENT_TEST_STRINGS[0:2])
+    assert cache.hits == 0
+    assert cache.misses == 1
+
+    # A repeat conversion is served from memory, without running any converter
+    markitdown._convert = MagicMock(side_effect=AssertionError("Cache miss"))
+    cached_result = markitdown.convert(docx_file)
+    assert cached_result.markdown == result.markdown
+    assert cache.memory_hits == 1
+
+    # Options that affect the output are part of the key
+    markitdown = MarkItDown(cache=cache, style_map="comment-reference => ")
+    result = markitdown.convert(docx_file)
+    validate_strings(result, DOCX_COMMENT_TEST_STRINGS)
+    assert cache.misses == 2
+
+    # The disk tier is shared across cache instances
+    disk_cache = ConversionCache(cache_dir=str(tmp_path))
+    markitdown = MarkItDown(cache=disk_cache, style_map="comment-reference => ")
+    markitdown._convert = MagicMock(side_effect=AssertionError("Cache miss"))
+    assert markitdown.convert(docx_file).markdown == result.markdown
+    assert disk_cache.disk_hits == 1
+
+    # The memory tier is bounded in size
+    small_cache = ConversionCache(max_memory_bytes=2048)
+    markitdown = MarkItDown(cache=small_cache)
+    for i in range(5):
+        markitdown.convert_stream(io.BytesIO(f"Document {i}".encode("utf-8") * 50))
+    assert small_cache.evictions > 0
+    assert small_cache.memory_bytes <= 2048
+
+    # Ranges and sets are keyed by their items, and iterators are not cached
+    pptx_file = os.path.join(TEST_FILES_DIR, "test.pptx")
+    cache = ConversionCache()
+    markitdown = MarkItDown(cache=cache)
+    for slide_range in [range(0, 1), range(1, 2), {2, 3}, {3, 4}]:
+        expected = MarkItDown().convert(pptx_file, slide_range=slide_range).markdown
+        assert markitdown.convert(pptx_file, slide_range=slide_range).markdown == (
+            expected
+        )
+    misses = cache.misses
+    markitdown.convert(pptx_file, slide_range=iter([0]))
+    assert cache.misses == misses
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_convert_many(executor) -> None:
+    markitdown = MarkItDown()
+    sources = [
+        os.path.join(TEST_FILES_DIR, "test_with_comment.docx"),
+        os.path.join(TEST_FILES_DIR, "random.bin"),
+        os.path.join(TEST_FILES_DIR, "test_blog.html"),
+        os.path.join(TEST_FILES_DIR, "does_not_exist.txt"),
+        os.path.join(TEST_FILES_DIR, "test.json"),
+    ]
+
+    # Ordered results
+    results = list(markitdown.convert_many(sources, max_workers=2, executor=executor))
+    assert [r.index for r in results] == list(range(len(sources)))
+    assert [r.source for r in results] == sources
+    assert [r.ok for r in results] == [True, False, True, False, True]
+    validate_strings(results[0].result, DOCX_COMMENT_TEST_STRINGS[0:2])
+    assert isinstance(results[1].exception, UnsupportedFormatException)
+    assert isinstance(results[3].exception, FileConversionException)
+
+    # Unordered results
+    results = list(
+        markitdown.convert_many(
+            sources, max_workers=2, executor=executor, ordered=False
+        )
+    )
+    assert sorted(r.index for r in results) == list(range(len(sources)))
+
+
+class _CrashingPath(type(Path())):  # type: ignore[misc]
+    """A path that kills the worker process that unpickles it."""
+
+    def __reduce__(self):
+        return (os._exit, (1,))
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_convert_many_broken_pool(ordered) -> None:
+    json_file = os.path.join(TEST_FILES_DIR, "test.json")
+    sources = [json_file, _CrashingPath(json_file)] + [json_file] * 4
+
+    results = list(
+        MarkItDown().convert_many(
+            sources, max_workers=1, executor="process", ordered=ordered
+        )
+    )
+    assert sorted(r.index for r in results) == list(range(len(sources)))
+    results.sort(key=lambda r: r.index)
+    assert isinstance(results[1].exception, FileConversionException)
+    assert "BrokenProcessPool" in str(results[1].exception)
+
+    # The sources submitted after the pool broke are converted by a new pool
+    assert all(r.ok for r in results[-2:])
+
+
+def test_converter_dispatch_index() -> None:
+    calls = []
+
+    class _DeclaredConverter(DocumentConverter):
+        accepted_file_extensions = [".foo"]
+        accepted_mime_type_prefixes = ["application/x-foo"]
+
+        def accepts(self, file_stream, stream_info, **kwargs):
+            calls.append(("declared", stream_info.extension))
+            return stream_info.extension == ".foo"
+
+        def convert(self, file_stream, stream_info, **kwargs):
+            return DocumentConverterResult(markdown="foo")
+
+    class _UndeclaredConverter(DocumentConverter):
+        def accepts(self, file_stream, stream_info, **kwargs):
+            calls.append(("undeclared", stream_info.extension))
+            return False
+
+    class _HtmlSubclass(HtmlConverter):
+        # Overrides accepts(), so the inherited declarations must be ignored
+        def accepts(self, file_stream, stream_info, **kwargs):
+            calls.append(("subclass", stream_info.extension))
+            return False
+
+    markitdown = MarkItDown()
+    markitdown.register_converter(_DeclaredConverter())
+    markitdown.register_converter(_UndeclaredConverter())
+
+    # The declared converter is skipped for other file types
+    result = markitdown.convert_stream(
+        io.BytesIO(b"Hello world"), stream_info=StreamInfo(extension=".txt")
+    )
+    assert "Hello world" in result.markdown
+    assert ("undeclared", ".txt") in calls
+    assert ("declared", ".txt") not in calls
+
+    # ... but is consulted for its own
+    calls.clear()
+    result = markitdown.convert_stream(
+        io.BytesIO(b"data"), stream_info=StreamInfo(extension=".foo")
+    )
+    assert result.markdown == "foo"
+    assert ("declared", ".foo") in calls
+
+    # Registering a converter invalidates the index
+    markitdown.register_converter(_HtmlSubclass())
+    calls.clear()
+    markitdown.convert_stream(
+        io.BytesIO(b"Hello world"), stream_info=StreamInfo(extension=".txt")
+    )
+    assert ("subclass", ".txt") in calls
+    assert ("declared", ".txt") not in calls
+
+
+def test_convert_iter() -> None:
+    markitdown = MarkItDown()
+
+    # Chunked converters yield one chunk per slide, which concatenate to the full result
+    pptx_file = os.path.join(TEST_FILES_DIR, "test.pptx")
+    chunks = list(markitdown.convert_iter(pptx_file))
+    assert len(chunks) > 1
+    assert "".join(chunks) == markitdown.convert(pptx_file).markdown
+
+    # Other converters produce their output all at once
+    json_file = os.path.join(TEST_FILES_DIR, "test.json")
+    json_chunks = list(markitdown.convert_iter(json_file))
+    assert "".join(json_chunks) == markitdown.convert(json_file).markdown
+
+    class _ChunkedConverter(DocumentConverter):
+        def accepts(self, file_stream, stream_info, **kwargs):
+            return stream_info.extension == ".chunked"
+
+        def convert_iter(self, file_stream, stream_info, **kwargs):
+            yield from [
+                "# Title  \n",
+                "\n",
+                "\n\n\nLine",
+                " one \r",
+                "\nLine two\n\n\n",
+            ]
+
+    class _FailingConverter(DocumentConverter):
+        def accepts(self, file_stream, stream_info, **kwargs):
+            return stream_info.extension == ".chunked"
+
+        def convert_iter(self, file_stream, stream_info, **kwargs):
+            raise ValueError("Fails before producing any output")
+            yield ""
+
+    markitdown.register_converter(_ChunkedConverter())
+    markitdown.register_converter(_FailingConverter(), priority=-1.0)
+
+    # Failures before the first chunk fall back to the next converter, and lines and
+    # blank lines are normalized across chunk boundaries
+    stream = io.BytesIO(b"")
+    text = "".join(
+        markitdown.convert_iter(stream, stream_info=StreamInfo(extension=".chunked"))
+    )
+    assert text == "# Title\n\nLine one\nLine two\n\n"
+
+    # Nothing is opened until iteration begins
+    markitdown.convert_iter(os.path.join(TEST_FILES_DIR, "does_not_exist.txt"))
+    with pytest.raises(UnsupportedFormatException):
+        list(markitdown.convert_iter(os.path.join(TEST_FILES_DIR, "random.bin")))
+
+
+def test_lazy_loading() -> None:
+    # Importing the package, and constructing MarkItDown, must not load the Magika
+    # model or any of the heavy optional dependencies
+    code = (
+        "import sys; from markitdown import MarkItDown; MarkItDown(); "
+        "print(','.join(m for m in ['magika', 'pandas', 'pdfminer', 'mammoth', 'pptx', 'bs4'] if m in sys.modules))"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert loaded == ""
+
+    # The Magika model is loaded once, and shared by all instances
+    from markitdown._markitdown import _get_magika
+
+    MarkItDown().convert_stream(io.BytesIO(b"Hello world"))
+    assert _get_magika() is _get_magika()
+
+
+def test_detection_policies() -> None:
+    # The magic-number sniffer identifies common containers, and the formats built on ZIP
+    for name, extension in [
+        ("test.pdf", ".pdf"),
+        ("test.docx", ".docx"),
+        ("test.xlsx", ".xlsx"),
+        ("test.pptx", ".pptx"),
+        ("test.epub", ".epub"),
+        ("test_files.zip", ".zip"),
+        ("test.jpg", ".jpg"),
+        ("test.xls", ".xls"),
+    ]:
+        with open(os.path.join(TEST_FILES_DIR, name), "rb") as fh:
+            sniffed = sniff_stream(fh)
+            assert fh.tell() == 0
+        assert sniffed is not None and extension in sniffed.extensions
+    assert sniff_stream(io.BytesIO(b"Hello world")) is None
+
+    docx_file = os.path.join(TEST_FILES_DIR, "test_with_comment.docx")
+    with open(docx_file, "rb") as fh:
+        docx_bytes = fh.read()
+
+    # "verify" skips magika when the sniffer confirms the hints, or there are none
+    markitdown = MarkItDown(detection_policy="verify")
+    validate_strings(markitdown.convert(docx_file), DOCX_COMMENT_TEST_STRINGS[0:2])
+    validate_strings(
+        markitdown.convert_stream(io.BytesIO(docx_bytes)),
+        DOCX_COMMENT_TEST_STRINGS[0:2],
+    )
+    assert markitdown.detection_timings["sniff"]["calls"] == 2
+    assert "magika" not in markitdown.detection_timings
+
+    # ... but not when they disagree
+    result = markitdown.convert_stream(
+        io.BytesIO(docx_bytes), stream_info=StreamInfo(extension=".pdf")
+    )
+    validate_strings(result, DOCX_COMMENT_TEST_STRINGS[0:2])
+    assert markitdown.detection_timings["magika"]["calls"] == 1
+
+    # "always_sniff" always runs magika
+    markitdown = MarkItDown(detection_policy="always_sniff")
+    markitdown.convert(docx_file)
+    assert markitdown.detection_timings["magika"]["calls"] == 1
+
+    # "trust_hints" uses the hints as-is, only detecting the charset of text
+    markitdown = MarkItDown(detection_policy="trust_hints")
+    result = markitdown.convert_stream(
+        io.BytesIO("Grüße".encode("utf-8")), stream_info=StreamInfo(extension=".txt")
+    )
+    assert "Grüße" in result.markdown
+    assert markitdown.detection_timings["charset"]["calls"] == 1
+    assert "magika" not in markitdown.detection_timings
+
+    with pytest.raises(ValueError):
+        MarkItDown(detection_policy="guess")
+
+
+def _make_pdf(page_texts, jpeg=None):
+    """Build a minimal PDF with one line of text per page (and, optionally, the same JPEG image on every page)."""
+    n = len(page_texts)
+    xobjects = b" /XObject << /Im0 %d 0 R >>" % (4 + 2 * n) if jpeg else b""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(n))
+        + b"] /Count %d >>" % n,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        content = b"BT /F1 24 Tf 72 720 Td (%s) Tj ET" % text.encode("ascii")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >>%s >> >>" % (5 + 2 * i, xobjects)
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+        )
+    if jpeg:
+        objects.append(
+            b"<< /Type /XObject /Subtype /Image /Width 1 /Height 1 /ColorSpace /DeviceRGB "
+            b"/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>\nstream\n%s\nendstream"
+            % (len(jpeg), jpeg)
+        )
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (i + 1, obj)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(objects) + 1)
+    pdf += b"startxref\n%d\n%%%%EOF\n" % xref
+    return pdf
+
+
+def test_pdf_page_selection() -> None:
+    pdf_bytes = _make_pdf([f"Page {i}" for i in range(10)])
+    markitdown = MarkItDown()
+
+    def convert(**kwargs):
+        return markitdown.convert_stream(io.BytesIO(pdf_bytes), **kwargs).markdown
+
+    # Sharding the pages across worker processes preserves their order
+    sequential = convert()
+    assert [f"Page {i}" in sequential for i in range(10)] == [True] * 10
+    assert convert(pdf_workers=3) == sequential
+
+    # Select pages by number (0-based), and/or limit their count
+    for kwargs in [{}, {"pdf_workers": 2}]:
+        markdown = convert(page_range=[7, 2, 3], **kwargs)
+        assert re.findall(r"Page \d", markdown) == ["Page 2", "Page 3", "Page 7"]
+
+        markdown = convert(page_range=range(4, 10), max_pages=2, **kwargs)
+        assert re.findall(r"Page \d", markdown) == ["Page 4", "Page 5"]
+
+        # An empty selection selects no pages
+        assert convert(page_range=[], **kwargs) == ""
+
+
+def test_mmap_input(tmp_path) -> None:
+    # Views of a MemoryViewStream share its buffer
+    buffer = bytearray(b"0123456789")
+    stream = MemoryViewStream(buffer)
+    stream.seek(2)
+    view = read_buffer(stream, 3)
+    assert bytes(view) == b"234" and stream.tell() == 5
+    buffer[2] = ord("x")
+    assert bytes(view) == b"x34"
+    assert stream.read() == b"56789"
+
+    # Uncompressed archive members are converted straight from the memory map
+    zip_path = str(tmp_path / "stored.zip")
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as z:
+        z.write(os.path.join(TEST_FILES_DIR, "test.docx"), "test.docx")
+        z.write(os.path.join(TEST_FILES_DIR, "test.xlsx"), "test.xlsx")
+        z.writestr("notes.txt", "Deflated notes " * 10, zipfile.ZIP_DEFLATED)
+
+    expected = MarkItDown().convert(zip_path).markdown
+    assert "## File: test.docx" in expected and "Deflated notes" in expected
+    assert MarkItDown(use_mmap=True).convert(zip_path).markdown == expected
+
+    # Images are sent for captioning straight from the memory map
+    image_path = os.path.join(TEST_FILES_DIR, "test_llm.jpg")
+    with open(image_path, "rb") as fh:
+        data_uri = "data:image/jpeg;base64," + base64.b64encode(fh.read()).decode()
+    client = MagicMock()
+    client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content="A caption"))]
+    )
+    result = MarkItDown(use_mmap=True, llm_client=client, llm_model="gpt-4o").convert(
+        image_path
+    )
+    assert "A caption" in result.markdown
+    messages = client.chat.completions.create.call_args[1]["messages"]
+    assert messages[0]["content"][1]["image_url"]["url"] == data_uri
+
+    # Empty files can't be memory-mapped, but are still converted
+    empty_path = str(tmp_path / "empty.txt")
+    open(empty_path, "wb").close()
+    assert MarkItDown(use_mmap=True).convert(empty_path).markdown == ""
+
+
+def test_spooled_input(tmp_path) -> None:
+    # Small inputs stay in memory, larger ones spill to disk
+    with spool_chunks([b"abc", b"def"], spool_threshold=4) as spooled:
+        assert not isinstance(spooled, io.BytesIO)
+        assert spooled.read() == b"abcdef"
+    with spool_chunks([b"abc"], spool_threshold=4) as spooled:
+        assert isinstance(spooled, io.BytesIO)
+
+    # Non-seekable streams are spooled before conversion
+    class NonSeekableStream(io.RawIOBase):
+        def __init__(self, data):
+            self._data = io.BytesIO(data)
+
+        def readable(self):
+            return True
+
+        def readinto(self, b):
+            return self._data.readinto(b)
+
+    docx_file = os.path.join(TEST_FILES_DIR, "test_with_comment.docx")
+    with open(docx_file, "rb") as fh:
+        docx_bytes = fh.read()
+    markitdown = MarkItDown(spool_threshold=1024)
+    result = markitdown.convert_stream(NonSeekableStream(docx_bytes))
+    validate_strings(result, DOCX_COMMENT_TEST_STRINGS[0:2])
+
+    # Inputs over the maximum size are rejected, however they are provided
+    markitdown = MarkItDown(max_input_size=1024)
+    with pytest.raises(InputTooLargeException):
+        markitdown.convert(docx_file)
+    with pytest.raises(InputTooLargeException):
+        markitdown.convert_stream(io.BytesIO(docx_bytes))
+    with pytest.raises(InputTooLargeException):
+        markitdown.convert_stream(NonSeekableStream(docx_bytes))
+    assert markitdown.convert_stream(io.BytesIO(b"Small enough")).markdown
+
+
+def test_async_conversion() -> None:
+    class SlowConverter(DocumentConverter):
+        def accepts(self, file_stream, stream_info, **kwargs):
+            return (stream_info.extension or "") == ".slow"
+
+        def convert(self, file_stream, stream_info, **kwargs):
+            time.sleep(0.5)
+            return DocumentConverterResult(markdown="Slow")
+
+    markitdown = MarkItDown(max_async_workers=2)
+    markitdown.register_converter(SlowConverter())
+    docx_file = os.path.join(TEST_FILES_DIR, "test_with_comment.docx")
+
+    async def convert_all():
+        try:
+            with open(docx_file, "rb") as fh:
+                results = await asyncio.gather(
+                    markitdown.aconvert(docx_file),
+                    markitdown.aconvert_stream(fh),
+                    markitdown.aconvert_uri("data:text/plain;base64,SGVsbG8="),
+                )
+            for result in results[0:2]:
+                validate_strings(result, DOCX_COMMENT_TEST_STRINGS[0:2])
+            assert results[2].markdown == "Hello"
+
+            # Conversions run off the event loop, so they can time out
+            with pytest.raises(asyncio.TimeoutError):
+                await markitdown.aconvert_stream(
+                    io.BytesIO(b"..."),
+                    stream_info=StreamInfo(extension=".slow"),
+                    timeout=0.05,
+                )
+        finally:
+            await markitdown.aclose()
+
+    asyncio.run(convert_all())
+
+
+def test_extract_attachments() -> None:
+    markitdown = MarkItDown()
+
+    # Images are returned as attachments, and referenced by name
+    result = markitdown.convert(
+        os.path.join(TEST_FILES_DIR, "test.pptx"), extract_attachments=True
+    )
+    assert [a.name for a in result.attachments] == ["image1.jpg", "image2.jpg"]
+    assert "](image1.jpg)" in result.markdown and "base64" not in result.markdown
+    assert result.attachments[0].read().startswith(b"\xff\xd8\xff")
+
+    result = markitdown.convert(
+        os.path.join(TEST_FILES_DIR, "test.docx"), extract_attachments=True
+    )
+    assert len(result.attachments) == 1
+    assert f"]({result.attachments[0].name})" in result.markdown
+    assert result.attachments[0].read().startswith(b"\x89PNG")
+
+    # Identical data URIs are extracted once
+    png_data_uri = "data:image/png;base64," + base64.b64encode(b"\x89PNG").decode()
+    html = f'<html><body><img src="{png_data_uri}"><img src="{png_data_uri}"></body></html>'
+    result = markitdown.convert_stream(
+        io.BytesIO(html.encode("utf-8")),
+        stream_info=StreamInfo(extension=".html"),
+        extract_attachments=True,
+    )
+    assert result.markdown == "![](image1.png)![](image1.png)"
+    assert len(result.attachments) == 1
+
+    # JPEG images are extracted from PDFs, and survive pickling (e.g., from worker processes)
+    with open(os.path.join(TEST_FILES_DIR, "test.jpg"), "rb") as fh:
+        jpeg = fh.read()
+    pdf_bytes = _make_pdf(["Page 0", "Page 1"], jpeg=jpeg)
+    for pdf_workers in [1, 2]:
+        result = markitdown.convert_stream(
+            io.BytesIO(pdf_bytes), extract_attachments=True, pdf_workers=pdf_workers
+        )
+        assert result.markdown.count("![Im0](image1.jpg)") == 2
+        (attachment,) = pickle.loads(pickle.dumps(result.attachments))
+        assert (attachment.name, attachment.mimetype) == ("image1.jpg", "image/jpeg")
+        assert attachment.read() == jpeg
+
+    # Without extract_attachments, nothing changes
+    result = markitdown.convert_stream(io.BytesIO(pdf_bytes))
+    assert result.attachments == [] and "Im0" not in result.markdown
+
+
+def test_resource_downloader(tmp_path) -> None:
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(self.path)
+            if self.path.endswith("large.png"):
+                body = b"\x89PNG" + b"\0" * 2048
+            else:
+                body = b"\x89PNG" + self.path.encode("ascii")
+            etag = '"%s"' % self.path.strip("/")
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        downloader = ResourceDownloader(max_size=1024, cache=HttpCache(str(tmp_path)))
+        urls = [f"{base_url}/{i}.png" for i in range(10)] + [f"{base_url}/large.png"]
+
+        # Downloads are concurrent, deduplicated, and bounded in size
+        results = downloader.download_many(urls + urls[0:2])
+        assert list(results) == urls
+        assert all(
+            results[url].content == b"\x89PNG/%d.png" % i
+            for i, url in enumerate(urls[0:10])
+        )
+        assert not results[urls[-1]].ok
+        assert len(requests_seen) == 11
+
+        # Cached responses are revalidated with their ETag, rather than downloaded again
+        result = downloader.download(urls[0])
+        assert result.from_cache and result.content == b"\x89PNG/0.png"
+        assert result.mimetype == "image/png"
+        downloader.close()
+
+        # MarkItDown downloads the images of HTML documents into attachments
+        html = '<html><body><img src="/1.png"><img src="http://127.0.0.1:1/missing.png"></body></html>'
+        markitdown = MarkItDown(
+            resource_downloader=ResourceDownloader(timeout=5, retries=0)
+        )
+        result = markitdown.convert_stream(
+            io.BytesIO(html.encode("utf-8")),
+            stream_info=StreamInfo(extension=".html", url=base_url + "/page.html"),
+            extract_attachments=True,
+            download_images=True,
+        )
+        assert result.markdown == "![](image1.png)![](http://127.0.0.1:1/missing.png)"
+        assert result.attachments[0].read() == b"\x89PNG/1.png"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_http_fetch_cache(tmp_path) -> None:
+    requests_seen = []
+    failures = {"count": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append((self.path, self.headers.get("If-None-Match")))
+            if self.path == "/flaky.html" and failures["count"] < 2:
+                failures["count"] += 1
+                self.send_response(503)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = b"<html><body><h1>Title</h1><p>%s</p></body></html>" % (
+                self.path.encode("ascii")
+            )
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            if self.path == "/fresh.html":
+                self.send_header("Cache-Control", "max-age=3600")
+            else:
+                self.send_header("ETag", '"v1"')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        cache = HttpCache(str(tmp_path / "http"))
+        fetcher = HttpFetcher(cache=cache, backoff_factor=0)
+        markitdown = MarkItDown(http_fetcher=fetcher)
+
+        # Stale responses are revalidated with their ETag, and served from the cache
+        first = markitdown.convert_uri(base_url + "/page.html")
+        second = markitdown.convert_uri(base_url + "/page.html")
+        assert first.markdown == second.markdown == "# Title\n\n/page.html"
+        assert requests_seen == [("/page.html", None), ("/page.html", '"v1"')]
+        assert (cache.misses, cache.revalidations) == (1, 1)
+        with fetcher.open(base_url + "/page.html") as fetched:
+            assert fetched.from_cache
+            assert fetched.headers["content-type"] == "text/html; charset=utf-8"
+
+        # Fresh responses are served from the cache without a request
+        requests_seen.clear()
+        for _ in range(2):
+            result = markitdown.convert_uri(base_url + "/fresh.html")
+            assert result.markdown == "# Title\n\n/fresh.html"
+        assert requests_seen == [("/fresh.html", None)] and cache.hits == 1
+
+        # 503 responses are retried
+        requests_seen.clear()
+        result = markitdown.convert_uri(base_url + "/flaky.html")
+        assert result.markdown == "# Title\n\n/flaky.html"
+        assert len(requests_seen) == 3
+        failures["count"] = 0
+        with pytest.raises(requests.HTTPError):
+            MarkItDown(
+                http_fetcher=HttpFetcher(retries=1, backoff_factor=0)
+            ).convert_uri(base_url + "/flaky.html")
+
+        # The size of the cache is bounded
+        small_cache = HttpCache(str(tmp_path / "small"), max_disk_bytes=100)
+        small_fetcher = HttpFetcher(cache=small_cache)
+        for path in ["/page.html", "/fresh.html"]:
+            with small_fetcher.open(base_url + path) as fetched:
+                fetched.stream.read()
+        assert small_cache.evictions == 1
+        assert small_cache.lookup(base_url + "/page.html") is None
+        assert small_cache.lookup(base_url + "/fresh.html") is not None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_streaming_spreadsheets() -> None:
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "Data"
+    workbook.active.append(["Id", "Name", "Score"])
+    for i in range(50):
+        workbook.active.append([i, f"Name {i}", i * 2])
+    workbook.create_sheet("Other").append(["A", "B"])
+    workbook["Other"].append(["x", "y"])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    xlsx_bytes = buffer.getvalue()
+
+    markitdown = MarkItDown()
+
+    def convert(**kwargs):
+        return markitdown.convert_stream(io.BytesIO(xlsx_bytes), **kwargs).markdown
+
+    # The streaming engine renders the same tables as the pandas engine
+    assert convert(spreadsheet_engine="streaming") == convert()
+    for xls_file in ["test.xlsx", "test.xls"]:
+        path = os.path.join(TEST_FILES_DIR, xls_file)
+        assert (
+            markitdown.convert(path, spreadsheet_engine="streaming").markdown
+            == markitdown.convert(path).markdown
+        )
+
+    for engine in ["pandas", "streaming"]:
+        # Sheets can be selected, and the number of rows limited...
+        markdown = convert(
+            spreadsheet_engine=engine, sheet_names=["Data"], max_rows_per_sheet=5
+        )
+        assert "## Other" not in markdown
+        assert "| 4 | Name 4 | 8 |" in markdown and "Name 5" not in markdown
+        assert markdown.endswith("*Only the first 5 rows of this sheet are shown.*")
+
+        # ...or sampled (reproducibly, in their original order)
+        markdown = convert(
+            spreadsheet_engine=engine, sheet_names=["Data"], sample_rows_per_sheet=10
+        )
+        ids = [int(line.split(" | ")[0][2:]) for line in markdown.splitlines()[3:13]]
+        assert len(ids) == 10 and ids == sorted(ids)
+        assert markdown.endswith(
+            "*A sample of 10 of the 50 rows of this sheet is shown.*"
+        )
+        assert markdown == convert(
+            spreadsheet_engine=engine, sheet_names=["Data"], sample_rows_per_sheet=10
+        )
+
+        # ...or both, in which case the sample is of the first rows
+        markdown = convert(
+            spreadsheet_engine=engine,
+            sheet_names=["Data"],
+            max_rows_per_sheet=20,
+            sample_rows_per_sheet=10,
+        )
+        ids = [int(line.split(" | ")[0][2:]) for line in markdown.splitlines()[3:13]]
+        assert len(ids) == 10 and max(ids) < 20
+        assert markdown.endswith(
+            "*A sample of 10 of the first 20 rows of this sheet is shown.*"
+        )
+
+    with pytest.raises(FileConversionException):
+        convert(spreadsheet_engine="unknown")
+
+
+def test_markdown_table_writer() -> None:
+    writer = MarkdownTableWriter()
+    rows = [["Name", "Notes"], ["a_b", "x | y\n  z"], [None, 1.5, ""], ["only"]]
+    assert writer.render(rows) == (
+        "| Name | Notes |\n"
+        "| --- | --- |\n"
+        "| a\\_b | x \\| y z |\n"
+        "|  | 1.5 |\n"
+        "| only |  |"
+    )
+
+    # Lines are written as the rows are read
+    lines = writer.iter_lines(iter(rows))
+    assert next(lines) == "| Name | Notes |" and next(lines) == "| --- | --- |"
+    assert list(MarkdownTableWriter().iter_lines([])) == []
+
+    # Rows wider than the header widen rendered tables, and are truncated when streamed
+    assert writer.render([["a"], ["1", "2"]]) == "| a |  |\n| --- | --- |\n| 1 | 2 |"
+    assert list(writer.iter_lines([["a"], ["1", "2"]]))[-1] == "| 1 |"
+
+    writer = MarkdownTableWriter(escape_markdown=False, line_break="<br>", align=True)
+    assert writer.render([["a", "b"], ["*x*", "1\n2"], ["long cell"]]) == (
+        "| a         | b      |\n"
+        "| --------- | ------ |\n"
+        "| *x*       | 1<br>2 |\n"
+        "| long cell |        |"
+    )
+
+    # CSV cells with pipes and line breaks no longer break the table
+    markitdown = MarkItDown()
+    result = markitdown.convert_stream(
+        io.BytesIO(b'a,b\n"1|2","line 1\nline 2",extra\n3\n'),
+        stream_info=StreamInfo(extension=".csv", charset="utf-8"),
+    )
+    assert result.markdown == (
+        "| a | b |\n| --- | --- |\n| 1\\|2 | line 1 line 2 |\n| 3 |  |"
+    )
+
+
+def test_streaming_csv() -> None:
+    markitdown = MarkItDown()
+    csv_bytes = "名前;値\n" + "".join(f"項目{i};{i}\n" for i in range(2500))
+    stream_info = StreamInfo(extension=".csv")
+
+    # The charset is detected from the start of the file, and the table is written
+    # in chunks of rows
+    lines = markitdown.convert_stream(
+        io.BytesIO(csv_bytes.encode("cp932")),
+        stream_info=stream_info,
+        csv_dialect="sniff",
+    ).markdown.splitlines()
+    assert lines[:3] == ["| 名前 | 値 |", "| --- | --- |", "| 項目0 | 0 |"]
+    assert len(lines) == 2502
+    chunks = list(
+        markitdown.convert_iter(
+            io.BytesIO(csv_bytes.encode("utf-8")),
+            stream_info=stream_info,
+            csv_dialect="sniff",
+        )
+    )
+    assert len(chunks) > 1
+    assert "".join(chunks).splitlines()[-1] == "| 項目2499 | 2499 |"
+
+    # Row limits, and dialects
+    result = markitdown.convert_stream(
+        io.BytesIO(b"a\tb\n1\t2\n3\t4\n5\t6\n"),
+        stream_info=stream_info,
+        csv_dialect="excel-tab",
+        max_rows=2,
+    )
+    assert result.markdown == (
+        "| a | b |\n| --- | --- |\n| 1 | 2 |\n| 3 | 4 |\n\n"
+        "*Only the first 2 rows of this file are shown.*"
+    )
+    result = markitdown.convert_stream(
+        io.BytesIO(b"a,b\n1,2\n"), stream_info=stream_info, max_rows=1
+    )
+    assert result.markdown == "| a | b |\n| --- | --- |\n| 1 | 2 |"
+
+
+def test_charset_detector() -> None:
+    # The first lines are ASCII, but the file is not: the middle and the end of
+    # the file are sampled too
+    text = "".join(f"line {i}\n" for i in range(5000))
+    text += "日本語のテキストです。今日は良い天気ですね。\n" * 20
+    assert CharsetDetector(windows=1).detect(io.BytesIO(text.encode())) == "ascii"
+    assert CharsetDetector().detect(io.BytesIO(text.encode())) == "utf-8"
+    assert CharsetDetector().detect(io.BytesIO(text.encode("cp932"))) == "cp932"
+
+    # The verdict is recorded on the stream info, and the position is restored
+    stream = io.BytesIO(b"xx" + "日本語のテキスト\n".encode("utf-8") * 1000)
+    stream.seek(2)
+    stream_info = CharsetDetector(window_size=512).detect_stream_info(
+        stream, StreamInfo(extension=".txt")
+    )
+    assert stream_info.charset == "utf-8" and stream.tell() == 2
+    with pytest.raises(ValueError):
+        CharsetDetector(windows=0)
+
+    # Text is decoded incrementally, with the detected charset
+    markitdown = MarkItDown(charset_detector=CharsetDetector(window_size=1024))
+    result = markitdown.convert_stream(
+        io.BytesIO(text.encode()), stream_info=StreamInfo(extension=".txt")
+    )
+    assert result.markdown.endswith("今日は良い天気ですね。\n")
+    text *= 20
+    chunks = list(
+        PlainTextConverter().convert_iter(io.BytesIO(text.encode()), StreamInfo())
+    )
+    assert len(chunks) > 1 and "".join(chunks) == text
+
+
+def test_pptx_captioning_and_slide_range() -> None:
+    pptx = pytest.importorskip("pptx")
+    from PIL import Image
+
+    # A deck of 6 slides, showing 3 distinct images (each on two slides)
+    images = []
+    for color in ["red", "green", "blue"]:
+        buffer = io.BytesIO()
+        Image.new("RGB", (8, 8), color).save(buffer, format="PNG")
+        images.append(buffer.getvalue())
+    presentation = pptx.Presentation()
+    for i in range(6):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+        slide.shapes.title.text = f"Slide {i + 1}"
+        slide.shapes.add_picture(io.BytesIO(images[i % 3]), 0, 0)
+    deck = io.BytesIO()
+    presentation.save(deck)
+
+    # A slow LLM client, which records the number of concurrent requests
+    lock = threading.Lock()
+    calls, active, max_active = [], [0], [0]
+
+    def create(model, messages):
+        url = messages[0]["content"][1]["image_url"]["url"]
+        with lock:
+            calls.append(url)
+            active[0] += 1
+            max_active[0] = max(max_active[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        caption = f"Caption {images.index(base64.b64decode(url.split(',')[1]))}"
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=caption))])
+
+    client = MagicMock()
+    client.chat.completions.create.side_effect = create
+    markitdown = MarkItDown(llm_client=client, llm_model="gpt-4o")
+
+    # Each distinct image is captioned once, concurrently with caption_workers
+    deck.seek(0)
+    result = markitdown.convert_stream(deck, caption_workers=4)
+    assert len(calls) == 3 and max_active[0] > 1
+    for i in range(6):
+        assert f"# Slide {i + 1}" in result.markdown
+        assert f"![Caption {i % 3}" in result.markdown
+
+    # Only the selected slides are converted (and their images captioned)
+    calls.clear()
+    deck.seek(0)
+    result = markitdown.convert_stream(deck, slide_range=[1, 4, 10])
+    assert len(calls) == 1
+    assert result.markdown.startswith("<!-- Slide number: 2 -->\n")
+    assert "# Slide 2" in result.markdown
+    assert "<!-- Slide number: 5 -->" in result.markdown
+    assert "Slide 1\n" not in result.markdown and "Slide 6" not in result.markdown
+
+
 if __name__ == "__main__":
     """Runs this file's tests from the command line."""
     for test in [
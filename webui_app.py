@@ -0,0 +1,1112 @@
+import gradio as gr
+from markitdown import MarkItDown, ResourceDownloader, HttpCache
+import os
+import zipfile
+import re
+import base64
+import shutil
+import tempfile
+import mimetypes
+import json
+import base64
+import hashlib
+import io
+import threading
+import collections
+import asyncio
+import random
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from cryptography.fernet import Fernet
+from webui_pdf_render import render_pdf_pages
+
+# 設定ファイルのパス
+CONFIG_FILE = "config.json"
+
+def generate_key():
+    """暗号化キーを生成（マシン固有のキーを使用）"""
+    machine_id = hashlib.sha256(os.environ.get('COMPUTERNAME', 'default').encode()).digest()
+    return base64.urlsafe_b64encode(machine_id[:32])
+
+def encrypt_data(data, key):
+    """データを暗号化"""
+    fernet = Fernet(key)
+    return fernet.encrypt(data.encode()).decode()
+
+def decrypt_data(encrypted_data, key):
+    """データを復号化"""
+    try:
+        fernet = Fernet(key)
+        return fernet.decrypt(encrypted_data.encode()).decode()
+    except:
+        return ""
+
+def save_config(gemini_api_key, selected_model):
+    """設定をファイルに保存"""
+    key = generate_key()
+    config = {
+        "gemini_api_key": encrypt_data(gemini_api_key, key) if gemini_api_key else "",
+        "selected_model": selected_model
+    }
+    with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+
+def load_config():
+    """設定をファイルから読み込み"""
+    if not os.path.exists(CONFIG_FILE):
+        return "", "gemini-pro-vision"
+    
+    try:
+        key = generate_key()
+        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        
+        api_key = decrypt_data(config.get("gemini_api_key", ""), key) if config.get("gemini_api_key") else ""
+        selected_model = config.get("selected_model", "gemini-pro-vision")
+        
+        return api_key, selected_model
+    except Exception as e:
+        print(f"設定読み込みエラー: {e}")
+        return "", "gemini-pro-vision"
+
+# PDFページ画像の設定（環境変数で変更可能）
+# - MARKITDOWN_WEBUI_PDF_DPI: 解像度（既定値: 144、72 DPIの2倍）
+# - MARKITDOWN_WEBUI_PDF_IMAGE_FORMAT: 画像形式（png, jpeg, webp。既定値: png）
+# - MARKITDOWN_WEBUI_PDF_IMAGE_QUALITY: JPEG/WebPの品質（1-100。既定値: 85）
+# - MARKITDOWN_WEBUI_PDF_WORKERS: レンダリングに使うプロセス数（既定値: CPU数）
+PDF_IMAGE_DPI = int(os.environ.get("MARKITDOWN_WEBUI_PDF_DPI", 144))
+PDF_IMAGE_FORMAT = os.environ.get("MARKITDOWN_WEBUI_PDF_IMAGE_FORMAT", "png").lower()
+PDF_IMAGE_QUALITY = int(os.environ.get("MARKITDOWN_WEBUI_PDF_IMAGE_QUALITY", 85))
+PDF_RENDER_WORKERS = int(os.environ.get("MARKITDOWN_WEBUI_PDF_WORKERS", os.cpu_count() or 4))
+
+PDF_IMAGE_MIME_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+# 1つのタスクでレンダリングするページ数
+PDF_PAGES_PER_TASK = 4
+
+# 全ジョブで共有するレンダリング用のプロセスプール（初回使用時に作成）
+# ワーカーで実行する render_pdf_pages は、fitz/PIL だけを読み込む webui_pdf_render モジュールにある
+pdf_render_executor = None
+pdf_render_executor_lock = threading.Lock()
+
+def get_pdf_render_executor():
+    """レンダリング用のプロセスプールを返す"""
+    global pdf_render_executor
+    with pdf_render_executor_lock:
+        if pdf_render_executor is None:
+            pdf_render_executor = ProcessPoolExecutor(max_workers=PDF_RENDER_WORKERS)
+        return pdf_render_executor
+
+def extract_page_images_from_pdf(pdf_path, dpi=None, image_format=None, quality=None, page_range=None):
+    """Render each page of a PDF as a single image using PyMuPDF, across a process pool
+
+    Pages are yielded lazily and in order, as raw image bytes, as soon as they are rendered,
+    with a bounded number of pages in flight (so that all pages are never held in memory at once).
+    page_range optionally selects the pages (1-based) to render.
+    """
+    dpi = dpi or PDF_IMAGE_DPI
+    image_format = image_format or PDF_IMAGE_FORMAT
+    quality = quality or PDF_IMAGE_QUALITY
+    if image_format not in PDF_IMAGE_MIME_TYPES:
+        print(f"Unsupported PDF image format: {image_format}")
+        return
+    mime_type = PDF_IMAGE_MIME_TYPES[image_format]
+    
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        print("PyMuPDF (fitz) is not installed. Please install it with: pip install pymupdf")
+        return
+    
+    try:
+        with fitz.open(pdf_path) as doc:
+            page_count = len(doc)
+    except Exception as e:
+        print(f"Error extracting page images from PDF: {e}")
+        return
+    
+    page_numbers = list(range(page_count))
+    if page_range is not None:
+        selected_pages = set(page_range)
+        page_numbers = [n for n in page_numbers if n + 1 in selected_pages]
+    tasks = [page_numbers[i:i + PDF_PAGES_PER_TASK] for i in range(0, len(page_numbers), PDF_PAGES_PER_TASK)]
+    
+    pending = collections.deque()
+    try:
+        if len(tasks) <= 1 or PDF_RENDER_WORKERS <= 1:
+            # ページが少ない場合はプロセスプールを使わずにレンダリングする
+            results = (render_pdf_pages(pdf_path, task, dpi, image_format, quality) for task in tasks)
+        else:
+            executor = get_pdf_render_executor()
+            
+            def iter_results():
+                # 順番を保ちながら、投入中のタスク数をワーカー数の2倍までに制限する
+                next_task = 0
+                while next_task < len(tasks) or pending:
+                    while next_task < len(tasks) and len(pending) < 2 * PDF_RENDER_WORKERS:
+                        pending.append(executor.submit(render_pdf_pages, pdf_path, tasks[next_task], dpi, image_format, quality))
+                        next_task += 1
+                    yield pending.popleft().result()
+            
+            results = iter_results()
+        
+        for rendered in results:
+            for page_num, img_data in rendered:
+                yield {
+                    'data': img_data,
+                    'mime_type': mime_type,
+                    'page': page_num + 1
+                }
+    except Exception as e:
+        print(f"Error extracting page images from PDF: {e}")
+    finally:
+        # 途中で終了した場合は、未着手のタスクを取り消す
+        for future in pending:
+            future.cancel()
+
+def check_image_file(file_obj):
+    """画像ファイルがアップロードされたかチェックし、警告メッセージを返す"""
+    if not file_obj:
+        return ""
+    
+    file_path = file_obj.name
+    file_extension = os.path.splitext(file_path)[1].lower()
+    
+    if file_extension in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']:
+        warning_message = "⚠️ 警告: 画像ファイルが検出されました\n"
+        warning_message += "画像ファイルはLLM（Google Geminiなど）に送信され、画像の説明が生成されます\n"
+        warning_message += "プライバシーに配慮が必要な画像の場合は変換を中止してください\n\n"
+        return warning_message
+    
+    return ""
+
+def get_available_models(gemini_api_key):
+    """利用可能なGeminiモデルリストを取得"""
+    if not gemini_api_key:
+        return gr.Dropdown(choices=["gemini-pro-vision"], value="gemini-pro-vision")
+    
+    try:
+        import google.generativeai as genai
+        genai.configure(api_key=gemini_api_key)
+        models = genai.list_models()
+        available_models = []
+        for model in models:
+            if 'generateContent' in model.supported_generation_methods:
+                available_models.append(model.name.split('/')[-1])
+        
+        if available_models:
+            # 画像処理に適したモデルを優先的に選択
+            preferred_models = [model for model in available_models if 'vision' in model.lower() or 'flash' in model.lower()]
+            default_model = preferred_models[0] if preferred_models else available_models[0]
+            return gr.Dropdown(choices=available_models, value=default_model)
+        else:
+            return gr.Dropdown(choices=["gemini-pro-vision"], value="gemini-pro-vision")
+    except Exception as e:
+        print(f"モデルリスト取得エラー: {e}")
+        return gr.Dropdown(choices=["gemini-pro-vision"], value="gemini-pro-vision")
+
+def transcribe_audio(file_path, audio_format):
+    """音声ファイルを文字起こしする"""
+    try:
+        import speech_recognition as sr
+        import pydub
+    except ImportError as e:
+        return f"音声文字起こしに必要なライブラリがインストールされていません: {e}"
+    
+    try:
+        # 音声ファイルを読み込む
+        if audio_format in ["wav", "aiff", "flac"]:
+            audio_source = open(file_path, "rb")
+        elif audio_format in ["mp3", "mp4", "m4a", "ogg", "flac", "aac"]:
+            audio_segment = pydub.AudioSegment.from_file(file_path, format=audio_format)
+            audio_source = io.BytesIO()
+            audio_segment.export(audio_source, format="wav")
+            audio_source.seek(0)
+        else:
+            return f"サポートされていない音声形式: {audio_format}"
+        
+        # 音声認識を実行
+        recognizer = sr.Recognizer()
+        with sr.AudioFile(audio_source) as source:
+            audio = recognizer.record(source)
+            transcript = recognizer.recognize_google(audio, language="ja-JP").strip()
+        
+        if audio_format not in ["wav", "aiff", "flac"]:
+            audio_source.close()
+        
+        return "[音声が検出されませんでした]" if transcript == "" else transcript
+        
+    except sr.UnknownValueError:
+        return "音声を認識できませんでした"
+    except sr.RequestError as e:
+        return f"音声認識サービスでエラーが発生しました: {e}"
+    except Exception as e:
+        return f"音声文字起こし中にエラーが発生しました: {e}"
+
+# Geminiによる画像の説明の設定（環境変数で変更可能）
+# - MARKITDOWN_WEBUI_CAPTION_CONCURRENCY: Gemini APIへの同時リクエスト数（既定値: 4）
+# - MARKITDOWN_WEBUI_CAPTION_RPM: 1分あたりの最大リクエスト数（既定値: 0 = 制限なし）
+# - MARKITDOWN_WEBUI_CAPTION_BATCH_SIZE: 1リクエストにまとめる画像の最大数（既定値: 4）
+# - MARKITDOWN_WEBUI_CAPTION_RETRIES: 利用制限などのエラー時の再試行回数（既定値: 5）
+# - MARKITDOWN_WEBUI_CAPTION_CACHE_DIR: 説明のキャッシュのディレクトリ（既定値: 一時ディレクトリ内）
+CAPTION_CONCURRENCY = int(os.environ.get("MARKITDOWN_WEBUI_CAPTION_CONCURRENCY", 4))
+CAPTION_RPM = float(os.environ.get("MARKITDOWN_WEBUI_CAPTION_RPM", 0))
+CAPTION_BATCH_SIZE = int(os.environ.get("MARKITDOWN_WEBUI_CAPTION_BATCH_SIZE", 4))
+CAPTION_RETRIES = int(os.environ.get("MARKITDOWN_WEBUI_CAPTION_RETRIES", 5))
+CAPTION_CACHE_DIR = os.environ.get("MARKITDOWN_WEBUI_CAPTION_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "markitdown_webui_captions")
+# 再試行の待ち時間の上限（秒）
+CAPTION_MAX_BACKOFF = 60
+
+# 画像ファイルの説明に使うプロンプト
+IMAGE_DESCRIPTION_PROMPT = "この画像を詳細に説明してください。画像に含まれるテキストがあればOCRで抽出し、画像の内容を詳しく説明してください。"
+# 文書内の画像の説明（Markdownの代替テキスト）に使うプロンプト
+DOCUMENT_IMAGE_PROMPT = "この画像の内容を1〜2文で簡潔に説明してください。画像に含まれる重要なテキストがあれば含めてください。"
+
+# JSON形式の応答に対応していないため、画像を1枚ずつ送るモデル（名前の先頭で判定）
+SINGLE_IMAGE_MODEL_PREFIXES = ("gemini-pro-vision", "gemini-1.0")
+# Geminiにそのまま送れる画像形式（それ以外はPNGに変換して送る）
+GEMINI_IMAGE_MIME_TYPES = {"image/png", "image/jpeg", "image/webp", "image/heic", "image/heif"}
+
+def is_retryable_gemini_error(e):
+    """利用制限（429）や一時的なサーバーエラーなど、再試行すべきエラーかどうか"""
+    if type(e).__name__ in ("ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError", "DeadlineExceeded"):
+        return True
+    message = str(e).lower()
+    return "429" in message or "quota" in message or "rate limit" in message
+
+def to_gemini_image_part(image_data):
+    """画像をGeminiに送る形式（mime_typeとdataの辞書）にする"""
+    extension = detect_image_extension(image_data)
+    mime_type = mimetypes.guess_type("image" + extension)[0] if extension else None
+    if mime_type in GEMINI_IMAGE_MIME_TYPES:
+        return {"mime_type": mime_type, "data": image_data}
+    
+    import PIL.Image
+    with PIL.Image.open(io.BytesIO(image_data)) as img:
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG")
+    return {"mime_type": "image/png", "data": buffer.getvalue()}
+
+class CaptionCache:
+    """生成した画像の説明をディスクに保存するキャッシュ（キーは画像のSHA-256・モデル・プロンプト）"""
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def make_key(image_data, model_name, prompt):
+        image_hash = hashlib.sha256(image_data).hexdigest()
+        return hashlib.sha256("\0".join([image_hash, model_name, prompt]).encode("utf-8")).hexdigest()
+    
+    def _get_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+    
+    def get(self, key):
+        try:
+            with open(self._get_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)["caption"]
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def put(self, key, caption):
+        path = self._get_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 読み込み中のスレッドが書きかけのファイルを読まないよう、一時ファイルに書いてから置き換える
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"caption": caption}, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except OSError as e:
+            print(f"画像の説明をキャッシュに保存できませんでした: {e}")
+
+CaptionRequest = collections.namedtuple("CaptionRequest", ["api_key", "model_name", "prompt", "image_part", "key", "future"])
+
+class GeminiCaptionService:
+    """Google Geminiで画像の説明を生成するサービス（全リクエストで共有する）
+
+    - リクエストは専用スレッドのイベントループ上の非同期キューに入れ、concurrency個のワーカーで処理する
+      （同時リクエスト数と、requests_per_minuteを指定した場合は1分あたりのリクエスト数を制限する）
+    - 利用制限（429）などのエラーは、指数バックオフ（ジッター付き）で再試行する
+    - 生成した説明は、画像のハッシュ・モデル・プロンプトをキーにディスクへキャッシュする
+      （処理中の同じ画像も、1度だけリクエストする）
+    - 対応するモデルでは、キューに溜まった同じモデル・プロンプトの画像を最大batch_size枚ずつ1リクエストにまとめる
+    submit()はどのスレッドからでも呼べ、説明を結果とするconcurrent.futures.Futureを返す。
+    """
+    def __init__(self, concurrency=4, requests_per_minute=0, batch_size=4, retries=5, cache_dir=None):
+        self.concurrency = max(1, concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.batch_size = max(1, batch_size)
+        self.retries = retries
+        self.cache = CaptionCache(cache_dir) if cache_dir else None
+        
+        self._lock = threading.Lock()
+        self._loop = None
+        self._queue = None
+        self._in_flight = {}  # キャッシュのキー → Future
+        self._models = {}  # モデル名 → GenerativeModel（イベントループのスレッドからのみ使う）
+        self._configured_api_key = None
+        self._next_request_time = 0.0
+    
+    def submit(self, api_key, model_name, image_data, prompt):
+        """画像の説明の生成を依頼し、Futureを返す"""
+        key = CaptionCache.make_key(image_data, model_name, prompt)
+        caption = self.cache.get(key) if self.cache else None
+        future = concurrent.futures.Future()
+        if caption is not None:
+            future.set_result(caption)
+            return future
+        
+        with self._lock:
+            if key in self._in_flight:
+                return self._in_flight[key]
+            self._in_flight[key] = future
+        try:
+            request = CaptionRequest(api_key, model_name, prompt, to_gemini_image_part(image_data), key, future)
+            loop = self._get_loop()
+        except BaseException:
+            with self._lock:
+                del self._in_flight[key]
+            raise
+        loop.call_soon_threadsafe(self._queue.put_nowait, request)
+        return future
+    
+    def caption(self, api_key, model_name, image_data, prompt):
+        """画像の説明を生成する（生成されるまで待つ）"""
+        return self.submit(api_key, model_name, image_data, prompt).result()
+    
+    def get_batch_size(self, model_name):
+        """1リクエストにまとめる画像の最大数"""
+        return 1 if model_name.startswith(SINGLE_IMAGE_MODEL_PREFIXES) else self.batch_size
+    
+    def _get_loop(self):
+        """イベントループとワーカーを（初回のみ）専用スレッドで起動する"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                
+                def run():
+                    asyncio.set_event_loop(loop)
+                    self._queue = asyncio.Queue()
+                    for _ in range(self.concurrency):
+                        loop.create_task(self._worker())
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+                
+                threading.Thread(target=run, name="webui-caption", daemon=True).start()
+                started.wait()
+                self._loop = loop
+            return self._loop
+    
+    async def _worker(self):
+        while True:
+            batch = [await self._queue.get()]
+            
+            # キューに溜まっている、同じAPIキー・モデル・プロンプトの画像をまとめる
+            others = []
+            batch_size = self.get_batch_size(batch[0].model_name)
+            while len(batch) < batch_size and not self._queue.empty():
+                request = self._queue.get_nowait()
+                if request[:3] == batch[0][:3]:
+                    batch.append(request)
+                else:
+                    others.append(request)
+            for request in others:
+                self._queue.put_nowait(request)
+            
+            try:
+                captions = await self._caption_batch(batch)
+            except Exception as e:
+                for request in batch:
+                    self._finish(request, error=e)
+            else:
+                for request, caption in zip(batch, captions):
+                    self._finish(request, caption=caption)
+    
+    def _finish(self, request, caption=None, error=None):
+        if error is None and self.cache:
+            self.cache.put(request.key, caption)
+        with self._lock:
+            self._in_flight.pop(request.key, None)
+        if error is None:
+            request.future.set_result(caption)
+        else:
+            request.future.set_exception(error)
+    
+    async def _caption_batch(self, batch):
+        model = self._get_model(batch[0].api_key, batch[0].model_name)
+        prompt = batch[0].prompt
+        if len(batch) == 1:
+            return [await self._generate(model, [prompt, batch[0].image_part])]
+        
+        contents = [f"{prompt}\n\n以下の{len(batch)}枚の画像それぞれについて、上の指示に従って説明してください。"
+                    f"説明は画像の順に、{len(batch)}個の文字列からなるJSONの配列として返してください。"]
+        for i, request in enumerate(batch):
+            contents += [f"画像{i + 1}:", request.image_part]
+        text = await self._generate(model, contents, generation_config={"response_mime_type": "application/json"})
+        try:
+            captions = json.loads(text)
+        except ValueError:
+            captions = None
+        if isinstance(captions, list) and len(captions) == len(batch) and all(isinstance(c, str) for c in captions):
+            return captions
+        
+        # 応答が期待した形式でない場合は、1枚ずつ生成し直す
+        print("Geminiの応答を画像ごとに分けられなかったため、1枚ずつ説明を生成します")
+        return [await self._generate(model, [prompt, request.image_part]) for request in batch]
+    
+    def _get_model(self, api_key, model_name):
+        import google.generativeai as genai
+        # genai.configureはプロセス全体の設定なので、APIキーが変わったときだけ設定し直す
+        if api_key != self._configured_api_key:
+            genai.configure(api_key=api_key)
+            self._configured_api_key = api_key
+            self._models.clear()
+        if model_name not in self._models:
+            self._models[model_name] = genai.GenerativeModel(model_name)
+        return self._models[model_name]
+    
+    async def _generate(self, model, contents, generation_config=None):
+        """Geminiで生成する（再試行すべきエラーは指数バックオフで再試行）"""
+        attempt = 0
+        while True:
+            await self._throttle()
+            try:
+                response = await model.generate_content_async(contents, generation_config=generation_config)
+                return response.text
+            except Exception as e:
+                if attempt >= self.retries or not is_retryable_gemini_error(e):
+                    raise
+                delay = min(2 ** attempt, CAPTION_MAX_BACKOFF) * random.uniform(0.5, 1.0)
+                print(f"Gemini APIの利用制限に達しました。{delay:.1f}秒後に再試行します: {e}")
+                await asyncio.sleep(delay)
+                attempt += 1
+    
+    async def _throttle(self):
+        """リクエストの開始間隔を60/requests_per_minute秒以上あける"""
+        if not self.requests_per_minute:
+            return
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_request_time)
+        self._next_request_time = start + 60 / self.requests_per_minute
+        if start > now:
+            await asyncio.sleep(start - now)
+
+caption_service = GeminiCaptionService(
+    concurrency=CAPTION_CONCURRENCY,
+    requests_per_minute=CAPTION_RPM,
+    batch_size=CAPTION_BATCH_SIZE,
+    retries=CAPTION_RETRIES,
+    cache_dir=CAPTION_CACHE_DIR,
+)
+
+# URLで参照されている画像のダウンロード設定（環境変数で変更可能）
+# - MARKITDOWN_WEBUI_DOWNLOAD_WORKERS: 同時にダウンロードする数（既定値: 8）
+# - MARKITDOWN_WEBUI_DOWNLOAD_PER_HOST: 同じホストへの同時接続数（既定値: 4）
+# - MARKITDOWN_WEBUI_DOWNLOAD_TIMEOUT: タイムアウト（秒。既定値: 30）
+# - MARKITDOWN_WEBUI_DOWNLOAD_MAX_SIZE_MB: 1画像あたりの最大サイズ（MB。既定値: 20）
+# - MARKITDOWN_WEBUI_DOWNLOAD_CACHE_DIR: ダウンロードキャッシュのディレクトリ（既定値: 一時ディレクトリ内）
+image_downloader = ResourceDownloader(
+    max_workers=int(os.environ.get("MARKITDOWN_WEBUI_DOWNLOAD_WORKERS", 8)),
+    max_connections_per_host=int(os.environ.get("MARKITDOWN_WEBUI_DOWNLOAD_PER_HOST", 4)),
+    timeout=float(os.environ.get("MARKITDOWN_WEBUI_DOWNLOAD_TIMEOUT", 30)),
+    max_size=int(float(os.environ.get("MARKITDOWN_WEBUI_DOWNLOAD_MAX_SIZE_MB", 20)) * 1024 * 1024),
+    cache=HttpCache(os.environ.get("MARKITDOWN_WEBUI_DOWNLOAD_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "markitdown_webui_downloads")),
+)
+
+# 画像のマジックナンバーと拡張子
+IMAGE_SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', ".png"),
+    (b'\xff\xd8\xff', ".jpg"),
+    (b'GIF87a', ".gif"),
+    (b'GIF89a', ".gif"),
+    (b'BM', ".bmp"),
+]
+
+def detect_image_extension(image_data):
+    """画像データのマジックナンバーから拡張子を判定する（判定できない場合はNone）"""
+    for signature, extension in IMAGE_SIGNATURES:
+        if image_data.startswith(signature):
+            return extension
+    # WebPマジックナンバー: RIFF....WEBP
+    if image_data.startswith(b'RIFF') and image_data[8:12] == b'WEBP':
+        return ".webp"
+    return None
+
+# Markdown中の画像（Base64のデータURI、http(s)の画像URL）とページ区切り（\f）を1回の走査で検出するパターン
+MARKDOWN_IMAGE_TOKEN_PATTERN = re.compile(
+    r"!\[[^\]\n]*\]\((?:"
+    r"(?P<data_uri>data:(?P<mime_type>image/(?:png|jpeg|gif|bmp|webp));base64,(?P<base64>[A-Za-z0-9+/]+={0,2}))(?=\))"
+    r"|(?P<url>https?://[^)\s]+\.(?i:png|jpeg|jpg|gif|bmp|webp))(?=[\s)])"
+    r")"
+    r"|(?P<page_break>\x0c)"
+)
+
+def extract_markdown_images(markdown_content, file_basename, output_files, page_images=None, data_uri_prefix="base64"):
+    """Markdownを1回だけ走査して画像を取り出し、output_filesに書き込んで、画像をファイル参照に書き換えたMarkdownを返す
+
+    - Base64のデータURIはデコードして {file_basename}_{data_uri_prefix}_{n}.拡張子 に書き出す
+    - http(s)の画像URLは（image_downloaderで並行して）ダウンロードして {file_basename}_url_{n}.拡張子 に書き出す
+    - page_images（extract_page_images_from_pdfの戻り値）を渡した場合、ページ区切り（\f）を含む行の後にそのページの画像への参照を挿入する
+    同じ内容の画像（SHA-256が一致するもの）は1度だけ書き出し、同じファイルを参照する。
+    書き換えたMarkdownは、str.replaceで全体を繰り返しコピーせず、断片のリストから1度だけ組み立てる。
+    """
+    pieces = []
+    position = 0  # markdown_contentのうち、piecesに出力済みの位置
+    filenames_by_hash = {}
+    filenames_by_url = {}
+    counters = collections.Counter()
+    
+    def write_image(image_data, kind, extension):
+        """画像を書き出してファイル名を返す（同じ内容の画像が書き出し済みならそのファイル名を返す）"""
+        digest = hashlib.sha256(image_data).digest()
+        if digest not in filenames_by_hash:
+            filenames_by_hash[digest] = f"{file_basename}_{kind}_{counters[kind]}{extension}"
+            counters[kind] += 1
+            output_files[filenames_by_hash[digest]] = image_data
+        return filenames_by_hash[digest]
+    
+    def decode_data_uri(match):
+        try:
+            image_data = base64.b64decode(match.group('base64'))
+        except Exception as e:
+            print(f"Base64画像のデコードに失敗しました: {e}")
+            return None
+        extension = detect_image_extension(image_data) or mimetypes.guess_extension(match.group('mime_type')) or ".bin"
+        return write_image(image_data, data_uri_prefix, extension)
+    
+    def download_image(image_url):
+        if image_url not in filenames_by_url:
+            download = downloads[image_url]
+            if download.ok:
+                extension = mimetypes.guess_extension(download.mimetype or "")
+                if not extension:
+                    extension = os.path.splitext(image_url)[1] or ".bin"
+                filenames_by_url[image_url] = write_image(download.content, "url", extension)
+            else:
+                print(f"Failed to download image from {image_url}: {download.error}")
+                # ダウンロードに失敗した場合は元のURLを残す
+                filenames_by_url[image_url] = None
+        return filenames_by_url[image_url]
+    
+    next_image = next(page_images, None) if page_images is not None else None
+    
+    def insert_page_images(at, page_num):
+        """指定した位置に、指定したページの画像への参照を挿入"""
+        nonlocal next_image, position
+        pieces.append(markdown_content[position:at])
+        position = at
+        i = 0
+        while next_image is not None and next_image['page'] <= page_num:
+            if next_image['page'] == page_num:
+                extension = mimetypes.guess_extension(next_image['mime_type']) or ".png"
+                image_filename = write_image(next_image['data'], f"page{page_num}", extension)
+                pieces.append(f"\n\n\n<!-- PDF Image from page {page_num} -->\n![PDF Image {i}]({image_filename})\n")
+                i += 1
+            next_image = next(page_images, None)
+    
+    # 画像URLは先にまとめて並行ダウンロードしておく
+    matches = list(MARKDOWN_IMAGE_TOKEN_PATTERN.finditer(markdown_content))
+    downloads = image_downloader.download_many(match.group('url') for match in matches if match.group('url'))
+    
+    current_page = 1
+    page_break_end = None  # ページ区切りを含む行の末尾（ここにそのページの画像を挿入する）
+    for match in matches:
+        if page_break_end is not None and match.start() > page_break_end:
+            insert_page_images(page_break_end, current_page)
+            current_page += 1
+            page_break_end = None
+        
+        if match.group('page_break'):
+            # 1行に複数のページ区切りがあっても1ページとして扱う
+            if page_break_end is None:
+                page_break_end = markdown_content.find('\n', match.end())
+                if page_break_end < 0:
+                    page_break_end = len(markdown_content)
+            continue
+        
+        if match.group('data_uri'):
+            group = 'data_uri'
+            image_filename = decode_data_uri(match)
+        else:
+            group = 'url'
+            image_filename = download_image(match.group('url'))
+        if image_filename:
+            pieces.append(markdown_content[position:match.start(group)])
+            pieces.append(image_filename)
+            position = match.end(group)
+    
+    if page_break_end is not None:
+        insert_page_images(page_break_end, current_page)
+        current_page += 1
+    # 最後のページの画像を挿入
+    insert_page_images(len(markdown_content), current_page)
+    
+    pieces.append(markdown_content[position:])
+    return ''.join(pieces)
+
+# ZIPエントリごとの圧縮方式（拡張子で指定）
+# PNG/JPEGなど既に圧縮されている画像は無圧縮で格納し、それ以外（Markdownなど）はdeflateで圧縮する
+ZIP_COMPRESSION_BY_EXTENSION = {
+    ".png": zipfile.ZIP_STORED,
+    ".jpg": zipfile.ZIP_STORED,
+    ".jpeg": zipfile.ZIP_STORED,
+    ".gif": zipfile.ZIP_STORED,
+    ".webp": zipfile.ZIP_STORED,
+}
+DEFAULT_ZIP_COMPRESSION = zipfile.ZIP_DEFLATED
+
+class ZipOutputWriter:
+    """変換結果のファイルを、生成され次第ZIPに書き込む（すべてのファイルをメモリに保持しない）
+
+    辞書と同じく output_files[filename] = content の形で書き込める。
+    複数のスレッドから同じZIPに書き込む場合は、同じロックを共有する。
+    """
+    def __init__(self, zf, lock=None, prefix="", compression_by_extension=None):
+        self.zf = zf
+        self.lock = lock or threading.Lock()
+        self.prefix = prefix
+        self.compression_by_extension = ZIP_COMPRESSION_BY_EXTENSION if compression_by_extension is None else compression_by_extension
+    
+    def __setitem__(self, filename, content):
+        extension = os.path.splitext(filename)[1].lower()
+        compress_type = self.compression_by_extension.get(extension, DEFAULT_ZIP_COMPRESSION)
+        with self.lock:
+            self.zf.writestr(self.prefix + filename, content, compress_type=compress_type)
+
+# 説明を付ける画像の拡張子
+CAPTION_IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp"}
+
+class CaptioningOutputWriter:
+    """output_filesに画像が書き込まれた時点で、その画像の説明の生成をcaption_serviceに依頼する
+
+    説明は変換・画像の抽出と並行して生成され、apply_image_captionsでMarkdownに反映する。
+    """
+    def __init__(self, output_files, api_key, model_name):
+        self.output_files = output_files
+        self.api_key = api_key
+        self.model_name = model_name
+        self.captions = {}  # ファイル名 → 説明のFuture
+    
+    def __setitem__(self, filename, content):
+        self.output_files[filename] = content
+        if os.path.splitext(filename)[1].lower() in CAPTION_IMAGE_EXTENSIONS:
+            try:
+                self.captions[filename] = caption_service.submit(self.api_key, self.model_name, content, DOCUMENT_IMAGE_PROMPT)
+            except Exception as e:
+                print(f"画像の説明を生成できません ({filename}): {e}")
+
+MARKDOWN_IMAGE_REFERENCE_PATTERN = re.compile(r"!\[[^\]\n]*\]\((?P<filename>[^)\s]+)\)")
+
+def apply_image_captions(markdown_content, captions):
+    """生成された説明を、その画像を参照している箇所の代替テキストにする（生成に失敗した画像はそのまま）"""
+    alt_texts = {}
+    for filename, future in captions.items():
+        try:
+            caption = " ".join(future.result().split())
+        except Exception as e:
+            print(f"画像の説明の生成に失敗しました ({filename}): {e}")
+            continue
+        alt_texts[filename] = caption.replace("[", "\\[").replace("]", "\\]")
+    
+    def replace(match):
+        alt_text = alt_texts.get(match.group('filename'))
+        return f"![{alt_text}]({match.group('filename')})" if alt_text else match.group(0)
+    
+    return MARKDOWN_IMAGE_REFERENCE_PATTERN.sub(replace, markdown_content)
+
+def convert_with_attachments(md, source, output_files):
+    """ファイルまたはURLを変換し、抽出された画像（添付ファイル）をそのままoutput_filesに書き込む
+
+    DOCX/PPTX/EPUB/HTML/PDFの画像はMarkItDownから添付ファイルとして直接受け取る（Base64を経由しない）。
+    HTMLがURLで参照している画像も、image_downloaderで並行してダウンロードされる。
+    添付ファイルに対応していない形式の画像は、従来どおりデータURIとしてMarkdownに残す。
+    """
+    result = md.convert(source, extract_attachments=True, download_images=True, keep_data_uris=True)
+    for attachment in result.attachments:
+        output_files[attachment.name] = attachment.read()
+    return result
+
+class URLConversionError(Exception):
+    """URLの変換に失敗した"""
+
+def convert_to_outputs(file_path, url_input, gemini_api_key, selected_model, output_files, describe_images=False):
+    """ファイルまたはURLを変換して、Markdownと画像をoutput_files（ZipOutputWriter）に書き込み、(Markdown, Markdownのファイル名) を返す
+
+    describe_imagesがTrueでAPIキーが設定されている場合、文書内の画像（PDFのページ画像を含む）の説明をGeminiで生成し、代替テキストにする。
+    """
+    markdown_content = ""
+    page_images = None
+    
+    caption_writer = None
+    if describe_images and gemini_api_key:
+        output_files = caption_writer = CaptioningOutputWriter(output_files, gemini_api_key, selected_model)
+    
+    # MarkItDownの初期化
+    md = MarkItDown(enable_plugins=False, resource_downloader=image_downloader)
+    warning_message = ""
+    
+    # 画像ファイルの場合はLLMを使用するか確認
+    file_extension = None
+    if file_path:
+        file_extension = os.path.splitext(file_path)[1].lower()
+    
+    # 画像ファイルの場合はLLMを使用（APIキーが設定されている場合）
+    if file_path and file_extension in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'] and gemini_api_key:
+        try:
+            warning_message = f"Google Gemini ({selected_model})を使用して画像の説明を生成します...\n\n"
+            
+            # 画像をGeminiで処理（共有のcaption_serviceで、同じ画像の説明はキャッシュから返す）
+            with open(file_path, "rb") as f:
+                image_data = f.read()
+            description = caption_service.caption(gemini_api_key, selected_model, image_data, IMAGE_DESCRIPTION_PROMPT)
+            
+            # Geminiの応答をMarkdownに追加
+            gemini_description = f"## 画像の説明 (Google Gemini {selected_model})\n\n{description}\n\n---\n\n"
+            markdown_content = gemini_description
+            # 通常の変換は行わず、Geminiの説明のみを使用
+            skip_normal_conversion = True
+            
+        except ImportError:
+            warning_message = "Google Generative AIパッケージがインストールされていません。通常の変換を行います。\n\n"
+            skip_normal_conversion = False
+        except Exception as e:
+            warning_message = f"Google Geminiの処理に失敗しました: {e}。通常の変換を行います。\n\n"
+            skip_normal_conversion = False
+    else:
+        skip_normal_conversion = False
+
+    if file_path:
+        # Handle file upload
+        file_extension = os.path.splitext(file_path)[1].lower()
+        file_basename = os.path.splitext(os.path.basename(file_path))[0]
+        
+        # 音声ファイルの場合は文字起こしを実行
+        if file_extension in ['.mp3', '.wav', '.ogg', '.flac', '.aac', '.m4a']:
+            audio_format = file_extension.lstrip('.')
+            transcript = transcribe_audio(file_path, audio_format)
+            markdown_content = f"## 音声文字起こし結果\n\n{transcript}\n\n---\n\n"
+        else:
+            # Gemini APIが成功した場合は通常の変換をスキップ
+            if not skip_normal_conversion:
+                # Convert to markdown
+                try:
+                    result = convert_with_attachments(md, file_path, output_files)
+                    markdown_content = result.text_content
+                except Exception as e:
+                    error_msg = f"ファイル変換エラー: {e}\n"
+                    if "API key" in str(e) or "authentication" in str(e).lower():
+                        error_msg += "Google Gemini APIキーが無効です。通常の変換を試みます。\n"
+                        # 通常のMarkItDownで再試行
+                        md_normal = MarkItDown(enable_plugins=False, resource_downloader=image_downloader)
+                        result = convert_with_attachments(md_normal, file_path, output_files)
+                        markdown_content = error_msg + result.text_content
+                    elif "quota" in str(e).lower() or "rate limit" in str(e).lower():
+                        error_msg += "Google Gemini APIの利用制限に達しました。通常の変換を試みます。\n"
+                        # 通常のMarkItDownで再試行
+                        md_normal = MarkItDown(enable_plugins=False, resource_downloader=image_downloader)
+                        result = convert_with_attachments(md_normal, file_path, output_files)
+                        markdown_content = error_msg + result.text_content
+                    else:
+                        markdown_content = error_msg + "変換に失敗しました。"
+            
+            # 警告メッセージをMarkdownの先頭に追加
+            if warning_message:
+                markdown_content = warning_message + markdown_content
+            
+            # PDFの場合は各ページを画像化し、ページ区切りの位置に参照を挿入する
+            if file_extension == '.pdf':
+                page_images = extract_page_images_from_pdf(file_path)
+        
+    elif url_input:
+        # Handle URL input
+        try:
+            result = convert_with_attachments(md, url_input, output_files)
+            markdown_content = result.text_content
+            # Create URL-based filename
+            url_basename = "converted_from_url"
+            if url_input:
+                # Extract domain name for filename
+                from urllib.parse import urlparse
+                parsed_url = urlparse(url_input)
+                if parsed_url.netloc:
+                    url_basename = parsed_url.netloc.replace('.', '_')
+        except Exception as e:
+            raise URLConversionError(f"URL変換エラー: {e}")
+
+    # Extract images from markdown_content (data URIs, image URLs and PDF page images) in a single pass
+    if file_path or url_input:
+        try:
+            markdown_content = extract_markdown_images(
+                markdown_content,
+                file_basename if file_path else url_basename,
+                output_files,
+                page_images=page_images,
+                data_uri_prefix="image" if file_extension in ['.docx', '.doc'] else "base64",
+            )
+        finally:
+            if page_images is not None:
+                # 参照されなかったページがあってもPDFを閉じる
+                page_images.close()
+
+    # Update the markdown content with local image references
+    markdown_filename = None
+    if file_path:
+        markdown_filename = f"{file_basename}.md"
+    elif url_input:
+        markdown_filename = f"{url_basename}.md"
+    if caption_writer is not None:
+        markdown_content = apply_image_captions(markdown_content, caption_writer.captions)
+    if markdown_filename:
+        output_files[markdown_filename] = markdown_content.encode('utf-8')
+    return markdown_content, markdown_filename
+
+def convert_and_zip(file_obj, url_input, gemini_api_key, selected_model, describe_images=False):
+    file_path = file_obj.name if file_obj else None
+    
+    # Create a temporary file for the zip archive, to which the outputs are written as they are produced
+    # NamedTemporaryFile ensures the file exists until explicitly closed/deleted
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp_zip_file:
+        zip_file_path = tmp_zip_file.name
+    try:
+        with zipfile.ZipFile(zip_file_path, 'w') as zf:
+            markdown_content, _ = convert_to_outputs(file_path, url_input, gemini_api_key, selected_model, ZipOutputWriter(zf), describe_images)
+    except URLConversionError as e:
+        os.remove(zip_file_path)
+        return str(e), None # Return None for download_zip in case of error
+    
+    # Return the markdown content and the path to the temporary zip file
+    # Gradio will handle serving this file for download.
+    return markdown_content, zip_file_path
+
+
+# Define accepted file types for gr.File
+# Based on converters list:
+# .csv, .docx, .epub, .html, .jpg, .jpeg, .png, .ipynb, .msg, .pdf, .pptx, .txt, .xlsx, .zip, .mp3, .wav, .ogg
+# Note: .zip is for input, not output. Audio types are inferred.
+ACCEPTED_FILE_TYPES = [
+    ".csv", ".doc", ".docx", ".epub", ".html", ".htm", ".jpeg", ".jpg", ".png", ".gif", ".bmp", ".webp",
+    ".ipynb", ".msg", ".eml", ".pdf", ".ppt", ".pptx", ".txt", ".text", ".xlsx", ".xls", ".zip",
+    ".mp3", ".wav", ".ogg", ".flac", ".aac" # Common audio formats
+]
+
+# 一括変換の設定（環境変数で変更可能）
+# - MARKITDOWN_WEBUI_WORKERS: 全ジョブで共有するワーカー数（同時に変換するファイル数の上限）
+# - MARKITDOWN_WEBUI_BATCH_CONCURRENCY: 同時に実行できる一括変換ジョブ数
+# - MARKITDOWN_WEBUI_CONCURRENCY: 単一ファイル/URL変換の同時実行数
+# - MARKITDOWN_WEBUI_QUEUE_SIZE: Gradioのキューで待機できるリクエスト数
+BATCH_WORKERS = int(os.environ.get("MARKITDOWN_WEBUI_WORKERS", os.cpu_count() or 4))
+BATCH_CONCURRENCY = int(os.environ.get("MARKITDOWN_WEBUI_BATCH_CONCURRENCY", 4))
+DEFAULT_CONCURRENCY = int(os.environ.get("MARKITDOWN_WEBUI_CONCURRENCY", 4))
+QUEUE_MAX_SIZE = int(os.environ.get("MARKITDOWN_WEBUI_QUEUE_SIZE", 64))
+
+# 全ジョブで共有するサーバー側のジョブキューとワーカープール
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="webui-batch")
+
+def format_batch_status(file_paths, statuses):
+    """ファイルごとの変換状況をMarkdownの表にする"""
+    lines = ["| ファイル | 状態 |", "| --- | --- |"]
+    for file_path, status in zip(file_paths, statuses):
+        lines.append(f"| {os.path.basename(file_path)} | {status} |")
+    return "\n".join(lines)
+
+def convert_batch(uploaded_files, uploaded_folder, gemini_api_key, selected_model, describe_images=False, progress=gr.Progress()):
+    """複数ファイル・フォルダを共有ワーカープールで変換し、結果を1つのZIPに順次書き込む（ジョブごとに進捗を表示）"""
+    file_paths = []
+    for file_obj in (uploaded_files or []) + (uploaded_folder or []):
+        file_path = getattr(file_obj, "name", file_obj)
+        # フォルダ内の非対応ファイルはスキップ
+        if os.path.splitext(file_path)[1].lower() in ACCEPTED_FILE_TYPES:
+            file_paths.append(file_path)
+    
+    if not file_paths:
+        yield "変換できるファイルがありません", None
+        return
+    
+    total = len(file_paths)
+    statuses = ["待機中"] * total
+    progress((0, total), desc="変換中...")
+    yield format_batch_status(file_paths, statuses), None
+    
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp_zip_file:
+        zip_file_path = tmp_zip_file.name
+    
+    # 1つのジョブが共有キューを占有しないよう、同時に投入するファイル数をワーカー数までに制限する
+    # （複数ジョブのファイルがキュー内で交互に処理される）
+    pending = {}
+    next_index = 0
+    completed = 0
+    folder_names = set()
+    zip_lock = threading.Lock()
+    job_completed = False
+    try:
+        with zipfile.ZipFile(zip_file_path, 'w') as zf:
+            try:
+                while next_index < total or pending:
+                    while next_index < total and len(pending) < BATCH_WORKERS:
+                        # ファイルごとにフォルダを分けてZIPに書き込む（同名の画像が衝突しないように）
+                        filename = os.path.basename(file_paths[next_index])
+                        folder_name = filename
+                        suffix = 1
+                        while folder_name in folder_names:
+                            suffix += 1
+                            folder_name = f"{filename}_{suffix}"
+                        folder_names.add(folder_name)
+                        
+                        # 各ワーカーは変換結果を生成され次第、共有のZIPに直接書き込む
+                        output_files = ZipOutputWriter(zf, lock=zip_lock, prefix=f"{folder_name}/")
+                        future = batch_executor.submit(convert_to_outputs, file_paths[next_index], "", gemini_api_key, selected_model, output_files, describe_images)
+                        pending[future] = next_index
+                        statuses[next_index] = "変換中"
+                        next_index += 1
+                    
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = pending.pop(future)
+                        try:
+                            future.result()
+                            statuses[index] = "✅ 完了"
+                        except Exception as e:
+                            statuses[index] = f"❌ エラー: {e}"
+                        
+                        completed += 1
+                        progress((completed, total), desc=f"変換中... ({completed}/{total})")
+                    
+                    yield format_batch_status(file_paths, statuses), None
+            finally:
+                # ジョブが中断された場合（クライアントの切断・キャンセル）は、未開始の変換を取り消し、
+                # 実行中の変換がZIPへの書き込みを終えるのを待ってからZIPを閉じる
+                for future in pending:
+                    future.cancel()
+                wait(pending)
+        job_completed = True
+    finally:
+        # 完了しなかったジョブの一時ZIPは削除する
+        if not job_completed:
+            try:
+                os.remove(zip_file_path)
+            except OSError:
+                pass
+    
+    yield format_batch_status(file_paths, statuses), zip_file_path
+
+def save_settings(gemini_api_key, selected_model):
+    """設定を保存"""
+    save_config(gemini_api_key, selected_model)
+    return "設定を保存しました"
+
+# 設定を読み込み
+loaded_api_key, loaded_model = load_config()
+
+# メインアプリケーション
+with gr.Blocks() as demo:
+    gr.Markdown("### MarkItDown Gradio WebUI: Office/PDF/画像/URL→Markdown変換 & Zipダウンロード")
+    
+    with gr.Tabs() as tabs:
+        with gr.TabItem("ファイルアップロード", id=0):
+            # ファイルアップロード欄の上に常に表示する警告文
+            gr.Markdown("""
+            ### 注意事項
+            - **画像ファイル** (.jpg, .jpeg, .png, .gif, .bmp, .webp) をアップロードする場合:
+              - Google Gemini APIキーが設定されていると、画像はLLMに送信され、画像の説明が生成されます
+              - プライバシーに配慮が必要な画像の場合は変換を中止してください
+            - **音声ファイル** (.mp3, .wav, .ogg, .flac, .aac, .m4a) をアップロードする場合:
+              - Google Speech Recognition APIを使用して文字起こしが行われます
+              - 日本語音声の認識精度が高くなります
+            - **その他のファイル** はMarkItDownで処理されます
+            - **PDFファイル** は各ページが画像として抽出され、Markdownに埋め込まれます
+            - **文書内の画像に説明を付ける** を選ぶと、文書内の画像（PDFのページ画像を含む）もLLMに送信されます
+            """)
+            
+            file_input = gr.File(label="変換するファイルをアップロード", file_types=ACCEPTED_FILE_TYPES)
+            describe_images_input = gr.Checkbox(label="文書内の画像に説明を付ける (Google Gemini。APIキーが必要)", value=False)
+            output_markdown = gr.Textbox(label="Markdown結果", lines=20)
+            download_zip = gr.File(label="変換結果をダウンロード (Markdownと画像)", file_count="single", interactive=False)
+            
+            gr.Button("変換").click(
+                fn=convert_and_zip, 
+                inputs=[file_input, gr.Textbox(value="", visible=False), gr.Textbox(value=loaded_api_key, visible=False), gr.Dropdown(value=loaded_model, visible=False, allow_custom_value=True), describe_images_input], 
+                outputs=[output_markdown, download_zip]
+            )
+            
+        with gr.TabItem("URL入力", id=1):
+            url_input = gr.Textbox(label="変換するURLを入力 (例: RSS, Wikipedia, YouTube, Bing SERP)", placeholder="https://example.com/article.html")
+            url_describe_images_input = gr.Checkbox(label="ページ内の画像に説明を付ける (Google Gemini。APIキーが必要)", value=False)
+            output_markdown = gr.Textbox(label="Markdown結果", lines=20)
+            download_zip = gr.File(label="変換結果をダウンロード (Markdownと画像)", file_count="single", interactive=False)
+            
+            gr.Button("変換").click(
+                fn=convert_and_zip, 
+                inputs=[gr.File(visible=False), url_input, gr.Textbox(value=loaded_api_key, visible=False), gr.Dropdown(value=loaded_model, visible=False, allow_custom_value=True), url_describe_images_input], 
+                outputs=[output_markdown, download_zip]
+            )
+            
+        with gr.TabItem("一括変換", id=3):
+            gr.Markdown("""
+            複数のファイル、またはフォルダをまとめて変換し、すべての結果を1つのZipでダウンロードできます。
+            ファイルはサーバー側のワーカープールで並列に変換され、変換が終わったものから順にZipへ書き込まれます。
+            """)
+            
+            with gr.Row():
+                batch_files_input = gr.File(label="変換するファイルをアップロード（複数可）", file_count="multiple", file_types=ACCEPTED_FILE_TYPES)
+                batch_folder_input = gr.File(label="変換するフォルダをアップロード", file_count="directory")
+            batch_describe_images_input = gr.Checkbox(label="文書内の画像に説明を付ける (Google Gemini。APIキーが必要)", value=False)
+            batch_status = gr.Markdown()
+            batch_download_zip = gr.File(label="変換結果をダウンロード (すべてのMarkdownと画像)", file_count="single", interactive=False)
+            
+            gr.Button("一括変換").click(
+                fn=convert_batch,
+                inputs=[batch_files_input, batch_folder_input, gr.Textbox(value=loaded_api_key, visible=False), gr.Dropdown(value=loaded_model, visible=False, allow_custom_value=True), batch_describe_images_input],
+                outputs=[batch_status, batch_download_zip],
+                concurrency_limit=BATCH_CONCURRENCY,
+                concurrency_id="batch"
+            )
+            
+        with gr.TabItem("設定", id=2):
+            gr.Markdown("#### Google Gemini API設定")
+            
+            # 設定コンポーネントを設定タブ内に配置
+            gemini_api_key = gr.Textbox(
+                label="Google Gemini APIキー (画像ファイルのLLM処理に必要)",
+                placeholder="AIza...",
+                type="password",
+                value=loaded_api_key,
+                info="画像ファイルのLLM処理にはGoogle Gemini APIキーが必要です。取得方法: https://aistudio.google.com/app/apikey"
+            )
+            
+            model_dropdown = gr.Dropdown(
+                label="使用するモデル",
+                choices=[],
+                value="",
+                allow_custom_value=True,
+                info="APIキーを設定して「モデルリスト更新」ボタンを押すと利用可能なモデルリストが表示されます"
+            )
+            
+            save_status = gr.Textbox(label="保存ステータス", interactive=False, visible=False)
+            
+            with gr.Row():
+                gr.Button("モデルリスト更新").click(
+                    fn=get_available_models,
+                    inputs=[gemini_api_key],
+                    outputs=[model_dropdown]
+                )
+                
+                gr.Button("設定を保存").click(
+                    fn=save_settings,
+                    inputs=[gemini_api_key, model_dropdown],
+                    outputs=[save_status]
+                )
+
+def main():
+    """WebUIを起動する（webui.pyから呼び出される）"""
+    # 複数ユーザーが同時に変換できるようにキューの同時実行数を設定
+    demo.queue(default_concurrency_limit=DEFAULT_CONCURRENCY, max_size=QUEUE_MAX_SIZE)
+    demo.launch()
+
+if __name__ == "__main__":
+    main()
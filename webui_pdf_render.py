@@ -0,0 +1,32 @@
+"""PDFのページを画像にレンダリングする（WebUIのレンダリング用プロセスプールのワーカーで実行）
+
+ワーカープロセス（Windowsではspawnで起動）がこのモジュールを読み込むため、
+gradio や WebUI の設定・サービスは読み込まず、fitz（PyMuPDF）と PIL だけを使う。
+"""
+import io
+
+
+def render_pdf_pages(pdf_path, page_numbers, dpi, image_format, quality):
+    """指定したページ（0始まり）を画像にレンダリングし、[(ページ番号, 画像のbytes)] を返す"""
+    import fitz  # PyMuPDF
+
+    rendered = []
+    doc = fitz.open(pdf_path)
+    try:
+        for page_num in page_numbers:
+            pix = doc[page_num].get_pixmap(dpi=dpi)
+            if image_format == "png":
+                img_data = pix.tobytes("png")
+            else:
+                # JPEG/WebPはPillowで品質を指定してエンコードする
+                import PIL.Image
+
+                img = PIL.Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+                buffer = io.BytesIO()
+                img.save(buffer, format=image_format.upper(), quality=quality)
+                img_data = buffer.getvalue()
+            rendered.append((page_num, img_data))
+            pix = None
+    finally:
+        doc.close()
+    return rendered